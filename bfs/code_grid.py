@@ -0,0 +1,51 @@
+import numpy as np
+from manim import *
+
+
+class CodeGrid:
+    """
+    Cells of a grid written in a Code block as a list of strings (one line per row, one character per cell).
+    The glyph of every cell is looked up once and the centers of all the cells are kept in a single array => BFS code
+    gets the glyph or the position of a cell in O(1) and selects whole classes of cells (walls, water...) with masks.
+    The centers are measured when the grid is built, call `refresh()` after the code block moved.
+    """
+    def __init__(self, code: Mobject, grid: list[str], row_offset: int = 1, col_offset: int = 2):
+        """
+        :param code: Lines of the Code block (`Code(...).code`)
+        :param grid: Rows of the grid as they are written in the code
+        :param row_offset: Line of the first row (after `g = [`)
+        :param col_offset: Character of the first cell in a line (after the indentation and the quote)
+        """
+        self.chars = np.array([list(row) for row in grid])
+        self.glyphs = np.empty(self.chars.shape, dtype=object)
+        for r, c in np.ndindex(*self.chars.shape):
+            self.glyphs[r, c] = code[r + row_offset][c + col_offset]
+        self.refresh()
+
+    def refresh(self) -> 'CodeGrid':
+        """ Measure the centers of all the cells again. """
+        self.centers = np.array([glyph.get_center() for glyph in self.glyphs.ravel()]).reshape(*self.chars.shape, 3)
+        return self
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.chars.shape
+
+    def __getitem__(self, cell: tuple[int, int]) -> VMobject:
+        """ Glyph of the (row, col) cell. """
+        return self.glyphs[cell]
+
+    def get_center(self, row: int, col: int) -> np.ndarray:
+        return self.centers[row, col]
+
+    def mask(self, chars: str) -> np.ndarray:
+        """ Boolean (rows x cols) mask of the cells written with one of the given characters. """
+        return np.isin(self.chars, list(chars))
+
+    def select(self, mask: np.ndarray) -> list[VMobject]:
+        """ Glyphs of the cells in the mask (row-major order). """
+        return list(self.glyphs[mask])
+
+    def cells(self, mask: np.ndarray) -> list[tuple[int, int]]:
+        """ (row, col) of the cells in the mask (row-major order). """
+        return [(int(r), int(c)) for r, c in np.argwhere(mask)]
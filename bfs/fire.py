@@ -0,0 +1,271 @@
+import numpy as np
+from manim import *
+
+from common.rng import get_rng
+
+
+class FireSystem(Mobject):
+    """
+    Animates all the burning fire icons of a scene with a single updater.
+    The state of every flame (angles, phases, speeds, opacities) is kept in NumPy arrays, all the fires are advanced
+    with one vectorized step per frame and the new points/opacities are written into the flames directly.
+    The first 3 submobjects of a fire icon are the main flames, the last 3 are the small flames.
+    Add it to the scene before the fires so that they are rendered on every frame.
+    Every fire draws from its own generator seeded with (key, fire key) => its motion does not depend on what was
+    rendered before it.
+    """
+    def __init__(self, key: str = 'fires', **kwargs):
+        super().__init__(**kwargs)
+        self.key = key
+        self.ignitions = 0
+        self.fires: list[VMobject] = []
+        self.rngs: list[np.random.Generator] = []
+
+        # One row per fire
+        self.state: dict[str, np.ndarray] = {
+            'time': np.zeros(0),
+            'main_centers': np.zeros((0, 3, 3)),    # Each main flame rotates about its own center
+            'amplitude': np.zeros((0, 3)),
+            'frequency': np.zeros((0, 3)),
+            'phase': np.zeros((0, 3)),
+            'flipped': np.zeros(0, dtype=bool),     # Only the middle main flame flips horizontally
+            'time_since_flip': np.zeros(0),
+            'next_flip_time': np.zeros(0),
+            'small_origins': np.zeros((0, 3, 3)),   # Initial centers of the small flames
+            'small_offsets': np.zeros((0, 3, 3)),   # Current offsets of the small flames from their origins
+            'upward_speed': np.zeros((0, 3)),
+            'fade_speed': np.zeros((0, 3)),
+            'opacity': np.zeros((0, 3)),
+        }
+        self.main_points: list[list[np.ndarray]] = []   # Rest points of the main flames of each fire
+        self.small_points: list[list[np.ndarray]] = []  # Points of the small flames relative to their centers
+        self.pack()
+        self.add_updater(lambda mobj, dt: mobj.step(dt))
+
+    def pack(self):
+        """ Concatenate the points of all the flames so that every frame is computed with a few array operations. """
+        self.main_flames = [flame for fire in self.fires for flame in fire.submobjects[:3]]
+        self.small_flames = [flame for fire in self.fires for flame in fire.submobjects[-3:]]
+
+        main = [points for fire in self.main_points for points in fire]
+        small = [points for fire in self.small_points for points in fire]
+        self.main_base = np.concatenate(main) if main else np.zeros((0, 3))
+        self.small_base = np.concatenate(small) if small else np.zeros((0, 3))
+        self.main_owner = np.repeat(np.arange(len(main)), [len(points) for points in main])
+        self.small_owner = np.repeat(np.arange(len(small)), [len(points) for points in small])
+        self.main_bounds = np.cumsum([0] + [len(points) for points in main])
+        self.small_bounds = np.cumsum([0] + [len(points) for points in small])
+
+    def get_fire_rng(self, key=None) -> np.random.Generator:
+        """ Generator of a new fire. Fires without a key are numbered in the order they are ignited. """
+        self.ignitions += 1
+        return get_rng(self.key, key if key is not None else self.ignitions)
+
+    def ignite(self, fire: VMobject, key=None) -> VMobject:
+        """
+        Start animating the fire icon. Its current geometry is used as the rest state of the flames.
+        :param fire: Fire icon
+        :param key: Stable key of the fire (e.g. its vertex) its random stream is derived from
+        """
+        rng = self.get_fire_rng(key)
+        main, small = fire.submobjects[:3], fire.submobjects[-3:]
+        small_origins = np.array([flame.get_center() for flame in small])
+        row = {
+            'time': 0.,
+            'main_centers': np.array([flame.get_center() for flame in main]),
+            'amplitude': rng.uniform(0.01, 0.03, 3),
+            'frequency': rng.uniform(1.5, 3.0, 3),
+            'phase': rng.uniform(0, TAU, 3),
+            'flipped': False,
+            'time_since_flip': 0.,
+            'next_flip_time': rng.uniform(0.3, 1.0),
+            'small_origins': small_origins,
+            'small_offsets': np.column_stack([rng.uniform(-0.1, 0.1, 3), np.zeros(3), np.zeros(3)]),
+            'upward_speed': rng.uniform(0.5, 1.0, 3),
+            'fade_speed': rng.uniform(0.5, 1.0, 3),
+            'opacity': np.ones(3),
+        }
+        for name, value in row.items():
+            self.state[name] = np.concatenate([self.state[name], [value]])
+        self.fires.append(fire)
+        self.rngs.append(rng)
+        self.main_points.append([flame.points.copy() for flame in main])
+        self.small_points.append([flame.points - origin for flame, origin in zip(small, small_origins)])
+        self.pack()
+        return fire
+
+    def extinguish(self, fire: VMobject) -> VMobject:
+        """ Stop animating the fire icon (it keeps its current geometry). """
+        keep = np.array([other is not fire for other in self.fires], dtype=bool)
+        for name, value in self.state.items():
+            self.state[name] = value[keep]
+        self.main_points = [points for points, k in zip(self.main_points, keep) if k]
+        self.small_points = [points for points, k in zip(self.small_points, keep) if k]
+        self.rngs = [rng for rng, k in zip(self.rngs, keep) if k]
+        self.fires = [other for other in self.fires if other is not fire]
+        self.pack()
+        return fire
+
+    def step(self, dt: float):
+        if not self.fires or dt == 0:
+            return
+        s = self.state
+        s['time'] += dt
+
+        # Flicker angle of every main flame + flip the middle flame from time to time
+        angle = s['amplitude'] * np.sin(s['time'][:, None] * s['frequency'] * TAU + s['phase'])
+        s['time_since_flip'] += dt
+        flip = s['time_since_flip'] > s['next_flip_time']
+        s['flipped'] ^= flip
+        s['time_since_flip'][flip] = 0.
+        for f in np.flatnonzero(flip):
+            s['next_flip_time'][f] = 2 * self.rngs[f].uniform(0.3, 1.0)
+
+        # Rotate the main flames about their centers (all the points of all the fires at once)
+        sign = np.ones_like(angle)
+        sign[:, 1] = np.where(s['flipped'], -1., 1.)
+        centers = s['main_centers'].reshape(-1, 3)[self.main_owner]
+        relative = self.main_base - centers
+        x, y = relative[:, 0] * sign.ravel()[self.main_owner], relative[:, 1]
+        cos, sin = np.cos(angle.ravel()[self.main_owner]), np.sin(angle.ravel()[self.main_owner])
+        main = centers + np.column_stack([cos * x - sin * y, sin * x + cos * y, relative[:, 2]])
+
+        # Small flames rise and fade => restart below the fire once they faded out or got too high
+        s['small_offsets'][..., 1] += s['upward_speed'] * dt
+        s['opacity'] -= s['fade_speed'] * dt
+        reset = (s['opacity'] <= 0) | (s['small_offsets'][..., 1] > 0.5)
+        for f in np.flatnonzero(reset.any(axis=1)):
+            rng, flames, n = self.rngs[f], reset[f], reset[f].sum()
+            s['small_offsets'][f, flames] = np.column_stack([
+                rng.uniform(-0.1, 0.1, n), -rng.uniform(0.05, 0.15, n), np.zeros(n),
+            ])
+            s['upward_speed'][f, flames] = rng.uniform(0.5, 1.0, n)
+            s['fade_speed'][f, flames] = rng.uniform(0.5, 1.0, n)
+        s['opacity'][reset] = 1.
+        small = self.small_base + (s['small_origins'] + s['small_offsets']).reshape(-1, 3)[self.small_owner]
+
+        # Write the results into the flames
+        for flame, start, end in zip(self.main_flames, self.main_bounds[:-1], self.main_bounds[1:]):
+            flame.points = main[start: end]
+        for flame, start, end, opacity in zip(
+            self.small_flames, self.small_bounds[:-1], self.small_bounds[1:], s['opacity'].ravel(),
+        ):
+            flame.points = small[start: end]
+            flame.fill_rgbas[:, 3] = opacity
+            flame.stroke_rgbas[:, 3] = opacity
+
+
+class FireLoop:
+    """
+    Frames of one fire simulated for `period` seconds at `fps`, stored relative to the fire center.
+    Every part of the motion is made periodic so that the last frame leads into the first one:
+    - the main flames are rotated by FireSystem with their flicker frequencies rounded to whole cycles per period
+    - the middle flame flips an even number of times per period, at evenly spaced times
+    - every small flame respawns on a fixed schedule (a whole number of lifetimes per period) and goes through the same
+      respawn positions and speeds on every loop
+    """
+    def __init__(self, fire: VMobject, period: float, fps: float):
+        prototype = fire.copy().clear_updaters().move_to(ORIGIN)
+        system = FireSystem(key='loop')
+        system.ignite(prototype, key=(round(fire.height, 4), period, fps))
+        rng, s = system.rngs[0], system.state
+        n = max(1, round(period * fps))
+        period = n / fps  # The exact duration of the frames
+        times = np.arange(1, n + 1) / fps  # Time of every frame (the last one is the same as the start)
+
+        # Main flames: whole cycles per period, the flips are scheduled here instead of drawn at random by the system
+        s['frequency'] = np.maximum(1, np.round(s['frequency'] * period)) / period
+        s['next_flip_time'][:] = np.inf
+        flips = 2 * max(1, round(period / 2.6))  # On average one flip every 1.3s as in FireSystem
+        flipped = np.arange(1, n + 1) * flips // n % 2 == 1
+
+        main = []
+        for frame_flipped in flipped:
+            s['flipped'][0] = frame_flipped
+            system.step(1 / fps)
+            main.append(np.concatenate([flame.points for flame in system.main_flames]))
+
+        # Small flames: lifetime of period / cycles, one respawn state per cycle
+        offsets, opacity = np.zeros((n, 3, 3)), np.zeros((n, 3))
+        for j in range(3):
+            cycles = max(1, round(period * rng.uniform(0.5, 1.0)))
+            lifetime = period / cycles
+            x, y = rng.uniform(-0.1, 0.1, cycles), -rng.uniform(0.05, 0.15, cycles)
+            # Respawned flames never rise above the height where FireSystem would restart them
+            upward_speed = np.minimum(rng.uniform(0.5, 1.0, cycles), (0.5 - y) / lifetime)
+            age = times + rng.uniform(0, lifetime)
+            cycle = np.floor(age / lifetime).astype(int) % cycles
+            age = np.mod(age, lifetime)
+            offsets[:, j, 0] = x[cycle]
+            offsets[:, j, 1] = y[cycle] + upward_speed[cycle] * age
+            opacity[:, j] = 1 - age / lifetime
+        centers = (s['small_origins'][0][None] + offsets)[:, system.small_owner]
+
+        self.main_frames = np.array(main)
+        self.small_frames = system.small_base[None] + centers
+        self.opacities = opacity
+        self.main_bounds = system.main_bounds
+        self.small_bounds = system.small_bounds
+
+    def __len__(self):
+        return len(self.main_frames)
+
+
+# Baked fire loops keyed by the geometry of the fire, the period and the frame rate
+fire_loops: dict[tuple, FireLoop] = {}
+
+
+def get_fire_loop(fire: VMobject, period: float, fps: float) -> FireLoop:
+    key = (round(fire.height, 4), tuple(len(sm.points) for sm in fire.submobjects), period, fps)
+    if key not in fire_loops:
+        fire_loops[key] = FireLoop(fire, period, fps)
+    return fire_loops[key]
+
+
+class LoopingFireSystem(FireSystem):
+    """
+    A FireSystem that plays a pre-simulated loop instead of simulating every fire.
+    One loop is baked per fire size (and frame rate) and every fire starts at a random frame of it, so a frame only
+    copies the baked points of each fire => the cost does not depend on how complex the flames are.
+    """
+    def __init__(self, key: str = 'fires', period: float = 4., **kwargs):
+        self.period = period
+        self.loops: list[FireLoop] = []
+        self.loop_centers: list[np.ndarray] = []
+        self.loop_offsets: list[int] = []
+        self.loop_time = 0.
+        super().__init__(key=key, **kwargs)
+
+    def ignite(self, fire: VMobject, key=None) -> VMobject:
+        loop = get_fire_loop(fire, self.period, config.frame_rate)
+        self.fires.append(fire)
+        self.loops.append(loop)
+        self.loop_centers.append(fire.get_center())
+        offset = int(self.get_fire_rng(key).integers(len(loop)))
+        self.loop_offsets.append(offset - round(self.loop_time * config.frame_rate))
+        return fire
+
+    def extinguish(self, fire: VMobject) -> VMobject:
+        keep = [other is not fire for other in self.fires]
+        self.fires, self.loops, self.loop_centers, self.loop_offsets = [
+            [item for item, k in zip(items, keep) if k]
+            for items in (self.fires, self.loops, self.loop_centers, self.loop_offsets)
+        ]
+        return fire
+
+    def step(self, dt: float):
+        if not self.fires or dt == 0:
+            return
+        self.loop_time += dt
+        frame = round(self.loop_time * config.frame_rate)
+        for fire, loop, center, offset in zip(self.fires, self.loops, self.loop_centers, self.loop_offsets):
+            i = (frame + offset) % len(loop)
+            main, small = loop.main_frames[i] + center, loop.small_frames[i] + center
+            for flame, start, end in zip(fire.submobjects[:3], loop.main_bounds[:-1], loop.main_bounds[1:]):
+                flame.points = main[start: end]
+            for flame, start, end, opacity in zip(
+                fire.submobjects[-3:], loop.small_bounds[:-1], loop.small_bounds[1:], loop.opacities[i],
+            ):
+                flame.points = small[start: end]
+                flame.fill_rgbas[:, 3] = opacity
+                flame.stroke_rgbas[:, 3] = opacity
@@ -0,0 +1,130 @@
+import numpy as np
+from manim import *
+
+from common.rng import get_rng
+
+
+def lattice_graph(
+    rows: int,
+    cols: int,
+    keep: float = 0.6,
+    jitter: float = 0.3,
+    key: str = 'lattice',
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Random graph on a jittered (rows x cols) lattice: every edge between neighboring lattice points is kept with the
+    given probability. Vertices are numbered in row-major order.
+    :return: Positions of the vertices (n x 3) in lattice units and the edges (m x 2)
+    """
+    rng = get_rng(key, rows, cols, keep, jitter)
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    positions = np.column_stack([c, -r, np.zeros(rows * cols)]).astype(float)
+    positions[:, :2] += rng.uniform(-jitter, jitter, (rows * cols, 2))
+
+    ids = np.arange(rows * cols).reshape(rows, cols)
+    horizontal = np.column_stack([ids[:, :-1].ravel(), ids[:, 1:].ravel()])
+    vertical = np.column_stack([ids[:-1, :].ravel(), ids[1:, :].ravel()])
+    edges = np.concatenate([horizontal, vertical])
+    return positions, edges[rng.random(len(edges)) < keep]
+
+
+def bfs_distances(n: int, edges: np.ndarray, source: int) -> np.ndarray:
+    """ BFS distance of every vertex from the source (-1 for unreachable ones), one vectorized pass per level. """
+    u = np.concatenate([edges[:, 0], edges[:, 1]])
+    v = np.concatenate([edges[:, 1], edges[:, 0]])
+    distances = np.full(n, -1)
+    distances[source] = 0
+    frontier = np.zeros(n, dtype=bool)
+    frontier[source] = True
+    level = 0
+    while frontier.any():
+        reached = v[frontier[u]]
+        reached = np.unique(reached[distances[reached] == -1])
+        level += 1
+        distances[reached] = level
+        frontier[:] = False
+        frontier[reached] = True
+    return distances
+
+
+class PointCloudGraph(Group):
+    """
+    A graph with thousands of vertices drawn as 2 mobjects: all the vertices are a single point cloud with a color per
+    vertex and all the edges are the subpaths of a single VMobject.
+    Vertex colors are changed by writing into the RGBA array of the point cloud => no mobject per vertex or edge.
+    """
+    def __init__(
+        self,
+        positions: np.ndarray,
+        edges: np.ndarray,
+        width: float = 12,
+        height: float = 6.5,
+        vertex_color: ManimColor = WHITE,
+        vertex_size: float = 4,
+        edge_color: ManimColor = GREY,
+        edge_width: float = 1,
+        edge_opacity: float = 0.5,
+        **kwargs,
+    ):
+        # Fit the positions into a (width x height) box centered at the origin
+        positions = positions - (positions.min(axis=0) + positions.max(axis=0)) / 2
+        extent = np.ptp(positions, axis=0)[:2]
+        positions = positions * min(width / max(extent[0], 1e-9), height / max(extent[1], 1e-9))
+
+        self.edge_pairs = edges
+        self.vertex_cloud = PMobject(stroke_width=vertex_size)
+        self.vertex_cloud.add_points(positions, color=vertex_color)
+
+        # Every edge is one straight cubic curve => the edges are separate subpaths of the same VMobject
+        start, end = positions[edges[:, 0]], positions[edges[:, 1]]
+        curves = np.stack([start, (2 * start + end) / 3, (start + 2 * end) / 3, end], axis=1)
+        self.edge_lines = VMobject(stroke_color=edge_color, stroke_width=edge_width, stroke_opacity=edge_opacity)
+        self.edge_lines.points = curves.reshape(-1, 3)
+        super().__init__(self.edge_lines, self.vertex_cloud, **kwargs)
+
+    @property
+    def rgbas(self) -> np.ndarray:
+        return self.vertex_cloud.rgbas
+
+    def set_vertex_colors(self, vertices: np.ndarray | list[int], color: ManimColor) -> 'PointCloudGraph':
+        """ Color the given vertices (indices or a boolean mask) in place. """
+        self.rgbas[vertices] = ManimColor(color).to_rgba()
+        return self
+
+
+class SpreadFrontier(Animation):
+    """
+    Reveal a BFS level by level on a PointCloudGraph: the frontier is highlighted and the vertices behind it are marked
+    as burned. The colors are computed from the distance array for the whole graph at once on every frame.
+    """
+    def __init__(
+        self,
+        graph: PointCloudGraph,
+        distances: np.ndarray,
+        frontier_color: ManimColor = ORANGE,
+        burned_color: ManimColor = DARK_GRAY,
+        **kwargs,
+    ):
+        self.graph = graph
+        self.distances = distances
+        self.frontier_rgba = ManimColor(frontier_color).to_rgba()
+        self.burned_rgba = ManimColor(burned_color).to_rgba()
+        self.nb_levels = distances.max() + 1
+        super().__init__(graph, **kwargs)
+
+    def begin(self) -> None:
+        self.start_rgbas = self.graph.rgbas.copy()
+        super().begin()
+
+    def create_starting_mobject(self) -> Mobject:
+        # The start colors are kept in an array => no copy of the whole point cloud is needed
+        return self.mobject
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        level = self.rate_func(alpha) * self.nb_levels
+        reached = (self.distances >= 0) & (self.distances < level)
+        frontier = reached & (self.distances >= level - 1)
+        rgbas = self.graph.rgbas
+        rgbas[:] = self.start_rgbas
+        rgbas[reached & ~frontier] = self.burned_rgba
+        rgbas[frontier] = self.frontier_rgba
@@ -1,13 +1,24 @@
-import math
-import random
 from collections import deque
 from textwrap import dedent
 
 import networkx as nx
 from manim import *
 
+from bfs.code_grid import CodeGrid
+from bfs.fire import FireSystem, LoopingFireSystem
+from bfs.large_graph import PointCloudGraph, SpreadFrontier, bfs_distances, lattice_graph
+from bfs.raster_grid import FloodFill, RasterGrid, random_islands
+from bfs.ring_queue import RingQueue
+from bfs.spread import BurnEdge, BurnedEdge, FireSpread, bfs_levels, grid_neighbors
+from common.code import TypeCode, make_code
+from common.graphs import make_graph
+from common.svg import load_svg
+from common.tex_batch import precompile_tex
+
 ORANGE = ManimColor('#fa541c')
-random.seed(42)
+
+# Typeset the literal Tex strings of all the scenes in a single LaTeX run (no-op once the tex cache is warm)
+precompile_tex(__file__)
 
 g = [
     [2],
@@ -50,103 +61,12 @@ layout = {
 }
 
 
-def update_fire(mobj, dt):
-    if not hasattr(mobj, 'initialized'):
-        mobj.initialized = True
-
-        # The 3 small flames are the last 3 submobjects
-        mobj.small_flames = mobj.submobjects[-3:]
-        mobj.initial_positions = [f.get_center() for f in mobj.small_flames]
-
-        mobj.original_height = mobj.height
-        mobj.time_elapsed = 0.0
-
-        # Initialize small flame data
-        mobj.flame_data = []
-        for i, f in enumerate(mobj.small_flames):
-            f.move_to(mobj.initial_positions[i] + np.array([random.uniform(-0.1, 0.1), 0, 0]))
-            f.set_fill(opacity=1.0)
-            f.set_stroke(opacity=1.0)
-
-            upward_speed = random.uniform(0.5, 1.0)
-            fade_speed = random.uniform(0.5, 1.0)
-            mobj.flame_data.append({
-                'upward_speed': upward_speed,
-                'fade_speed': fade_speed,
-            })
-
-        # The 3 main flames are the first 3 submobjects
-        mobj.main_flames = mobj.submobjects[0:3]
-
-        # Initialize independent flicker parameters for each main flame layer
-        mobj.main_flame_data = []
-        for mf in mobj.main_flames:
-            mobj.main_flame_data.append({
-                'center': mf.get_center(),
-                'amplitude': random.uniform(0.01, 0.03),
-                'frequency': random.uniform(1.5, 3.0),
-                'phase': random.uniform(0, 2 * math.pi),
-                'current_angle': 0,
-                'time_since_flip': 0.0,
-                'next_flip_time': random.uniform(0.3, 1.0),
-                'flipped': False,
-            })
-
-    mobj.time_elapsed += dt
-
-    # Update the three main flame layers with independent rotations
-    for i, (mf, mf_data) in enumerate(zip(mobj.main_flames, mobj.main_flame_data)):
-        # Compute this flame's flicker angle
-        local_time = mobj.time_elapsed
-        angle = mf_data['amplitude'] * math.sin(local_time * mf_data['frequency'] * TAU + mf_data['phase'])
-
-        # Rotate this flame about its own center
-        delta = angle - mf_data['current_angle']
-        mf.rotate(delta, about_point=mf_data['center'])
-        mf_data['current_angle'] = angle
-
-        # Update flipping only for the inner main flames (i.e., not the topmost one)
-        if i in (1,):
-            mf_data['time_since_flip'] += dt
-            if mf_data['time_since_flip'] > mf_data['next_flip_time']:
-                # Time to flip horizontally => Flip about its center by scaling in X by -1
-                mf.scale([-1, 1, 1], about_point=mf_data['center'])
-                mf_data['flipped'] = not mf_data['flipped']
-                mf_data['time_since_flip'] = 0.0
-                mf_data['next_flip_time'] = (3 - i) * random.uniform(0.3, 1.0)
-
-    # Update each small flame
-    for i, f in enumerate(mobj.small_flames):
-        data = mobj.flame_data[i]
-
-        # Move upward
-        f.shift(UP * data['upward_speed'] * dt)
-
-        current_opacity = f.get_fill_opacity()
-        new_opacity = current_opacity - data['fade_speed'] * dt
-
-        f.set_fill(opacity=new_opacity)
-        f.set_stroke(opacity=new_opacity)
-
-        flame_pos = f.get_center()
-        if new_opacity <= 0.0 or (flame_pos[1] - mobj.initial_positions[i][1]) > 0.5:
-            new_x = mobj.initial_positions[i][0] + random.uniform(-0.1, 0.1)
-            new_y = mobj.initial_positions[i][1] - random.uniform(0.05, 0.15)
-            f.move_to([new_x, new_y, 0])
-
-            f.set_fill(opacity=1.0)
-            f.set_stroke(opacity=1.0)
-
-            data['upward_speed'] = random.uniform(0.5, 1.0)
-            data['fade_speed'] = random.uniform(0.5, 1.0)
-
-
 class Introduction(Scene):
     def construct(self):
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
 
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -159,52 +79,19 @@ class Introduction(Scene):
             label.set_z_index(10)
         self.wait(2)
 
-        def burn(vertex: int, run_time: float = 0.5):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.7).move_to(graph.vertices[vertex], DOWN)
-            fire_icon.set_z_index(5)
-            self.play(ShowIncreasingSubsets(fire_icon, run_time=run_time))
-            fire_icon.add_updater(update_fire)
-            return fire_icon
-
-        def spread_fire(source: int, target: int, run_time: float = 0.5):
-            sparkler = SVGMobject('bfs/sparks.svg').scale(0.25).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
-            sparkler.set_z_index(5)
+        fires = FireSystem(key='Introduction')
+        self.add(fires)
 
-            edge = Line(graph.vertices[source].get_center(), graph.vertices[target].get_center(), buff=0.4)
-            burned_edge = VMobject()
-            burned_edge.add_updater(lambda x: x.become(Line(
-                edge.get_start(), sparkler.get_center(), stroke_width=6,
-            ).set_color(DARK_GRAY)))
-            self.add(sparkler, burned_edge)
-
-            self.play(MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear))
-            self.remove(sparkler)
-            burning_target = burn(target, run_time=run_time / 2)
-            return burning_target
-
-        burn(7)
+        spread = FireSpread(self, fires, graph.vertices, spark_scale=0.25, spark_speed=8.)
+        spread.burn(7)
         self.wait(1)
-        spread_fire(7, 5, run_time=0.3)
-        spread_fire(7, 6, run_time=0.3)
-        self.wait(0.5)
-        spread_fire(5, 8, run_time=0.2)
-        spread_fire(5, 4, run_time=0.2)
-        spread_fire(5, 3, run_time=0.2)
-        self.wait(0.5)
-        spread_fire(6, 10, run_time=0.2)
-        spread_fire(8, 9, run_time=0.2)
-        self.wait(0.4)
-        spread_fire(10, 11, run_time=0.6)
-        spread_fire(9, 2, run_time=0.3)
-        self.wait(0.3)
-        spread_fire(2, 0, run_time=0.1)
-        spread_fire(2, 1, run_time=0.1)
+        spread.spread(7, lambda vertex: g[vertex], wait=0.4)
         self.wait(5)
 
 
 class IntroductionImplementation(Scene):
     def construct(self):
-        code = Code(
+        code = make_code(
             code=dedent('''
                 used[start] = True
                 q = deque([start])
@@ -223,9 +110,7 @@ class IntroductionImplementation(Scene):
             style='monokai',
         ).center().code
 
-        for line in code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line, run_time=0.1 * len(line)))
+        self.play(TypeCode(code.chars))
         self.wait(2)
 
 
@@ -242,10 +127,11 @@ class DisplayMultipleGraphs(Scene):
 
         for graph, name in graphs:
             title = Text(name).scale(0.7).to_edge(UP)
-            g = Graph(
+            g = make_graph(
                 list(graph.nodes),
                 list(graph.edges),
                 layout='spring',
+                layout_config={'seed': 42},
                 labels=True,
                 layout_scale=3,
                 vertex_config={'radius': 0.4, 'stroke_width': 0, 'fill_color': WHITE},
@@ -267,7 +153,7 @@ class GraphDefinition(Scene):
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
 
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -294,10 +180,11 @@ class GraphDefinition(Scene):
 
         # Replace the graph with a complete graph
         complete = nx.complete_graph(6)
-        complete_graph = Graph(
+        complete_graph = make_graph(
             list(complete.nodes),
             list(complete.edges),
             layout='spring',
+            layout_config={'seed': 42},
             labels=True,
             layout_scale=3,
             vertex_config={'radius': 0.4, 'stroke_width': 0, 'fill_color': WHITE},
@@ -308,7 +195,7 @@ class GraphDefinition(Scene):
 
         # Replace the complete graph with a tree
         tree = nx.balanced_tree(2, 3)
-        tree_graph = Graph(
+        tree_graph = make_graph(
             list(tree.nodes),
             list(tree.edges),
             root_vertex=0,
@@ -324,8 +211,9 @@ class GraphDefinition(Scene):
         # Replace the tree with a directed graph
         vertices = [i for i in range(5)]
         edges = [(0, 1), (1, 2), (3, 2), (3, 4), (4, 0), (4, 2)]
-        directed_graph = DiGraph(
+        directed_graph = make_graph(
             vertices, edges,
+            graph_class=DiGraph,
             layout='circular',
             labels=True,
             layout_scale=3,
@@ -346,15 +234,16 @@ class Motivation(Scene):
         # Draw a graph with one node in the center and 5 nodes around it (friends)
         vertices = list(range(6))
         edges = [(0, i) for i in range(1, 6)]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout='spring',
+            layout_config={'seed': 42},
             layout_scale=3,
             vertex_config={'radius': 0.6, 'stroke_width': 4, 'fill_color': BLACK, 'stroke_color': WHITE},
             edge_config={'stroke_width': 5},
         ).shift(0.2 * DOWN).scale(0.8)
 
-        person = SVGMobject('bfs/person.svg').scale(0.2)
+        person = load_svg('bfs/person.svg').scale(0.2)
         central = person.copy().move_to(graph.vertices[0]).set_fill(ORANGE)
         friends = VGroup(*[person.copy().move_to(graph.vertices[i]).set_fill(WHITE) for i in range(1, 6)])
 
@@ -370,14 +259,14 @@ class Motivation(Scene):
         vertices = list(range(10))
         edges = [(0, i) for i in range(1, 6)]
         edges += [(1, 9), (0, 7), (5, 6), (5, 8), (8, 9), (9, 2)]
-        web_graph = Graph(
+        web_graph = make_graph(
             vertices, edges,
             layout='kamada_kawai',
             layout_scale=3,
             vertex_config={'radius': 0.6, 'stroke_width': 4, 'fill_color': BLACK, 'stroke_color': WHITE},
             edge_config={'stroke_width': 5},
         ).scale(0.8)
-        webpage_icon = SVGMobject('bfs/webpage.svg').scale(0.2)
+        webpage_icon = load_svg('bfs/webpage.svg').scale(0.2)
         webpages = [
             webpage_icon.copy().set_fill(ORANGE if i == 0 else YELLOW).move_to(web_graph.vertices[i])
             for i in range(10)
@@ -407,7 +296,7 @@ class Motivation(Scene):
 
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        shortest_path_graph = Graph(
+        shortest_path_graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -500,7 +389,7 @@ class Motivation(Scene):
 
         self.play(FadeOut(dot), run_time=0.2)
         # Show a search icon and drop it on node 9
-        search = (SVGMobject('bfs/search.svg')
+        search = (load_svg('bfs/search.svg')
                   .move_to(shortest_path_graph.vertices[9])
                   .shift(0.25 * DOWN).shift(0.25 * RIGHT)
                   .set_fill(RED).set_z_index(1000000))
@@ -540,7 +429,7 @@ class BFSOnGraph(Scene):
         title = Title('Breadth First Search', include_underline=False)
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -563,48 +452,15 @@ class BFSOnGraph(Scene):
         )
         self.wait(0.5)
 
-        def burn(vertex: int, run_time: float = 0.5):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.7).move_to(graph.vertices[vertex], DOWN)
-            fire_icon.set_z_index(5)
-            self.play(ShowIncreasingSubsets(fire_icon, run_time=run_time))
-            fire_icon.add_updater(update_fire)
-            return fire_icon
-
-        def spread_fire(source: int, target: int, run_time: float = 0.5):
-            sparkler = SVGMobject('bfs/sparks.svg').scale(0.25).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
-            sparkler.set_z_index(5)
-
-            edge = Line(graph.vertices[source].get_center(), graph.vertices[target].get_center(), buff=0.4)
-            burned_edge = VMobject()
-            burned_edge.add_updater(lambda x: x.become(Line(
-                edge.get_start(), sparkler.get_center(), stroke_width=6,
-            ).set_color(DARK_GRAY)))
-            self.add(sparkler, burned_edge)
-
-            self.play(MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear))
-            self.remove(sparkler)
-            burning_target = burn(target, run_time=run_time / 2)
-            return burning_target, burned_edge
+        fires = FireSystem(key='BFSOnGraph')
+        self.add(fires)
 
-        burning_icons = {}
-        burning_icons[7] = burn(7)
-        self.wait(1)
-        burning_icons[5] = spread_fire(7, 5, run_time=0.6)
-        burning_icons[6] = spread_fire(7, 6, run_time=0.6)
-        self.wait(2)
-        burning_icons[8] = spread_fire(5, 8, run_time=0.4)
-        burning_icons[4] = spread_fire(5, 4, run_time=0.4)
-        burning_icons[3] = spread_fire(5, 3, run_time=0.4)
-        burning_icons[10] = spread_fire(6, 10, run_time=0.4)
+        spread = FireSpread(self, fires, graph.vertices, spark_scale=0.25, spark_speed=4.)
+        spread.burn(7)
         self.wait(1)
-        burning_icons[9] = spread_fire(8, 9, run_time=0.5)
-        burning_icons[11] = spread_fire(10, 11, run_time=0.4)
-        self.wait(0.8)
-        burning_icons[2] = spread_fire(9, 2, run_time=0.5)
-        self.wait(0.8)
-        burning_icons[0] = spread_fire(2, 0, run_time=0.4)
-        burning_icons[1] = spread_fire(2, 1, run_time=0.4)
-        self.wait(6)
+        for edges, wait in zip(bfs_levels(7, lambda vertex: g[vertex]), [2, 1, 0.8, 0.8, 6]):
+            spread.play_level(edges)
+            self.wait(wait)
 
         # Dotted circle around all the nodes accessible from 7
         accessible = [5, 6, 8, 4, 3, 10, 9, 11, 2, 0, 1]
@@ -612,7 +468,7 @@ class BFSOnGraph(Scene):
         animations = []
         for v in accessible:
             circles.append(DashedVMobject(Circle(radius=0.6, color=YELLOW)).move_to(graph.vertices[v]))
-            animations.append(FadeOut(*burning_icons[v]))
+            animations.append(FadeOut(spread.burning[v], spread.burned_edges[v]))
             animations.append(graph.vertices[v].animate.set_fill(YELLOW))
             animations.append(graph._labels[v].animate.set_z_index(100000))
             animations.append(Create(circles[-1]))
@@ -621,7 +477,7 @@ class BFSOnGraph(Scene):
 
         circle = DashedVMobject(Circle(radius=0.6, color=ORANGE)).move_to(graph.vertices[7])
         self.play(LaggedStart(
-            FadeOut(*burning_icons[7]),
+            FadeOut(spread.burning[7]),
             graph.vertices[7].animate.set_fill(ORANGE),
             graph._labels[7].animate.set_z_index(100000),
             Create(circle),
@@ -646,7 +502,7 @@ class BFSState(Scene):
         title = Title('BFS State', include_underline=False)
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -681,67 +537,42 @@ class BFSState(Scene):
         self.play(Write(burning_title), run_time=1)
         self.wait(1)
 
+        fires = FireSystem(key='BFSState')
+        self.add(fires)
+
         # Draw an untouched node and a burning node (O/🔥)
         untouched = Circle(radius=0.2, color=WHITE, fill_opacity=1).next_to(burning_title, 2 * DOWN).shift(LEFT)
         slash = Text('/').scale(1.5).next_to(untouched, RIGHT)
-        burning = SVGMobject('bfs/fire.svg').scale(0.3).next_to(slash, RIGHT).shift(0.05 * UP)
+        burning = load_svg('bfs/fire.svg').scale(0.3).next_to(slash, RIGHT).shift(0.05 * UP)
 
         self.play(LaggedStart(Create(untouched), Write(slash), ShowIncreasingSubsets(burning), lag_ratio=0.5), run_time=1)
-        burning.add_updater(update_fire)
+        fires.ignite(burning)
         self.wait(2)
 
         # Write Burning Nodes in the second column
         burning_nodes_title = Text('Burning Nodes').scale(0.7).next_to(right, LEFT, buff=1).align_to(right, UP)
         self.play(Write(burning_nodes_title), run_time=1)
 
-        def burn(vertex: int, run_time: float = 0.5):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.7 * 0.25).move_to(graph.vertices[vertex], DOWN)
-            fire_icon.set_z_index(5)
-            self.play(ShowIncreasingSubsets(fire_icon, run_time=run_time))
-            fire_icon.add_updater(update_fire)
-            return fire_icon
-
-        def spread_fire(source: int, target: int, run_time: float = 0.5):
-            sparkler = SVGMobject('bfs/sparks.svg').scale(0.3 * 0.25).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
-            sparkler.set_z_index(5)
-
-            edge = Line(graph.vertices[source].get_center(), graph.vertices[target].get_center(), buff=0.4 * 0.25)
-            burned_edge = VMobject()
-            burned_edge.add_updater(lambda x: x.become(Line(
-                edge.get_start(), sparkler.get_center(), stroke_width=6,
-            ).set_color(DARK_GRAY)))
-            self.add(sparkler, burned_edge)
-
-            self.play(MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear))
-            self.remove(sparkler)
-            burning_target = burn(target, run_time=run_time / 2)
-            return burning_target, burned_edge
-
-        burning_icons = {}
-        burning_icons[7] = burn(7)
-        self.wait(0.2)
-        burning_icons[5] = spread_fire(7, 5, run_time=0.05)
-        burning_icons[6] = spread_fire(7, 6, run_time=0.05)
-        self.wait(0.2)
-        burning_icons[8] = spread_fire(5, 8, run_time=0.05)
-        burning_icons[4] = spread_fire(5, 4, run_time=0.05)
-        burning_icons[3] = spread_fire(5, 3, run_time=0.05)
-        burning_icons[10] = spread_fire(6, 10, run_time=0.05)
+        spread = FireSpread(self, fires, graph.vertices, scale=0.25)
+        burning_icons = {7: spread.burn(7)}
         self.wait(0.2)
+        for edges in bfs_levels(7, lambda vertex: g[vertex])[:2]:
+            burning_icons.update(spread.play_level(edges, spark_time=0.05))
+            self.wait(0.2)
 
         # Draw a queue with the burning nodes (8, 4, 3, 10)
         queue = []
         queue_texts = []
         def add2queue(vertex: int):
             nonlocal queue
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.3)
+            fire_icon = load_svg('bfs/fire.svg').scale(0.3)
             fire_icon.next_to(burning_nodes_title if len(queue) == 0 else queue[-1], DOWN, buff=0.4 if len(queue) == 0 else 0.2)
             fire_icon.set_z_index(5)
             queue.append(fire_icon)
             vertex_text = Text(str(vertex)).scale(0.4).set_color(BLACK).move_to(queue[-1]).shift(0.12 * DOWN).set_z_index(10)
             queue_texts.append(vertex_text)
             self.play(ShowIncreasingSubsets(queue[-1]), Write(vertex_text), run_time=0.2)
-            queue[-1].add_updater(update_fire)
+            fires.ignite(queue[-1], key=('queue', vertex))
 
         add2queue(8)
         add2queue(4)
@@ -753,7 +584,7 @@ class BFSState(Scene):
         graph_title = Text('Graph').scale(0.7).next_to(right, RIGHT, buff=1).align_to(right, UP)
         self.play(Write(graph_title), run_time=1)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 g = [
                 
@@ -773,9 +604,7 @@ class BFSState(Scene):
             style='monokai',
         ).scale(0.7).next_to(graph_title, DOWN).shift(0.5 * LEFT).code
 
-        for line in code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line, run_time=0.05 * len(line)))
+        self.play(TypeCode(code.chars, time_per_char=0.05))
 
         graph_copy = graph.copy()
         self.play(
@@ -810,7 +639,7 @@ class GraphRepresentation(Scene):
         title = Title('Graph', include_underline=False)
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -822,7 +651,7 @@ class GraphRepresentation(Scene):
         for label in graph._labels.values():
             label.set_z_index(10)
 
-        old_code = Code(
+        old_code = make_code(
             code=dedent('''
                 g = [
 
@@ -844,7 +673,7 @@ class GraphRepresentation(Scene):
         self.add(old_code)
         self.wait(3)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 g = [
                     # Connections of 0
@@ -871,15 +700,14 @@ class GraphRepresentation(Scene):
         ).scale(0.7).code.scale(1.2).align_to(old_code, LEFT).align_to(old_code, UP)
 
         self.play(FadeOut(old_code[-1]), run_time=0.2)
-        for line in code.chars:
-            self.play(AddTextLetterByLetter(line, run_time=0.03 * len(line)))
+        self.play(TypeCode(code.chars, time_per_char=0.03))
         self.play(FadeOut(old_code[:-1]), run_time=0.5)
         self.wait(2)
 
         self.play(Indicate(code.chars[0][0], scale_factor=2.5), run_time=2)
         self.wait(2)
 
-        code_list = Code(
+        code_list = make_code(
             code=dedent('''
                 g = [
                     [2],              # 0
@@ -1000,26 +828,29 @@ class GraphRepresentation(Scene):
         burning_nodes_title = Text('Burning Nodes').scale(0.7).next_to(right, LEFT, buff=1).align_to(right, UP)
         self.play(Write(burning_title), Write(burning_nodes_title), run_time=0.2)
 
+        fires = FireSystem(key='GraphRepresentation')
+        self.add(fires)
+
         # Draw an untouched node and a burning node (O/🔥)
         untouched = Circle(radius=0.2, color=WHITE, fill_opacity=1).next_to(burning_title, 2 * DOWN).shift(LEFT)
         slash = Text('/').scale(1.5).next_to(untouched, RIGHT)
-        burning = SVGMobject('bfs/fire.svg').scale(0.3).next_to(slash, RIGHT).shift(0.05 * UP)
+        burning = load_svg('bfs/fire.svg').scale(0.3).next_to(slash, RIGHT).shift(0.05 * UP)
 
         self.add(untouched, slash, burning)
-        burning.add_updater(update_fire)
+        fires.ignite(burning)
 
         queue = []
         queue_texts = []
         def add2queue(vertex: int):
             nonlocal queue
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.3)
+            fire_icon = load_svg('bfs/fire.svg').scale(0.3)
             fire_icon.next_to(burning_nodes_title if len(queue) == 0 else queue[-1], DOWN, buff=0.4 if len(queue) == 0 else 0.2)
             fire_icon.set_z_index(5)
             queue.append(fire_icon)
             vertex_text = Text(str(vertex)).scale(0.4).set_color(BLACK).move_to(queue[-1]).shift(0.12 * DOWN).set_z_index(10)
             queue_texts.append(vertex_text)
             self.add(queue[-1], vertex_text)
-            queue[-1].add_updater(update_fire)
+            fires.ignite(queue[-1], key=('queue', vertex))
 
         add2queue(8)
         add2queue(4)
@@ -1045,7 +876,7 @@ class UsedState(Scene):
         title = Title('Burning State', include_underline=False)
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -1057,7 +888,7 @@ class UsedState(Scene):
         for label in graph._labels.values():
             label.set_z_index(10)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 used = [
                     False,  # 0
@@ -1090,39 +921,18 @@ class UsedState(Scene):
         self.play(Indicate(code[0], scale_factor=1.5), run_time=2)
         self.wait(4)
 
-        for line in code.chars[1:-1]:
-            self.play(AddTextLetterByLetter(line, run_time=0.01 * len(line)))
+        self.play(TypeCode(code.chars[1:-1], time_per_char=0.01))
         self.wait(1)
 
 
-        def burn(vertex: int, run_time: float = 0.5, scale: float = 0.6):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.7 * scale).move_to(graph.vertices[vertex], DOWN)
-            fire_icon.set_z_index(5)
-            self.play(ShowIncreasingSubsets(fire_icon, run_time=run_time))
-            fire_icon.add_updater(update_fire)
-            return fire_icon
+        fires = FireSystem(key='UsedState')
+        self.add(fires)
 
-        def spread_fire(source: int, target: int, run_time: float = 0.5, scale: float = 0.6):
-            sparkler = SVGMobject('bfs/sparks.svg').scale(0.3 * scale).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
-            sparkler.set_z_index(5)
-
-            edge = Line(graph.vertices[source].get_center(), graph.vertices[target].get_center(), buff=0.4 * scale)
-            burned_edge = VMobject()
-            burned_edge.add_updater(lambda x: x.become(Line(
-                edge.get_start(), sparkler.get_center(), stroke_width=6,
-            ).set_color(DARK_GRAY)))
-            self.add(sparkler, burned_edge)
-
-            self.play(MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear))
-            self.remove(sparkler)
-            burning_target = burn(target, run_time=run_time / 2, scale=scale)
-            return burning_target, burned_edge
-
-        burning_icons = {}
-        burning_icons[7] = burn(7)
+        spread = FireSpread(self, fires, graph.vertices, scale=0.6)
+        burning_icons = {7: spread.burn(7)}
         self.play(Circumscribe(code.chars[8], buff=0.02), run_time=1)
 
-        true_code = Code(
+        true_code = make_code(
             code=dedent('''
                 used = [
                     True,   # 0
@@ -1162,7 +972,7 @@ class UsedState(Scene):
         left = Line(start=section_width * LEFT / 2 + 3 * DOWN, end=section_width * LEFT / 2 + UP / 2).set_stroke(WHITE, 2)
         right = Line(start=section_width * RIGHT / 2 + 3 * DOWN, end=section_width * RIGHT / 2 + UP / 2).set_stroke(WHITE, 2)
 
-        code_list = Code(
+        code_list = make_code(
             code=dedent('''
                 g = [
                     [2],              # 0
@@ -1210,23 +1020,27 @@ class UsedState(Scene):
 
         queue = []
         queue_texts = []
+        queue_icons = {}
         def add2queue(vertex: int):
+            # The icon is ignited by the caller once it's shown (the fire updater would override the FadeIn)
             nonlocal queue
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.2)
+            fire_icon = load_svg('bfs/fire.svg').scale(0.2)
             fire_icon.next_to(burning_nodes_title if len(queue) == 0 else queue[-1], DOWN, buff=0.4 if len(queue) == 0 else 0.2)
             fire_icon.set_z_index(5)
             queue.append(fire_icon)
             vertex_text = Text(str(vertex)).scale(0.3).set_color(BLACK).move_to(queue[-1]).shift(0.08 * DOWN).set_z_index(10)
             queue_texts.append(vertex_text)
-            self.add(queue[-1], vertex_text)
-            queue[-1].add_updater(update_fire)
+            queue_icons[vertex] = fire_icon
+            return AnimationGroup(FadeIn(queue[-1]), FadeIn(vertex_text))
 
+        spread = FireSpread(self, fires, graph.vertices, scale=0.3)
         burning_icons: dict[int, tuple[SVGMobject, VMobject | None]] = {
-            7: (burn(7, scale=0.3), None),
+            7: (spread.burn(7), None),
         }
         used = {7: True}
-        add2queue(7)
-        self.wait(1)
+        self.play(add2queue(7), run_time=0.2)
+        fires.ignite(queue_icons[7], key=('queue', 7))
+        self.wait(0.8)
 
         def spread_from_source(vertex: int):
             # Circle around the queue front
@@ -1234,13 +1048,13 @@ class UsedState(Scene):
             self.play(Create(circle), run_time=0.2)
             self.wait(0.2)
 
-            for to in g[vertex]:
-                if used.get(to, False):
-                    continue
-                used[to] = True
-                burning_icons[to] = spread_fire(vertex, to, scale=0.3)
-                add2queue(to)
-                self.wait(0.2)
+            # All the neighbors catch fire together and join the queue when their spark arrives
+            edges = [(vertex, to) for to in g[vertex] if not used.get(to, False)]
+            used.update({to: True for _, to in edges})
+            burning_icons.update(spread.play_level(edges, arrivals=[add2queue(to) for _, to in edges]))
+            for _, to in edges:
+                fires.ignite(queue_icons[to], key=('queue', to))
+            self.wait(0.2)
 
             # Remove vertex from the queue front
             self.play(FadeOut(queue[0], queue_texts[0], circle), run_time=0.2)
@@ -1248,8 +1062,7 @@ class UsedState(Scene):
             queue_texts.pop(0)
             animations = []
             for icon, text in zip(queue, queue_texts):
-                icon.clear_updaters()
-                delattr(icon, 'initialized')
+                fires.extinguish(icon)
                 animations.append(AnimationGroup(
                     icon.animate.shift(0.6 * UP),
                     text.animate.shift(0.6 * UP),
@@ -1257,7 +1070,7 @@ class UsedState(Scene):
             self.play(LaggedStart(*animations, lag_ratio=0.2, run_time=0.5))
             # Add updaters to burning queue elements
             for icon in queue:
-                icon.add_updater(update_fire)
+                fires.ignite(icon)
 
         spread_from_source(7)
         self.wait(1)
@@ -1281,7 +1094,7 @@ class UsedState(Scene):
         spread_from_source(9)
         self.wait(2)
 
-        queue_code = Code(
+        queue_code = make_code(
             code=dedent('''
                 from collections import deque
             ''').strip(),
@@ -1322,7 +1135,7 @@ class Implementation(Scene):
         title = Title('BFS Implementation', include_underline=False)
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -1330,7 +1143,7 @@ class Implementation(Scene):
             edge_config={'stroke_width': 5},
         ).scale(0.39375).next_to(title, DOWN, buff=0.5).to_edge(LEFT, buff=1)
 
-        graph_code = Code(
+        graph_code = make_code(
             code=dedent('''
                 g = [
                     [2],              # 0
@@ -1361,7 +1174,7 @@ class Implementation(Scene):
             label.set_z_index(10)
         self.wait(3.5)
 
-        used_init_code = Code(
+        used_init_code = make_code(
             code=dedent('''
                 used = [False] * len(g)
             ''').strip(),
@@ -1375,7 +1188,7 @@ class Implementation(Scene):
         self.wait(4)
 
 
-        bfs_code = Code(
+        bfs_code = make_code(
             code=dedent('''
                 from collections import deque
                 
@@ -1400,45 +1213,28 @@ class Implementation(Scene):
             style='monokai',
         ).scale(0.7).code.scale(1.14).next_to(title, DOWN, buff=0.5).align_to(ORIGIN, LEFT)
 
-        def burn(vertex: int, run_time: float = 0.5, scale: float = 0.6):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.7 * scale).move_to(graph.vertices[vertex], DOWN)
-            fire_icon.set_z_index(5)
-            self.play(ShowIncreasingSubsets(fire_icon, run_time=run_time))
-            fire_icon.add_updater(update_fire)
-            return fire_icon
-
-        def spread_fire(source: int, target: int, run_time: float = 0.5, scale: float = 0.6):
-            sparkler = SVGMobject('bfs/sparks.svg').scale(0.3 * scale).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
-            sparkler.set_z_index(5)
-
-            edge = Line(graph.vertices[source].get_center(), graph.vertices[target].get_center(), buff=0.4 * scale)
-            burned_edge = VMobject()
-            burned_edge.add_updater(lambda x: x.become(Line(
-                edge.get_start(), sparkler.get_center(), stroke_width=6,
-            ).set_color(DARK_GRAY)))
-            self.add(sparkler, burned_edge)
-
-            self.play(MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear))
-            self.remove(sparkler)
-            burning_target = burn(target, run_time=run_time / 2, scale=scale)
-            return burning_target, burned_edge
+        fires = FireSystem(key='Implementation')
+        self.add(fires)
 
         queue = []
         queue_texts = []
+        queue_icons = {}
         burning_nodes_title = Text('Queue:').scale(0.5).next_to(graph, DOWN, buff=0.25)
         def add2queue(vertex: int):
+            # The icon is ignited by the caller once it's shown (the fire updater would override the FadeIn)
             nonlocal queue
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.25)
+            fire_icon = load_svg('bfs/fire.svg').scale(0.25)
             fire_icon.next_to(burning_nodes_title if len(queue) == 0 else queue[-1], DOWN, buff=0.3 if len(queue) == 0 else 0.15)
             fire_icon.set_z_index(5)
             queue.append(fire_icon)
             vertex_text = Text(str(vertex)).scale(0.33).set_color(BLACK).move_to(queue[-1]).shift(0.08 * DOWN).set_z_index(10)
             queue_texts.append(vertex_text)
-            self.add(queue[-1], vertex_text)
-            queue[-1].add_updater(update_fire)
+            queue_icons[vertex] = fire_icon
+            return AnimationGroup(FadeIn(queue[-1]), FadeIn(vertex_text))
 
+        spread = FireSpread(self, fires, graph.vertices, scale=0.4)
         burning_icons: dict[int, tuple[SVGMobject, VMobject | None]] = {
-            7: (burn(7, scale=0.4), None),
+            7: (spread.burn(7), None),
         }
         used = {7: True}
         # Remove the code by moving it up
@@ -1456,8 +1252,9 @@ class Implementation(Scene):
         self.wait(1)
 
         self.play(Write(burning_nodes_title), run_time=1)
-        add2queue(7)
-        self.wait(2)
+        self.play(add2queue(7), run_time=0.2)
+        fires.ignite(queue_icons[7], key=('queue', 7))
+        self.wait(1.8)
 
         def spread_from_source(vertex: int, run_time=0.2):
             # Circle around the queue front
@@ -1465,13 +1262,18 @@ class Implementation(Scene):
             self.play(Create(circle), run_time=run_time)
             self.wait(run_time)
 
-            for to in g[vertex]:
-                if used.get(to, False):
-                    continue
-                used[to] = True
-                burning_icons[to] = spread_fire(vertex, to, scale=0.4, run_time=2 * run_time)
-                add2queue(to)
-                self.wait(run_time)
+            # All the neighbors catch fire together and join the queue when their spark arrives
+            edges = [(vertex, to) for to in g[vertex] if not used.get(to, False)]
+            used.update({to: True for _, to in edges})
+            burning_icons.update(spread.play_level(
+                edges,
+                arrivals=[add2queue(to) for _, to in edges],
+                spark_time=2 * run_time,
+                burn_time=run_time,
+            ))
+            for _, to in edges:
+                fires.ignite(queue_icons[to], key=('queue', to))
+            self.wait(run_time)
 
             # Remove vertex from the queue front
             self.play(FadeOut(queue[0], queue_texts[0], circle), run_time=run_time)
@@ -1479,8 +1281,7 @@ class Implementation(Scene):
             queue_texts.pop(0)
             animations = []
             for icon, text in zip(queue, queue_texts):
-                icon.clear_updaters()
-                delattr(icon, 'initialized')
+                fires.extinguish(icon)
                 animations.append(AnimationGroup(
                     icon.animate.shift(0.65 * UP),
                     text.animate.shift(0.65 * UP),
@@ -1489,7 +1290,7 @@ class Implementation(Scene):
                 self.play(LaggedStart(*animations, lag_ratio=0.2, run_time=run_time))
             # Add updaters to burning queue elements
             for icon in queue:
-                icon.add_updater(update_fire)
+                fires.ignite(icon)
 
         spread_from_source(7)
         self.wait(1)
@@ -1529,8 +1330,7 @@ class Implementation(Scene):
         spread_from_source(1, run_time=0.05)
 
         # Write the last 3 lines of code
-        for line in bfs_code[-3:]:
-            self.play(AddTextLetterByLetter(line, run_time=0.03 * len(line)))
+        self.play(TypeCode(bfs_code[-3:], time_per_char=0.03))
 
         # Indicate all the burned nodes
         self.play(*[
@@ -1556,7 +1356,7 @@ class Simulation(Scene):
         title = Title('Breadth First Search', include_underline=False)
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -1570,7 +1370,7 @@ class Simulation(Scene):
         queue_title = Text('Queue:').scale(0.5).next_to(graph, DOWN, buff=0.25)
         self.add(queue_title)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 from collections import deque
 
@@ -1605,44 +1405,25 @@ class Simulation(Scene):
         ).scale(0.3).next_to(code[2], LEFT)
         self.play(Create(arrow), run_time=1)
 
-        def burn(vertex: int, run_time: float = 0.5, scale: float = 0.6):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.7 * scale).move_to(graph.vertices[vertex], DOWN)
-            fire_icon.set_z_index(5)
-            self.play(ShowIncreasingSubsets(fire_icon, run_time=run_time))
-            fire_icon.add_updater(update_fire)
-            return fire_icon
-
-        def spread_fire(source: int, target: int, run_time: float = 0.5, scale: float = 0.6):
-            sparkler = SVGMobject('bfs/sparks.svg').scale(0.3 * scale).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
-            sparkler.set_z_index(5)
-
-            edge = Line(graph.vertices[source].get_center(), graph.vertices[target].get_center(), buff=0.4 * scale)
-            burned_edge = VMobject()
-            burned_edge.add_updater(lambda x: x.become(Line(
-                edge.get_start(), sparkler.get_center(), stroke_width=6,
-            ).set_color(DARK_GRAY)))
-            self.add(sparkler, burned_edge)
-
-            self.play(MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear))
-            self.remove(sparkler)
-            burning_target = burn(target, run_time=run_time / 2, scale=scale)
-            return burning_target, burned_edge
+        fires = FireSystem(key='Simulation')
+        self.add(fires)
 
         queue = []
         queue_texts = []
         def add2queue(vertex: int):
             nonlocal queue
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.25)
+            fire_icon = load_svg('bfs/fire.svg').scale(0.25)
             fire_icon.next_to(queue_title if len(queue) == 0 else queue[-1], DOWN, buff=0.3 if len(queue) == 0 else 0.15)
             fire_icon.set_z_index(5)
             queue.append(fire_icon)
             vertex_text = Text(str(vertex)).scale(0.33).set_color(BLACK).move_to(queue[-1]).shift(0.08 * DOWN).set_z_index(10)
             queue_texts.append(vertex_text)
             self.add(queue[-1], vertex_text)
-            queue[-1].add_updater(update_fire)
+            fires.ignite(queue[-1], key=('queue', vertex))
 
+        spread = FireSpread(self, fires, graph.vertices, scale=0.4)
         burning_icons: dict[int, tuple[SVGMobject, VMobject | None]] = {
-            7: (burn(7, scale=0.4), None),
+            7: (spread.burn(7), None),
         }
         used = {7: True}
         self.play(arrow.animate.next_to(code[3], LEFT), run_time=0.5)
@@ -1674,7 +1455,7 @@ class Simulation(Scene):
                     self.play(FadeOut(to_circle), run_time=0.2)
                     continue
                 used[to] = True
-                burning_icons[to] = spread_fire(vertex, to, scale=0.4)
+                burning_icons.update(spread.play_level([(vertex, to)], spark_time=0.5))
                 self.play(arrow.animate.next_to(code[9], LEFT).shift(0.15 * DOWN), run_time=0.5)
                 self.wait(0.5)
                 add2queue(to)
@@ -1687,8 +1468,7 @@ class Simulation(Scene):
             queue_texts.pop(0)
             animations = []
             for icon, text in zip(queue, queue_texts):
-                icon.clear_updaters()
-                delattr(icon, 'initialized')
+                fires.extinguish(icon)
                 animations.append(AnimationGroup(
                     icon.animate.shift(0.65 * UP),
                     text.animate.shift(0.65 * UP),
@@ -1696,7 +1476,7 @@ class Simulation(Scene):
             self.play(LaggedStart(*animations, lag_ratio=0.2, run_time=0.6))
             # Add updaters to burning queue elements
             for icon in queue:
-                icon.add_updater(update_fire)
+                fires.ignite(icon)
 
             # Move the arrow to the while loop
             self.play(arrow.animate.next_to(code[5], LEFT), run_time=0.5)
@@ -1764,7 +1544,7 @@ class BFSOnGrids(Scene):
         self.add(title)
         self.wait(3)
 
-        grid_code = Code(
+        grid_code = make_code(
             code=dedent('''
                 g = [
                     '~~~~~~~~#~',
@@ -1794,13 +1574,12 @@ class BFSOnGrids(Scene):
             '~#~~~##~~~',
             '#~~~~~#~~~',
         ]
-        used = [[False] * len(grid[0]) for _ in range(len(grid))]
+        used = set()
 
         # Indicate the hashtags
-        hashtags = [(r + 1, c + 2) for r in range(len(grid)) for c in range(len(grid[0])) if grid[r][c] == '#']
-        tildas = [(r + 1, c + 2) for r in range(len(grid)) for c in range(len(grid[0])) if grid[r][c] == '~']
-        self.play(*[Indicate(grid_code[r][c], scale_factor=1.5, color=ORANGE) for r, c in hashtags], run_time=0.8)
-        self.play(*[Indicate(grid_code[r][c], scale_factor=1.5, color=BLUE) for r, c in tildas], run_time=0.8)
+        cells = CodeGrid(grid_code, grid)
+        self.play(*[Indicate(glyph, scale_factor=1.5, color=ORANGE) for glyph in cells.select(cells.mask('#'))], run_time=0.8)
+        self.play(*[Indicate(glyph, scale_factor=1.5, color=BLUE) for glyph in cells.select(cells.mask('~'))], run_time=0.8)
         self.wait(1)
 
         # Indicaate all the islands one by one
@@ -1880,51 +1659,32 @@ class BFSOnGrids(Scene):
         self.wait(1)
 
         self.play(*[
-            Wiggle(grid_code[i][j], scale_value=1.3, rotation_angle=0.04 * TAU, n_wiggles=5)
-            for i in range(1, len(grid) + 1)
-            for j in range(2, len(grid[0]) + 2)
+            Wiggle(glyph, scale_value=1.3, rotation_angle=0.04 * TAU, n_wiggles=5)
+            for glyph in cells.glyphs.ravel()
         ], run_time=2)
         self.wait(1)
-        # hashtags = [(r + 1, c + 2) for r in range(len(grid)) for c in range(len(grid[0])) if grid[r][c] == '#']
 
-        def burn(row: int, col: int):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.2).move_to(grid_code[row + 1][col + 2])
-            fire_icon.set_z_index(5)
-            self.add(fire_icon)
-            fire_icon.add_updater(update_fire)
-            return fire_icon
+        # Dozens of fires of the same size => play a baked loop instead of simulating each of them
+        fires = LoopingFireSystem(key='BFSOnGrids')
+        self.add(fires)
 
-        def spread_fire(row: int, col: int):
-            """ Perform a BFS starting from the given cell """
-            q = deque([(row, col)])
-            fire_icons = []
-            while q:
-                r, c = q.popleft()
-                for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < len(grid) and 0 <= nc < len(grid[0]) and grid[nr][nc] == '#' and not used[nr][nc]:
-                        used[nr][nc] = True
-                        q.append((nr, nc))
-                        fire_icons.append(burn(nr, nc))
-                        self.wait(0.2)
-            return fire_icons
+        spread = FireSpread(
+            self, fires, cells, fire_scale=0.2, aligned_edge=ORIGIN, sparks=False, burn_time=0.2,
+        )
 
-        # Iterate through the grid and perform BFS from each island cell
-        all_fire_icons = []
+        # Iterate through the grid and perform BFS from each island cell (one play per BFS level)
         iteration_animations = []
         for r in range(len(grid)):
             for c in range(len(grid[0])):
-                iteration_animations.append(Indicate(grid_code[r + 1][c + 2], scale_factor=1.5, color=YELLOW))
-                if grid[r][c] == '#' and not used[r][c]:
+                iteration_animations.append(Indicate(cells[r, c], scale_factor=1.5, color=YELLOW))
+                if grid[r][c] == '#' and (r, c) not in used:
                     self.play(LaggedStart(
                         *iteration_animations,
                         lag_ratio=0.3,
                         run_time=0.15 * len(iteration_animations),
                     ))
-                    used[r][c] = True
-                    all_fire_icons.append(burn(r, c))
-                    self.wait(0.2)
-                    all_fire_icons += spread_fire(r, c)
+                    spread.burn((r, c), run_time=0.2)
+                    spread.spread((r, c), grid_neighbors(grid), used)
                     iteration_animations.clear()
                     self.wait(0.2)
         self.play(LaggedStart(
@@ -1936,14 +1696,14 @@ class BFSOnGrids(Scene):
         self.wait(1)
 
         # Transition to the next scene
-        self.play(FadeOut(*all_fire_icons), run_time=0.5)
+        self.play(FadeOut(*spread.burning.values()), run_time=0.5)
         self.wait(1)
 
 
 class BFSOnGridsImplementation(Scene):
     def construct(self):
         title = Title('BFS on Grids', include_underline=False)
-        grid_code = Code(
+        grid_code = make_code(
             code=dedent('''
                 g = [
                     '~~~~~~~~#~',
@@ -1974,7 +1734,7 @@ class BFSOnGridsImplementation(Scene):
         self.wait(1)
 
         def get_initialization_code(counter: int):
-            return Code(
+            return make_code(
             code=dedent(f'''
                 used = [[False] * len(line) for line in g]
                 islands = {counter}
@@ -2069,7 +1829,7 @@ class BFSOnGridsImplementation(Scene):
             run_time=0.5,
         )
 
-        loops_code = Code(
+        loops_code = make_code(
             code=dedent('''
                 for i in range(len(g)):
                     for j in range(len(g[i])):
@@ -2105,7 +1865,7 @@ class BFSOnGridsImplementation(Scene):
         self.play(AddTextLetterByLetter(loops_code[4], run_time=0.12 * len(loops_code[4])))
         self.wait(2)
 
-        bfs_code = Code(
+        bfs_code = make_code(
             code=dedent('''
                 def bfs(row, col):
                     from collections import deque
@@ -2231,7 +1991,7 @@ class BFSOnGridsImplementation(Scene):
 class BFSOnGridsSimulation(Scene):
     def construct(self):
         title = Title('BFS on Grids', include_underline=False)
-        grid_code = Code(
+        grid_code = make_code(
             code=dedent('''
                 g = [
                     '~~~~~~~~#~',
@@ -2251,7 +2011,7 @@ class BFSOnGridsSimulation(Scene):
         ).code.scale(0.8).next_to(title, DOWN, buff=0.5).to_edge(RIGHT, buff=2)
         self.add(title, grid_code)
 
-        init_code = Code(
+        init_code = make_code(
             code=dedent(f'''
                 used = [[False] * len(line) for line in g]
                 islands = 0
@@ -2263,7 +2023,7 @@ class BFSOnGridsSimulation(Scene):
             style='monokai',
         ).code.scale(0.75).next_to(title, DOWN, buff=0.5).to_edge(LEFT, buff=1)
 
-        loops_code = Code(
+        loops_code = make_code(
             code=dedent('''
                 for i in range(len(g)):
                     for j in range(len(g[i])):
@@ -2305,7 +2065,7 @@ class BFSOnGridsSimulation(Scene):
         self.play(arrow.animate.next_to(loops_code[2], LEFT).shift(0.1 * DOWN), run_time=0.5)
         self.wait(1)
 
-        bfs_code = Code(
+        bfs_code = make_code(
             code=dedent('''
                 def bfs(row, col):
                     from collections import deque
@@ -2346,26 +2106,19 @@ class BFSOnGridsSimulation(Scene):
             '#~~~~~#~~~',
         ]
         used = [[False] * len(grid[0]) for _ in range(len(grid))]
+        cells = CodeGrid(grid_code, grid)
 
-        queue_texts = []
         def add2queue(row: int, col: int):
-            # fire_icon.next_to(burning_nodes_title if len(queue) == 0 else queue[-1], DOWN, buff=0.4 if len(queue) == 0 else 0.2)
-            vertex_text = Text(f'({row}, {col})').scale(0.4).next_to(queue_text if len(queue_texts) == 0 else queue_texts[-1], DOWN, buff=0.2 if len(queue_texts) == 0 else 0.1)
-            queue_texts.append(vertex_text)
-            self.play(Write(queue_texts[-1]), run_time=0.5)
+            self.play(queue.enqueue(Text(f'({row}, {col})').scale(0.4)), run_time=0.5)
 
         def remove_from_queue():
-            animations = []
-            for text, prev_text in zip(queue_texts[1:], queue_texts):
-                animations.append(text.animate.move_to(prev_text))
-            self.play(LaggedStart(FadeOut(queue_texts[0]), *animations, lag_ratio=0.3, run_time=1))
-            queue_texts.pop(0)
+            self.play(queue.dequeue(), run_time=1)
 
         def burn(row: int, col: int):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.15).move_to(grid_code[row + 1][col + 2])
+            fire_icon = load_svg('bfs/fire.svg').scale(0.15).move_to(cells.get_center(row, col))
             fire_icon.set_z_index(5)
             self.add(fire_icon)
-            # fire_icon.add_updater(update_fire)
+            # fires.ignite(fire_icon)
             return fire_icon
 
         def spread_fire(row: int, col: int):
@@ -2390,7 +2143,7 @@ class BFSOnGridsSimulation(Scene):
                 r, c = q.popleft()
 
                 # Add circle around the current cell
-                circle = DashedVMobject(Circle(radius=0.2, color=ORANGE)).move_to(grid_code[r + 1][c + 2])
+                circle = DashedVMobject(Circle(radius=0.2, color=ORANGE)).move_to(cells.get_center(r, c))
                 self.play(arrow.animate.next_to(bfs_code[7], LEFT).shift(0.12 * DOWN), Create(circle), run_time=0.5)
                 remove_from_queue()
                 self.wait(0.5)
@@ -2424,7 +2177,7 @@ class BFSOnGridsSimulation(Scene):
 
         islands_counter_mobj = init_code[1]
         def get_islands(counter: int):
-            return Code(
+            return make_code(
             code=dedent(f'''
                 islands = {counter}
             ''').strip(),
@@ -2438,12 +2191,13 @@ class BFSOnGridsSimulation(Scene):
 
         # Iterate through the grid and perform BFS from each island cell
         queue_text = Text('Queue:').scale(0.5).next_to(islands_counter_mobj, RIGHT, buff=1.5)
+        queue = RingQueue(queue_text)
         all_fire_icons = []
         iteration_animations = []
         found_islands = 0
         for r in range(len(grid)):
             for c in range(len(grid[0])):
-                iteration_animations.append(Indicate(grid_code[r + 1][c + 2], scale_factor=1.8, color=YELLOW))
+                iteration_animations.append(Indicate(cells[r, c], scale_factor=1.8, color=YELLOW))
                 if grid[r][c] == '#' and not used[r][c]:
                     self.play(LaggedStart(
                         *iteration_animations,
@@ -2494,14 +2248,14 @@ class ShortestPath(Scene):
 
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             vertex_config={'radius': 0.4, 'stroke_width': 0, 'fill_color': WHITE},
             edge_config={'stroke_width': 5},
         ).scale(0.9).shift(1.5 * DOWN)
 
-        clock = SVGMobject('bfs/clock.svg').scale(0.3)
+        clock = load_svg('bfs/clock.svg').scale(0.3)
         clocks = VGroup(*[
             clock.copy().move_to(graph.vertices[i]).set_fill(BLACK) for i in range(len(g))
         ])
@@ -2513,30 +2267,33 @@ class ShortestPath(Scene):
         self.play(clocks[7].animate.set_fill(ORANGE), run_time=0.5)
         self.wait(3)
 
+        fires = FireSystem(key='ShortestPath')
+        self.add(fires)
+
         def burn(vertex: int, run_time: float = 0.5):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.6).move_to(graph.vertices[vertex], DOWN)
+            fire_icon = load_svg('bfs/fire.svg').scale(0.6).move_to(graph.vertices[vertex], DOWN)
             fire_icon.set_z_index(5)
             self.play(ShowIncreasingSubsets(fire_icon, run_time=run_time))
-            fire_icon.add_updater(update_fire)
+            fires.ignite(fire_icon, key=vertex)
             self.wait(run_time)
 
             burning_times_mobjects[vertex] = Text(f'{burning_times[vertex]}').scale(0.8).move_to(graph.vertices[vertex]).set_z_index(100000).set_color(ORANGE)
             self.play(FadeOut(clocks[vertex]), ReplacementTransform(fire_icon, burning_times_mobjects[vertex]), run_time=run_time)
 
         def spread_fire(source: int, target: int, run_time: float = 0.5):
-            sparkler = SVGMobject('bfs/sparks.svg').scale(0.2).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
+            sparkler = load_svg('bfs/sparks.svg').scale(0.2).move_to(graph.vertices[source], DOWN).set_fill('#ff9d33')
             sparkler.set_z_index(5)
             burning_times[target] = burning_times[source] + 1
 
             edge = Line(graph.vertices[source].get_center(), graph.vertices[target].get_center(), buff=0.36)
-            burned_edge = VMobject()
-            burned_edge.add_updater(lambda x: x.become(Line(
-                edge.get_start(), sparkler.get_center(), stroke_width=6,
-            ).set_color(DARK_GRAY)))
+            burned_edge = BurnedEdge(edge)
             self.add(sparkler, burned_edge)
             burned_edges.append(burned_edge)
 
-            self.play(MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear))
+            self.play(
+                MoveAlongPath(sparkler, edge, run_time=run_time, rate_func=linear),
+                BurnEdge(burned_edge, run_time=run_time, rate_func=linear),
+            )
             self.remove(sparkler)
             burn(target, run_time=run_time)
 
@@ -2570,7 +2327,7 @@ class ShortestPath(Scene):
         ))
 
         # Transition to the next scene
-        grid_code = Code(
+        grid_code = make_code(
             code=dedent('''
                 g = [
                     '#####...#',
@@ -2604,7 +2361,7 @@ class ShortestPath(Scene):
 class ShortestPathOnGrids(Scene):
     def construct(self):
         title = Title('Shortest Path', include_underline=False)
-        grid_code = Code(
+        grid_code = make_code(
             code=dedent('''
                 g = [
                     '#####...#',
@@ -2622,7 +2379,7 @@ class ShortestPathOnGrids(Scene):
             font='Monospace',
             style='monokai',
         ).code.scale(1.2).next_to(title, DOWN, buff=1)
-        dist_code = Code(
+        dist_code = make_code(
             code=dedent('''
                 d = [
                     '#####9ⅩⅪ#',
@@ -2653,10 +2410,9 @@ class ShortestPathOnGrids(Scene):
             '#.S...###',
         ]
 
-        paths = [(r + 1, c + 2) for r in range(len(grid)) for c in range(len(grid[0])) if grid[r][c] == '.']
-        walls = [(r + 1, c + 2) for r in range(len(grid)) for c in range(len(grid[0])) if grid[r][c] == '#']
-        self.play(*[Indicate(grid_code[r][c], scale_factor=2.5, color=YELLOW) for r, c in paths], run_time=2)
-        self.play(*[Indicate(grid_code[r][c], scale_factor=1.5, color=RED) for r, c in walls], run_time=3)
+        cells = CodeGrid(grid_code, grid)
+        self.play(*[Indicate(glyph, scale_factor=2.5, color=YELLOW) for glyph in cells.select(cells.mask('.'))], run_time=2)
+        self.play(*[Indicate(glyph, scale_factor=1.5, color=RED) for glyph in cells.select(cells.mask('#'))], run_time=3)
         self.wait(3.5)
 
         # Highlight the starting coordinate and then the ending one
@@ -2673,7 +2429,7 @@ class ShortestPathOnGrids(Scene):
         self.wait(1)
 
         def burn(row: int, col: int, shift: float = 0):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.2).move_to(grid_code[row + 1][col + 2])
+            fire_icon = load_svg('bfs/fire.svg').scale(0.2).move_to(cells[row, col])
             fire_icon.set_z_index(5)
             animations = [ShowIncreasingSubsets(fire_icon.shift(shift * UP))]
             return fire_icon, animations
@@ -2701,7 +2457,7 @@ class ShortestPathOnGrids(Scene):
                         fire_icons[(nr, nc)] = fire
                         all_animations += animations
                 if replace_grid_with_distance:
-                    all_animations += [FadeOut(grid_code[r + 1][c + 2]), FadeIn(dist_code[r + 1][c + 2])]
+                    all_animations += [FadeOut(cells[r, c]), FadeIn(dist_code[r + 1][c + 2])]
                 all_animations.append(FadeOut(fire_icons[(r, c)]))
 
             return fire_icons, all_animations
@@ -2711,7 +2467,7 @@ class ShortestPathOnGrids(Scene):
         self.play(LaggedStart(*all_anims, lag_ratio=0.7, run_time=15))
         self.wait(1)
 
-        dist_initial_grid = Code(
+        dist_initial_grid = make_code(
             code=dedent('''
                 d = [
                     [-1, -1, -1, -1, -1, -1, -1, -1, -1],
@@ -2730,7 +2486,7 @@ class ShortestPathOnGrids(Scene):
             style='monokai',
         ).code.next_to(title, DOWN, buff=1).to_edge(RIGHT, buff=1)
 
-        dist_grid = Code(
+        dist_grid = make_code(
             code=dedent('''
                 d = [
                     [-1, -1, -1, -1, -1,  9, 10, 11, -1],
@@ -2803,7 +2559,7 @@ class ShortestPathOnGrids(Scene):
         ], lag_ratio=0.2, run_time=2))
         self.wait(1)
 
-        init_code = Code(
+        init_code = make_code(
             code=dedent('''
                 d = [[-1] * len(line) for line in g]
                 d[6][2] = 0
@@ -2831,7 +2587,7 @@ class ShortestPathOnGrids(Scene):
         self.play(AddTextLetterByLetter(init_code[2]), run_time=0.1 * len(init_code[2]))
         self.wait(1)
 
-        wide_grid_code = Code(
+        wide_grid_code = make_code(
             code=dedent('''
                 g = [
                     ' #   #   #   #   #   .   .   .   #',
@@ -2858,7 +2614,7 @@ class ShortestPathOnGrids(Scene):
         )
         self.wait(1)
 
-        bfs_code = Code(
+        bfs_code = make_code(
             code=dedent(r'''
                 while q:
                     r, c = q.popleft()
@@ -2916,24 +2672,18 @@ class ShortestPathOnGrids(Scene):
         self.play(Create(vline1), Create(vline2), Write(queue_text), run_time=1)
 
         # Highlight the starting coordinate (both in the grid and the distance grid) and add it to the queue
-        queue_texts = []
+        queue = RingQueue(queue_text)
         q = deque()
         def add2queue(row: int, col: int):
-            vertex_text = Text(f'({row}, {col})').scale(0.4).next_to(queue_text if len(queue_texts) == 0 else queue_texts[-1], DOWN, buff=0.2 if len(queue_texts) == 0 else 0.1)
-            queue_texts.append(vertex_text)
             q.append((row, col))
-            self.play(Write(queue_texts[-1]), run_time=0.5)
+            self.play(queue.enqueue(Text(f'({row}, {col})').scale(0.4)), run_time=0.5)
 
         def remove_from_queue():
-            animations = []
-            for text, prev_text in zip(queue_texts[1:], queue_texts):
-                animations.append(text.animate.move_to(prev_text))
-            self.play(LaggedStart(FadeOut(queue_texts[0]), *animations, lag_ratio=0.3, run_time=1))
-            queue_texts.pop(0)
+            self.play(queue.dequeue(), run_time=1)
 
         # Redefine the `burn` function to use the wide_grid_code
         def burn_wide(row: int, col: int, shift_up: float = 0, shift_left: float = 0):
-            fire_icon = SVGMobject('bfs/fire.svg').scale(0.2).move_to(wide_grid_code[row + 1][(4 * col + 6) if col < 8 else (4 * col + 4)])
+            fire_icon = load_svg('bfs/fire.svg').scale(0.2).move_to(wide_grid_code[row + 1][(4 * col + 6) if col < 8 else (4 * col + 4)])
             fire_icon.set_z_index(5)
             fire_icon.shift(shift_up * UP).shift(shift_left * LEFT)
             self.add(fire_icon)
@@ -2961,7 +2711,7 @@ class ShortestPathOnGrids(Scene):
             distance_circle = DashedVMobject(Circle(radius=0.2, color=ORANGE)).move_to(dist_initial_grid[r + 1][4 * c + 3])
             self.play(LaggedStart(
                 arrow.animate.next_to(bfs_code[1], LEFT).shift(0.08 * DOWN),
-                queue_texts[0].animate.set_color(ORANGE),
+                queue.front.animate.set_color(ORANGE),
                 Create(grid_circle), Create(distance_circle),
                 lag_ratio=0.5,
                 run_time=1,
@@ -3075,12 +2825,46 @@ class ShortestPathOnGrids(Scene):
         # Transition to the next scene
         self.play(
             ReplacementTransform(title, Title('Breadth First Search', include_underline=False)),
-            FadeOut(dist_initial_grid, dist_grid, wide_grid_code, bfs_code, init_code, queue_text, vline1, vline2, *queue_texts, *fire_icons),
+            FadeOut(dist_initial_grid, dist_grid, wide_grid_code, bfs_code, init_code, queue_text, vline1, vline2, *queue.get_mobjects(), *fire_icons),
             run_time=0.5,
         )
         self.wait(1)
 
 
+class BFSOnLargeGraph(Scene):
+    def construct(self):
+        title = Title('BFS on a Large Graph', include_underline=False)
+        rows, cols = 100, 100
+        positions, edges = lattice_graph(rows, cols, key='BFSOnLargeGraph')
+        graph = PointCloudGraph(positions, edges, height=6).next_to(title, DOWN, buff=0.3)
+
+        source = (rows // 2) * cols + cols // 2
+        distances = bfs_distances(len(positions), edges, source)
+        graph.set_vertex_colors([source], ORANGE)
+        self.add(title, graph)
+        self.wait(1)
+
+        # All the levels are revealed by a single animation (the colors of the 10k vertices change in place)
+        self.play(SpreadFrontier(graph, distances, frontier_color=ORANGE), run_time=8, rate_func=linear)
+        self.wait(2)
+
+
+class BFSOnLargeGrids(Scene):
+    def construct(self):
+        title = Title('BFS on Large Grids', include_underline=False)
+        grid = RasterGrid(random_islands(1000, 1000, key='BFSOnLargeGrids'), height=6.5).next_to(title, DOWN, buff=0.2)
+        self.add(title, grid)
+        self.wait(1)
+
+        # Flood fill every island from its first cell (the image is updated once per BFS level)
+        self.play(FloodFill(grid), run_time=6, rate_func=linear)
+        self.wait(1)
+
+        # Distance of every cell from the first cell of its island
+        self.play(FloodFill(grid, mode='distances'), run_time=6, rate_func=linear)
+        self.wait(2)
+
+
 class ComplexityAnalysis(Scene):
     def construct(self):
         title = Title('Breadth First Search', include_underline=False)
@@ -3089,7 +2873,7 @@ class ComplexityAnalysis(Scene):
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
 
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -3101,7 +2885,7 @@ class ComplexityAnalysis(Scene):
         for label in graph._labels.values():
             label.set_z_index(10)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 used[start] = True
                 q = deque([start])
@@ -3120,9 +2904,7 @@ class ComplexityAnalysis(Scene):
             style='monokai',
         ).code.scale(0.9).next_to(title, DOWN, buff=1).to_edge(RIGHT, buff=1.5)
 
-        for line in code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line, run_time=0.005 * len(line)))
+        self.play(TypeCode(code.chars, time_per_char=0.005))
 
         vertices_text = Text('V vertices').scale(0.6).next_to(graph, DOWN, buff=0.5).align_to(graph, LEFT)
         edges_text = Text('E edges').scale(0.6).next_to(vertices_text, DOWN, buff=0.2).align_to(vertices_text, LEFT)
@@ -3218,7 +3000,7 @@ class Practice(Scene):
         ))
         self.wait(5)
 
-        check = SVGMobject('bfs/check.svg').scale(0.3).set_fill(GREEN).next_to(math_subtitle, DOWN, buff=0.5)
+        check = load_svg('bfs/check.svg').scale(0.3).set_fill(GREEN).next_to(math_subtitle, DOWN, buff=0.5)
         self.play(Create(check), run_time=0.5)
         self.wait(4)
         self.play(FadeOut(check), run_time=0.2)
@@ -3285,7 +3067,7 @@ class ClosingScene(Scene):
         vertices = list(range(len(g)))
         edges = [(i, j) for i, neighbors in enumerate(g) for j in neighbors]
 
-        graph = Graph(
+        graph = make_graph(
             vertices, edges,
             layout=layout,
             labels=True,
@@ -3297,7 +3079,7 @@ class ClosingScene(Scene):
         for label in graph._labels.values():
             label.set_z_index(10)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 used[start] = True
                 q = deque([start])
@@ -3327,7 +3109,5 @@ class ClosingScene(Scene):
 
         # Re-implement the BFS algorithm
         self.play(FadeOut(code), run_time=0.5)
-        for line in code:
-            if line:
-                self.play(AddTextLetterByLetter(line, run_time=0.05 * len(line)))
+        self.play(TypeCode(code, time_per_char=0.05))
         self.wait(2)
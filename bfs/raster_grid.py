@@ -0,0 +1,139 @@
+import numpy as np
+from manim import *
+
+from common.rng import get_rng
+
+
+def random_islands(rows: int, cols: int, land: float = 0.45, smoothness: int = 4, key: str = 'islands') -> np.ndarray:
+    """ Random boolean map of islands (True = land) made by blurring noise and keeping the highest cells. """
+    noise = get_rng(key, rows, cols, land, smoothness).random((rows, cols))
+    for _ in range(smoothness):
+        padded = np.pad(noise, 1, mode='edge')
+        noise = (
+            padded[1:-1, 1:-1] + padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+        ) / 5
+    return noise > np.quantile(noise, 1 - land)
+
+
+def label_islands(land: np.ndarray) -> np.ndarray:
+    """
+    Island of every cell (-1 for water), islands are numbered in the order their first cell appears (row-major).
+    Vectorized union-find: every round hooks the larger root of each land edge under the smaller one, then pointer
+    jumping flattens the trees. The root of an island is its first cell.
+    """
+    ids = np.arange(land.size).reshape(land.shape)
+    right, down = land[:, :-1] & land[:, 1:], land[:-1] & land[1:]
+    a = np.concatenate([ids[:, :-1][right], ids[:-1][down]])
+    b = np.concatenate([ids[:, 1:][right], ids[1:][down]])
+
+    parent = np.arange(land.size)
+    while True:
+        roots_a, roots_b = parent[a], parent[b]
+        if np.array_equal(roots_a, roots_b):
+            break
+        np.minimum.at(parent, np.maximum(roots_a, roots_b), np.minimum(roots_a, roots_b))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    roots = np.where(land.ravel(), parent, -1)
+    _, labels = np.unique(roots, return_inverse=True)
+    labels = labels - (1 if (~land).any() else 0)
+    return labels.reshape(land.shape)
+
+
+def grid_distances(land: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    """ BFS distance of every land cell from the closest source (-1 if it's not reachable), one pass per level. """
+    distances = np.full(land.shape, -1)
+    distances[sources] = 0
+    frontier = sources.copy()
+    grown = np.empty_like(frontier)
+    level = 0
+    while frontier.any():
+        grown[:] = False
+        grown[1:] |= frontier[:-1]
+        grown[:-1] |= frontier[1:]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & land & (distances == -1)
+        level += 1
+        distances[frontier] = level
+    return distances
+
+
+class RasterGrid(ImageMobject):
+    """
+    A grid of land/water cells shown as a single image with one pixel per cell.
+    The islands and the BFS distance of every cell from the first cell of its island are computed with array operations
+    up front. Showing a BFS level only writes the pixels of the cells reached since the last shown level.
+    """
+    def __init__(
+        self,
+        land: np.ndarray,
+        height: float = 6,
+        water_color: ManimColor = BLUE_E,
+        land_color: ManimColor = GREY_BROWN,
+        near_color: ManimColor = YELLOW,
+        far_color: ManimColor = RED,
+        key: str = 'islands',
+        **kwargs,
+    ):
+        self.land = land
+        self.labels = label_islands(land)
+        land_cells = np.flatnonzero(land)
+        _, first = np.unique(self.labels.ravel()[land_cells], return_index=True)
+        first_cells = np.zeros(land.shape, dtype=bool)
+        first_cells.ravel()[land_cells[first]] = True
+        self.distances = grid_distances(land, first_cells)
+        self.nb_levels = self.distances.max() + 1
+
+        # Reached cells sorted by distance => the cells of the levels in (a, b] are a contiguous slice
+        reached = np.flatnonzero(self.distances.ravel() >= 0)
+        self.order = reached[np.argsort(self.distances.ravel()[reached], kind='stable')]
+        self.level_starts = np.searchsorted(self.distances.ravel()[self.order], np.arange(self.nb_levels + 1))
+
+        # Color of every cell once it is reached (one image per mode)
+        to_rgb = lambda color: (np.array(ManimColor(color).to_rgb()) * 255).astype(np.uint8)
+        palette = get_rng(key, 'palette').integers(64, 256, (self.labels.max() + 1, 3), dtype=np.uint8)
+        closeness = (self.distances / max(self.nb_levels - 1, 1))[..., None]
+        self.reached_colors = {
+            'islands': palette[self.labels.clip(0)],
+            'distances': ((1 - closeness) * to_rgb(near_color) + closeness * to_rgb(far_color)).astype(np.uint8),
+        }
+        self.background = np.where(land[..., None], to_rgb(land_color), to_rgb(water_color)).astype(np.uint8)
+
+        pixels = np.full((*land.shape, 4), 255, dtype=np.uint8)
+        pixels[..., :3] = self.background
+        super().__init__(pixels, **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS['nearest'])
+        self.scale_to_fit_height(height)
+        self.shown_level, self.shown_mode = -1, 'islands'
+
+    def show_level(self, level: int, mode: str = 'islands') -> 'RasterGrid':
+        """ Color the cells reached by the BFS up to the given level (in 'islands' or 'distances' mode). """
+        pixels = self.pixel_array.reshape(-1, 4)
+        if mode != self.shown_mode or level < self.shown_level:
+            pixels[:, :3] = self.background.reshape(-1, 3)
+            self.shown_level, self.shown_mode = -1, mode
+        cells = self.order[self.level_starts[self.shown_level + 1]: self.level_starts[min(level, self.nb_levels - 1) + 1]]
+        pixels[cells, :3] = self.reached_colors[mode].reshape(-1, 3)[cells]
+        self.shown_level = max(self.shown_level, min(level, self.nb_levels - 1))
+        return self
+
+
+class FloodFill(Animation):
+    """ Reveal the BFS of every island of a RasterGrid level by level (the image changes at most once per level). """
+    def __init__(self, grid: RasterGrid, mode: str = 'islands', **kwargs):
+        self.mode = mode
+        super().__init__(grid, **kwargs)
+
+    def create_starting_mobject(self) -> Mobject:
+        # The state is fully described by the shown level => no copy of the image is needed
+        return self.mobject
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        level = int(self.rate_func(alpha) * (self.mobject.nb_levels - 1))
+        if level != self.mobject.shown_level or self.mode != self.mobject.shown_mode:
+            self.mobject.show_level(level, mode=self.mode)
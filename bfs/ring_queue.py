@@ -0,0 +1,79 @@
+import numpy as np
+from manim import *
+
+from common.layout import grid_centers
+
+
+class RingQueue:
+    """
+    Queue widget with a fixed number of preallocated slots used as a ring buffer.
+    Enqueue writes the new entry into the slot after the tail and dequeue fades the head entry out and moves the head
+    pointer to the next slot => every operation animates a single entry (+ the pointer) no matter how long the queue is.
+    The slots fill the first column top to bottom, then the next column, and wrap around to the first slot.
+    """
+    def __init__(
+        self,
+        anchor: Mobject,
+        capacity: int = 24,
+        rows: int = 12,
+        slot_height: float = 0.35,
+        slot_width: float = 1.2,
+        spacing: float = 0.1,
+        buff: float = 0.2,
+        pointer_color: ManimColor = ORANGE,
+    ):
+        """
+        :param anchor: Title of the queue, the first slot is placed below it
+        :param capacity: Number of slots (the maximum number of entries in the queue at once)
+        :param rows: Number of slots per column
+        """
+        cols = -(-capacity // rows)
+        centers = grid_centers(rows, cols, slot_height, slot_width, spacing)
+        centers = centers.reshape(rows, cols, 3).transpose(1, 0, 2).reshape(-1, 3)[:capacity]
+        self.centers: np.ndarray = centers + anchor.get_bottom() + (buff + slot_height / 2) * DOWN
+        self.pointer_offset = (slot_width / 2 + 0.1) * LEFT
+
+        self.slots: list[Mobject | None] = [None] * capacity
+        self.head = 0
+        self.size = 0
+        self.pointer = Triangle(color=pointer_color, fill_opacity=1).rotate(-PI / 2).scale(0.06)
+        self.pointer.move_to(self.centers[0] + self.pointer_offset)
+
+    @property
+    def front(self) -> Mobject:
+        return self.slots[self.head]
+
+    @property
+    def entries(self) -> list[Mobject]:
+        """ Mobjects of the entries from the head to the tail. """
+        return [self.slots[(self.head + i) % len(self.slots)] for i in range(self.size)]
+
+    def get_mobjects(self) -> list[Mobject]:
+        return self.entries + ([self.pointer] if self.size > 0 else [])
+
+    def enqueue(self, entry: Mobject) -> Animation:
+        """ Place the entry in the slot after the tail and return the animation that writes it. """
+        if self.size == len(self.slots):
+            raise ValueError(f'The queue is full (capacity {len(self.slots)})')
+        slot = (self.head + self.size) % len(self.slots)
+        self.slots[slot] = entry.move_to(self.centers[slot])
+        self.size += 1
+        if self.size == 1:
+            self.pointer.move_to(self.centers[self.head] + self.pointer_offset)
+            return AnimationGroup(Write(entry), FadeIn(self.pointer))
+        return Write(entry)
+
+    def dequeue(self) -> Animation:
+        """ Free the head slot and return the animation that removes its entry and advances the head pointer. """
+        if self.size == 0:
+            raise IndexError('dequeue from an empty queue')
+        entry = self.slots[self.head]
+        self.slots[self.head] = None
+        self.head = (self.head + 1) % len(self.slots)
+        self.size -= 1
+        if self.size == 0:
+            return AnimationGroup(FadeOut(entry), FadeOut(self.pointer))
+        return AnimationGroup(FadeOut(entry), self.pointer.animate.move_to(self.centers[self.head] + self.pointer_offset))
+
+    def __len__(self):
+        return self.size
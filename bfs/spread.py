@@ -0,0 +1,203 @@
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+from manim import *
+
+from bfs.fire import FireSystem
+from common.svg import load_svg
+
+
+def bfs_levels(
+    source: Hashable,
+    neighbors: Callable[[Hashable], Iterable[Hashable]],
+    used: set | None = None,
+) -> list[list[tuple[Hashable, Hashable]]]:
+    """
+    Run BFS once and group the edges of the BFS tree by level.
+    :param source: Vertex the fire starts from
+    :param neighbors: Neighbors of a vertex (in the order the fire reaches them)
+    :param used: Vertices that are already burning (updated in place, the source is added to it)
+    :return: The (parent, child) edges of every level
+    """
+    used = used if used is not None else set()
+    used.add(source)
+    levels, frontier = [], [source]
+    while frontier:
+        level = []
+        for vertex in frontier:
+            for to in neighbors(vertex):
+                if to not in used:
+                    used.add(to)
+                    level.append((vertex, to))
+        if level:
+            levels.append(level)
+        frontier = [to for _, to in level]
+    return levels
+
+
+def grid_neighbors(grid: list[str], land: str = '#') -> Callable[[tuple[int, int]], Iterable[tuple[int, int]]]:
+    """ Neighbors of a (row, col) cell of the grid that are land cells. """
+    def neighbors(cell: tuple[int, int]):
+        row, col = cell
+        for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < len(grid) and 0 <= nc < len(grid[0]) and grid[nr][nc] == land:
+                yield nr, nc
+    return neighbors
+
+
+class BurnedEdge(Line):
+    """
+    Dark line from the start of an edge to the point a spark reached along it.
+    The offsets of the points from the start are computed once => moving the end only rescales them in place.
+    """
+    def __init__(self, edge: Line, proportion: float = 0., stroke_width: float = 6, color=DARK_GRAY, **kwargs):
+        super().__init__(edge.get_start(), edge.get_end(), stroke_width=stroke_width, color=color, **kwargs)
+        self.start_point = self.points[0].copy()
+        self.offsets = self.points - self.start_point
+        self.set_proportion(proportion)
+
+    def set_proportion(self, proportion: float) -> 'BurnedEdge':
+        """ Make the line cover the given proportion of the edge (without allocating new points). """
+        np.multiply(self.offsets, proportion, out=self.points)
+        self.points += self.start_point
+        return self
+
+
+class BurnEdge(Animation):
+    """ Extend a BurnedEdge along its edge (use the rate function of the spark so that the line follows it). """
+    def __init__(self, burned_edge: BurnedEdge, **kwargs):
+        super().__init__(burned_edge, **kwargs)
+
+    def create_starting_mobject(self) -> Mobject:
+        # The line is fully described by its proportion => no copy of the start state is needed
+        return self.mobject
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        self.mobject.set_proportion(self.rate_func(alpha))
+
+
+@dataclass
+class FireSpread:
+    """
+    Burns the vertices of a graph (or the cells of a grid) level by level.
+    Every BFS level is compiled into a single play: all the sparks of the level leave together and each target catches
+    fire when its spark arrives. The arrival times are computed up front and encoded with squished rate functions.
+    """
+    scene: Scene
+    fires: FireSystem
+    vertices: dict[Hashable, Mobject]       # Mobject each fire is placed on
+    scale: float = 1.
+    fire_scale: float = 0.7
+    spark_scale: float = 0.3
+    buff: float = 0.4                       # Radius of a vertex => where the sparks leave and arrive
+    spark_speed: float = 6.                 # Distance a spark travels in a second (before scaling)
+    burn_time: float = 0.25                 # Time for a fire to appear once its spark arrived
+    sparks: bool = True                     # Grids burn their cells without sparks along the edges
+    aligned_edge: np.ndarray = field(default_factory=lambda: DOWN)
+
+    burning: dict[Hashable, VMobject] = field(default_factory=lambda: {})
+    burned_edges: dict[Hashable, BurnedEdge] = field(default_factory=lambda: {})     # Keyed by the target vertex
+
+    def make_fire(self, vertex: Hashable) -> VMobject:
+        """ Fire icon on the vertex (it is ignited once it fully appeared). """
+        fire = load_svg('bfs/fire.svg').scale(self.fire_scale * self.scale)
+        fire.move_to(self.vertices[vertex], self.aligned_edge)
+        fire.set_z_index(5)
+        self.burning[vertex] = fire
+        return fire
+
+    def burn(self, vertex: Hashable, run_time: float = 0.5) -> VMobject:
+        """ Set a single vertex on fire (e.g. the source). """
+        fire = self.make_fire(vertex)
+        self.scene.play(ShowIncreasingSubsets(fire, run_time=run_time))
+        self.fires.ignite(fire, key=vertex)
+        return fire
+
+    def get_travel_times(self, edges: list[tuple[Hashable, Hashable]]) -> np.ndarray:
+        if not self.sparks:
+            return np.zeros(len(edges))
+        lengths = np.array([
+            np.linalg.norm(self.vertices[target].get_center() - self.vertices[source].get_center())
+            for source, target in edges
+        ])
+        return np.maximum(lengths - 2 * self.buff * self.scale, 0) / (self.spark_speed * self.scale)
+
+    def compile_level(
+        self,
+        edges: list[tuple[Hashable, Hashable]],
+        arrivals: list[Animation] | None = None,
+        spark_time: float | None = None,
+        burn_time: float | None = None,
+    ) -> AnimationGroup:
+        """
+        A single animation that spreads the fire along all the edges at once.
+        :param edges: (source, target) edges of the level
+        :param arrivals: Extra animations (one per edge) played once the corresponding spark arrived
+        :param spark_time: Travel time of every spark (computed from the length of the edges by default)
+        :param burn_time: Time for the fires to appear (self.burn_time by default)
+        """
+        travel = np.full(len(edges), spark_time) if spark_time is not None else self.get_travel_times(edges)
+        duration = travel.max(initial=0) + (burn_time if burn_time is not None else self.burn_time)
+        animations = []
+        for (source, target), time, arrival in zip(edges, travel, arrivals or [None] * len(edges)):
+            window = dict(run_time=duration, rate_func=squish_rate_func(linear, time / duration, 1))
+            if self.sparks and time > 0:
+                sparkler = load_svg('bfs/sparks.svg').scale(self.spark_scale * self.scale)
+                sparkler.move_to(self.vertices[source], DOWN).set_fill('#ff9d33').set_z_index(5)
+                edge = Line(
+                    self.vertices[source].get_center(), self.vertices[target].get_center(),
+                    buff=self.buff * self.scale,
+                )
+                self.burned_edges[target] = BurnedEdge(edge)
+                self.scene.add(sparkler, self.burned_edges[target])
+                travel_window = dict(run_time=duration, rate_func=squish_rate_func(linear, 0, time / duration))
+                animations.append(MoveAlongPath(sparkler, edge, remover=True, **travel_window))
+                animations.append(BurnEdge(self.burned_edges[target], **travel_window))
+
+            fire = self.make_fire(target)
+            self.scene.add(fire)
+            animations.append(ShowIncreasingSubsets(fire, **window))
+            if arrival is not None:
+                arrival.run_time, arrival.rate_func = window['run_time'], window['rate_func']
+                animations.append(arrival)
+        return AnimationGroup(*animations, run_time=duration)
+
+    def play_level(
+        self,
+        edges: list[tuple[Hashable, Hashable]],
+        *animations: Animation,
+        arrivals: list[Animation] | None = None,
+        spark_time: float | None = None,
+        burn_time: float | None = None,
+    ) -> dict[Hashable, tuple[VMobject, VMobject | None]]:
+        """
+        Spread the fire along the edges with one play (together with the given animations).
+        :return: The fire and the burned edge of every target
+        """
+        if not edges:
+            return {}
+        level = self.compile_level(edges, arrivals=arrivals, spark_time=spark_time, burn_time=burn_time)
+        self.scene.play(level, *animations)
+        # The fires and edges were added to the scene beforehand => only drop the group that wraps them
+        if level.mobject in self.scene.mobjects:
+            self.scene.mobjects.remove(level.mobject)
+        for _, target in edges:
+            self.fires.ignite(self.burning[target], key=target)
+        return {target: (self.burning[target], self.burned_edges.get(target)) for _, target in edges}
+
+    def spread(
+        self,
+        source: Hashable,
+        neighbors: Callable[[Hashable], Iterable[Hashable]],
+        used: set | None = None,
+        wait: float = 0.,
+    ) -> list[list[tuple[Hashable, Hashable]]]:
+        """ Spread the fire from the (already burning) source to everything it can reach, one play per BFS level. """
+        levels = bfs_levels(source, neighbors, used)
+        for edges in levels:
+            self.play_level(edges)
+            if wait > 0:
+                self.scene.wait(wait)
+        return levels
@@ -3,12 +3,18 @@ from textwrap import dedent
 
 from manim import *
 
-from binary_search.array import Array, TransformMatchingCells
+from common.code import TypeCode, UntypeCode, make_code
+from common.svg import load_svg
+from common.tex_batch import precompile_tex
+from binary_search.array import Array
 from binary_search.clock import Clock
 
 a = [20, 22, 23, 23, 34, 49, 52, 55, 58]
 ORANGE = ManimColor('#fa541c')
 
+# Typeset the literal Tex strings of all the scenes in a single LaTeX run (no-op once the tex cache is warm)
+precompile_tex(__file__)
+
 
 class ProblemStatement(Scene):
     def construct(self):
@@ -36,7 +42,7 @@ class ProblemStatement(Scene):
         self.play(Write(q, run_time=1))
 
         self.play(Write(title, run_time=0.5))
-        search_svg = SVGMobject(
+        search_svg = load_svg(
             'binary_search/search.svg', color=ORANGE, fill_color=ORANGE, fill_opacity=0.9,
         ).scale(0.7).move_to(q).shift(0.15 * DOWN).shift(0.45 * RIGHT)
         self.play(DrawBorderThenFill(search_svg, run_time=1))
@@ -80,7 +86,7 @@ class ProblemStatement(Scene):
         self.wait(2)
 
         # Add a green tick to the left of the array
-        tick = SVGMobject(
+        tick = load_svg(
             'binary_search/tick.svg', color=GREEN, fill_color=GREEN, fill_opacity=1,
         ).scale(0.2).next_to(a_text, LEFT)
         self.play(DrawBorderThenFill(tick, run_time=0.5))
@@ -108,7 +114,7 @@ class ProblemStatement(Scene):
             self.wait(0.1)
 
         # Add a red cross near the long array
-        cross = SVGMobject(
+        cross = load_svg(
             'binary_search/cross.svg', color=RED, fill_color=RED, fill_opacity=1,
         ).scale(0.2).next_to(long_mobj, LEFT).align_to(tick, LEFT)
         self.play(DrawBorderThenFill(cross, run_time=0.5), FadeOut(search_svg, run_time=0.5))
@@ -264,7 +270,7 @@ class TimeComplexity(Scene):
         )
         self.wait(2)
 
-        search_svg = SVGMobject(
+        search_svg = load_svg(
             'binary_search/search.svg', color=ORANGE, fill_color=ORANGE, fill_opacity=0.9,
         ).scale(0.7).center()
         self.play(DrawBorderThenFill(search_svg, run_time=0.5))
@@ -471,7 +477,7 @@ class FormalTimeComplexity(Scene):
         self.wait(3.5)
 
         # Search icon goes from first to last
-        search_svg = SVGMobject(
+        search_svg = load_svg(
             'binary_search/search.svg', color=ORANGE, fill_color=ORANGE, fill_opacity=0.9,
         ).scale(0.7).center()
         self.play(DrawBorderThenFill(search_svg, run_time=1))
@@ -581,7 +587,7 @@ class Implementation(Scene):
             run_time=0.5,
         )
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
@@ -633,7 +639,7 @@ class Implementation(Scene):
         self.wait(15)
 
         # Add info about the other approach
-        another_code = Code(
+        another_code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r >= l:
@@ -688,14 +694,8 @@ class Implementation(Scene):
             *highlight(4, 5, DARKER_GREY),
             run_time=1,
         )
-        self.play(RemoveTextLetterByLetter(code.chars[6], run_time=0.1))
-        self.play(RemoveTextLetterByLetter(code.chars[5], run_time=0.1))
-        self.play(RemoveTextLetterByLetter(code.chars[4], run_time=0.1))
-        self.play(AddTextLetterByLetter(another_code.chars[4], run_time=0.1 * len(another_code.chars[4])))
-        self.play(AddTextLetterByLetter(another_code.chars[5], run_time=0.1 * len(another_code.chars[5])))
-        self.play(AddTextLetterByLetter(another_code.chars[6], run_time=0.1 * len(another_code.chars[6])))
-        self.play(AddTextLetterByLetter(another_code.chars[7], run_time=0.1 * len(another_code.chars[7])))
-        self.play(AddTextLetterByLetter(another_code.chars[8], run_time=0.1 * len(another_code.chars[8])))
+        self.play(UntypeCode(code.chars[4:7], run_time=0.3))
+        self.play(TypeCode(another_code.chars[4:9]))
         self.wait(2)
         self.play(RemoveTextLetterByLetter(code.chars[1]), run_time=0.1)
         self.play(AddTextLetterByLetter(another_code.chars[1], run_time=0.1 * len(another_code.chars[2])))
@@ -710,11 +710,7 @@ class Implementation(Scene):
         self.wait(1)
         self.play(RemoveTextLetterByLetter(another_code.chars[1], run_time=0.1))
         self.play(AddTextLetterByLetter(code.chars[1], run_time=0.1 * len(code.chars[2])))
-        self.play(RemoveTextLetterByLetter(another_code.chars[8], run_time=0.1))
-        self.play(RemoveTextLetterByLetter(another_code.chars[7], run_time=0.1))
-        self.play(RemoveTextLetterByLetter(another_code.chars[6], run_time=0.1))
-        self.play(RemoveTextLetterByLetter(another_code.chars[5], run_time=0.1))
-        self.play(RemoveTextLetterByLetter(another_code.chars[4], run_time=0.1))
+        self.play(UntypeCode(another_code.chars[4:9], run_time=0.5))
         self.play(AddTextLetterByLetter(code.chars[4], run_time=0.1 * len(code.chars[4])))
         self.play(AddTextLetterByLetter(code.chars[5], run_time=0.1 * len(code.chars[5])))
         self.play(AddTextLetterByLetter(code.chars[6], run_time=0.1 * len(code.chars[6])))
@@ -777,7 +773,7 @@ class SimulatingNormalCase(Scene):
                 *[FadeToColor(label, col) for label in indices.labels[l:r]],
             ]
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
@@ -940,7 +936,7 @@ class SimulatingEdgeCase(Scene):
                 *[FadeToColor(label, col) for label in indices.labels[l:r]],
             ]
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
@@ -1099,7 +1095,7 @@ class OverflowIssue(Scene):
         right = VGroup(right, r_exclusive).next_to(array.rectangles[-1], UP).shift(0.1 * DOWN).shift((array.width + array.spacing) * RIGHT)
         self.add(left, right)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
@@ -1117,9 +1113,7 @@ class OverflowIssue(Scene):
             font='Monospace',
             style='monokai',
         ).next_to(indices_mobj, DOWN).code
-        for line in code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line), run_time=0.02 * len(line))
+        self.play(TypeCode(code.chars, time_per_char=0.02))
 
         self.wait(1)
         self.play(
@@ -1182,7 +1176,7 @@ class OverflowIssue(Scene):
 
         self.play(FadeOut(sum_arrow), FadeOut(sum_label), run_time=0.4)
 
-        new_code = Code(
+        new_code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
@@ -1213,7 +1207,7 @@ class OverflowIssue(Scene):
         self.wait(18)
 
         # Add a search icon and move it from start of mid calculation to the end
-        search_icon = SVGMobject(
+        search_icon = load_svg(
             'binary_search/search.svg', color=WHITE, fill_color=WHITE, fill_opacity=1,
         ).scale(0.5).align_to(new_code.chars[3], LEFT).align_to(new_code.chars[3], DOWN).shift(0.5 * LEFT)
         self.play(DrawBorderThenFill(search_icon), run_time=0.2)
@@ -1238,7 +1232,7 @@ class LinearVSBinary(Scene):
         indices.labels[-1].set_color(BLACK)
         self.add(array_mobj, a_text, indices_mobj)
 
-        linear_code = Code(
+        linear_code = make_code(
             code=dedent('''
                 for i, x in enumerate(a):
                     if x == q:
@@ -1254,12 +1248,10 @@ class LinearVSBinary(Scene):
             style='monokai',
         ).scale(0.8).next_to(indices_mobj, DOWN, buff=0.5).to_edge(LEFT, buff=1).code
 
-        for line in linear_code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line), run_time=0.012 * len(line))
+        self.play(TypeCode(linear_code.chars, time_per_char=0.012))
         self.wait(0.5)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
@@ -1277,9 +1269,7 @@ class LinearVSBinary(Scene):
             font='Monospace',
             style='monokai',
         ).scale(0.8).next_to(indices_mobj, DOWN, buff=0.5).to_edge(RIGHT, buff=1).code
-        for line in code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line), run_time=0.012 * len(line))
+        self.play(TypeCode(code.chars, time_per_char=0.012))
         self.wait(0.2)
 
         # Create a yellow rectangle that highlights the first 4 elements of the array
@@ -1305,7 +1295,7 @@ class LinearVSBinary(Scene):
         self.wait(0.2)
 
         # Add lightning icon to the right of if to for
-        lightning_icon = SVGMobject(
+        lightning_icon = load_svg(
             'binary_search/lightning.svg', color=YELLOW, fill_color=YELLOW, fill_opacity=1,
         ).scale(0.3).next_to(if_to_for, RIGHT)
         self.add(lightning_icon)
@@ -1321,12 +1311,9 @@ class LinearVSBinary(Scene):
 
         # Shuffle the array
         random.seed(42)
-        shuffled_array = a.copy()
-        random.shuffle(shuffled_array)
-        shuffled_array = Array(shuffled_array)
-        shuffled_array_mobj = shuffled_array.get_mobject().center().shift(2.2 * UP)
-
-        self.play(TransformMatchingCells(array_mobj, shuffled_array_mobj, path_arc=PI/2), run_time=2)
+        order = list(range(len(array)))
+        random.shuffle(order)
+        self.play(array.permute(order, path_arc=PI / 2), run_time=2)
         self.wait(5)
 
         q = Tex(r'q: 20, 23, 50, 100, ...', color=ORANGE).scale(0.8).next_to(linear_code, DOWN, buff=0.5).align_to(linear_code, LEFT)
@@ -1350,7 +1337,7 @@ class LinearVSBinary(Scene):
         self.play(ReplacementTransform(new_q, q))
         self.wait(2)
 
-        self.play(TransformMatchingCells(shuffled_array_mobj, array_mobj, path_arc=PI/2), run_time=2)
+        self.play(array.permute(sorted(range(len(order)), key=order.__getitem__), path_arc=PI / 2), run_time=2)
         self.wait(2)
 
         # Transition to the next scene
@@ -1380,7 +1367,7 @@ class BinarySearchAsGenericIdea(Scene):
         indices.labels[-1].set_color(BLACK)
         self.add(array_mobj, a_text, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
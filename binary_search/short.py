@@ -2,6 +2,7 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import TypeCode, make_code
 from binary_search.array import Array
 
 
@@ -37,7 +38,7 @@ class OverflowIssue(Scene):
         right = VGroup(right, r_exclusive).next_to(array.rectangles[-1], UP).shift(0.1 * DOWN).shift((array.width + array.spacing) * RIGHT)
         self.add(left, right)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, r = 0, len(a)
                 while r - l > 1:
@@ -55,9 +56,7 @@ class OverflowIssue(Scene):
             font='Monospace',
             style='monokai',
         ).scale(0.7).next_to(indices_mobj, 4 * DOWN).shift(0.5 * LEFT).code
-        for line in code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line), run_time=0.02 * len(line))
+        self.play(TypeCode(code.chars, time_per_char=0.02))
 
         self.wait(1)
         self.play(
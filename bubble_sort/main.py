@@ -3,7 +3,9 @@ from textwrap import dedent
 
 from manim import *
 
-from bubble_sort.array import Array, TransformMatchingCells
+from common.code import make_code
+from common.svg import load_svg
+from bubble_sort.array import Array, RestyleCells, TransformMatchingCells
 from bubble_sort.clock import Clock
 
 a = [12, 3, 5, 9, 4, 1, 7]
@@ -74,48 +76,24 @@ class IntroductionClock(Scene):
         self.play(clock.ht.animate.set_value(20), FadeOut(clock), run_time=2, rate_func=linear)
 
 
-def swap(array: Array, array_mobj: VGroup, i: int, j: int, aligned_edge=ORIGIN):
-    new_values = array.values.copy()
-    new_values[i], new_values[j] = new_values[j], new_values[i]
-    new_array = Array(
-        values=new_values,
-        color=array.color,
-        fill_color=array.fill_color,
-        fill_opacity=array.fill_opacity,
-        stroke_width=array.stroke_width,
-        stroke_color=array.stroke_color,
-        height=array.height,
-        width=array.width,
-        spacing=array.spacing,
-        scale_text=array.scale_text,
-        cell_type=array.cell_type,
-    )
-
-    new_array_mobj = new_array.get_mobject().move_to(array_mobj, aligned_edge=aligned_edge)
-    for i in range(len(array.labels)):
-        if array.cell_type == 'rectangle':
-            new_array.cells[i].set_stroke(
-                color=array.cells[i].get_stroke_color(),
-                width=array.cells[i].get_stroke_width(),
-            )
-        else:
-            for j in range(len(new_array.cells[i])):
-                new_array.cells[i][j].set_fill(color=array.cells[i][j].get_fill_color())
-
-    return new_array, new_array_mobj
+def swap(array: Array, array_mobj: VGroup, i: int, j: int, path_arc=PI / 2) -> Animation:
+    animation = array.swap(i, j, path_arc=path_arc)
+    # Keep the submobjects of the group in the order of the array
+    array_mobj.submobjects = list(array.get_mobjects())
+    return animation
 
 
 def highlight(array: Array, start: int, end: int, color: ManimColor, width=5.):
     if array.cell_type == 'rectangle':
-        return [
-            *[rect.animate.set_stroke(color=color, width=width) for rect in array.cells[start: end]],
-        ]
+        return [RestyleCells(array.cells[start: end], color=color, width=width)]
     else:    # SVG => change the background color (id="background")
         darker = interpolate_color(color, BLACK, 0.1)
-        return [
-            *[rect[1].animate.set_fill(color=color) for rect in array.cells[start: end]],
-            *[rect[3].animate.set_fill(color=darker) for rect in array.cells[start: end]],
-        ]
+        cells = array.cells[start: end]
+        return [RestyleCells(
+            [cell[1] for cell in cells] + [cell[3] for cell in cells],
+            color=[color] * len(cells) + [darker] * len(cells),
+            fill=True,
+        )]
 
 
 class Intuition(Scene):
@@ -158,20 +136,18 @@ class Intuition(Scene):
             self.wait(1)
 
         # Swap 9 and 4
-        swapped_array, swapped_mobj = swap(permuted_array, permuted_mobj, 2, 3)
-        self.play(TransformMatchingCells(permuted_mobj, swapped_mobj, path_arc=PI/2), run_time=1)
+        self.play(swap(permuted_array, permuted_mobj, 2, 3), run_time=1)
         self.wait(0.2)
-        self.play(*highlight(swapped_array, 2, 3, WHITE, 2), run_time=0.5)
+        self.play(*highlight(permuted_array, 2, 3, WHITE, 2), run_time=0.5)
         self.wait(0.2)
 
         # Highlight 9 and after that 1
-        self.play(*highlight(swapped_array, 3, 5, ORANGE, 5), run_time=0.2)
-        self.play(Indicate(swapped_array.labels[3]), run_time=0.4)
-        self.play(Indicate(swapped_array.labels[4]), run_time=0.4)
+        self.play(*highlight(permuted_array, 3, 5, ORANGE, 5), run_time=0.2)
+        self.play(Indicate(permuted_array.labels[3]), run_time=0.4)
+        self.play(Indicate(permuted_array.labels[4]), run_time=0.4)
 
         # Swap 9 and 1
-        new_swapped_array, new_swapped_mobj = swap(swapped_array, swapped_mobj, 3, 4)
-        self.play(TransformMatchingCells(swapped_mobj, new_swapped_mobj, path_arc=PI/2), run_time=0.5)
+        self.play(swap(permuted_array, permuted_mobj, 3, 4), run_time=0.5)
         self.wait(0.2)
 
         # Draw an arrow <- at the bottom of 1
@@ -179,24 +155,24 @@ class Intuition(Scene):
             start=RIGHT, end=LEFT, color=YELLOW, buff=0.1,
             stroke_width=10, max_stroke_width_to_length_ratio=15,
             max_tip_length_to_length_ratio=0.2, tip_length=0.15,
-        ).scale(0.3).next_to(new_swapped_array.cells[3], DOWN)
+        ).scale(0.3).next_to(permuted_array.cells[3], DOWN)
 
         # Draw an arrow -> at the bottom of 9
         right_arrow = Arrow(
             start=LEFT, end=RIGHT, color=YELLOW, buff=0.1,
             stroke_width=10, max_stroke_width_to_length_ratio=15,
             max_tip_length_to_length_ratio=0.2, tip_length=0.15,
-        ).scale(0.3).next_to(new_swapped_array.cells[4], DOWN)
+        ).scale(0.3).next_to(permuted_array.cells[4], DOWN)
 
-        self.play(Create(left_arrow), Indicate(new_swapped_array.labels[3]), run_time=0.5)
+        self.play(Create(left_arrow), Indicate(permuted_array.labels[3]), run_time=0.5)
         self.wait(1)
-        self.play(Create(right_arrow), Indicate(new_swapped_array.labels[4]), run_time=0.5)
+        self.play(Create(right_arrow), Indicate(permuted_array.labels[4]), run_time=0.5)
         self.wait(2)
 
         # Bring the array to the initial state
-        self.play(*highlight(new_swapped_array, 3, 5, WHITE, 2), run_time=0.1)
+        self.play(*highlight(permuted_array, 3, 5, WHITE, 2), run_time=0.1)
         self.play(FadeOut(left_arrow, right_arrow), run_time=0.5)
-        self.play(TransformMatchingCells(new_swapped_mobj, array_mobj, path_arc=PI/3), run_time=0.5)
+        self.play(TransformMatchingCells(permuted_mobj, array_mobj, path_arc=PI/3), run_time=0.5)
         self.wait(0.5)
 
         # Run bubble-sort animation for 1 sweep
@@ -206,10 +182,8 @@ class Intuition(Scene):
                 self.play(*highlight(array, i, i + 2, ORANGE, 5), run_time=time)
                 self.wait(6 * time)
                 if array.values[i] > array.values[i + 1]:
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=3 * time)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=3 * time)
                     self.wait(2 * time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(2 * time)
                     self.play(Indicate(array.labels[i]), run_time=3 * time)
@@ -257,7 +231,7 @@ class IntuitionBehindNaming(Scene):
         # Turn all the cell rectangles into bubbles
         array_mobj.z_index = 1
         for i, cell in enumerate(array.cells):
-            bubble = SVGMobject(
+            bubble = load_svg(
                 'bubble_sort/bubble.svg',
             ).scale(0.25 + (0.03 * array.values[i])).move_to(cell.get_center())
             self.play(
@@ -278,10 +252,8 @@ class IntuitionBehindNaming(Scene):
                 self.play(*highlight(array, i, i + 2, ORANGE, 5), run_time=time)
                 self.wait(time)
                 if array.values[i] > array.values[i + 1]:
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/3), run_time=time * 7)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 3), run_time=time * 7)
                     self.wait(time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(2 * time)
 
@@ -316,7 +288,7 @@ class IntuitionBehindNaming(Scene):
                 fill_color=array.fill_color,
                 fill_opacity=array.fill_opacity,
                 stroke_width=array.stroke_width[i],
-                stroke_color=array.stroke_color[i],
+                stroke_color=ManimColor.from_rgba(array.stroke_color[i]),
             ).move_to(cell.get_center())
             for i, cell in enumerate(array.cells)
         ]
@@ -330,7 +302,7 @@ class IntuitionBehindNaming(Scene):
 
         # Bring back the bubbles
         bubbles = [
-            SVGMobject(
+            load_svg(
                 'bubble_sort/bubble.svg',
             ).scale(0.25 + (0.03 * array.values[i])).move_to(cell.get_center())
             for i, cell in enumerate(array.cells)
@@ -375,10 +347,8 @@ class IntuitionDetails(Scene):
                 self.play(*highlight(array, i, i + 2, ORANGE, 5), run_time=time)
                 self.wait(5 * time)
                 if array.values[i] > array.values[i + 1]:
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=3 * time)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=3 * time)
                     self.wait(2 * time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(4 * time)
 
@@ -483,10 +453,8 @@ class IntuitionBehindN1Loops(Scene):
                 self.play(*highlight(array, i, i + 2, ORANGE, 5), run_time=time)
                 self.wait(time)
                 if array.values[i] > array.values[i + 1]:
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=time * 5)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=time * 5)
                     self.wait(time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(2 * time)
 
@@ -554,7 +522,7 @@ class Implementation(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, 0.1 * UP)
         self.add(a_text, array_mobj, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for _ in range(len(a) - 1):
                     for i in range(len(a) - 1):
@@ -608,7 +576,7 @@ class Optimization1(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, 0.1 * UP)
         self.add(a_text, array_mobj, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for _ in range(len(a) - 1):
                     for i in range(len(a) - 1):
@@ -635,10 +603,8 @@ class Optimization1(Scene):
                 self.play(*highlight(array, i, i + 2, ORANGE, 5), run_time=time)
                 self.wait(2 * time)
                 if array.values[i] > array.values[i + 1]:
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=time * 5)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=time * 5)
                     self.wait(time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(2 * time)
 
@@ -662,7 +628,7 @@ class Optimization1(Scene):
         self.play(Circumscribe(VGroup(*array.cells[:-2]), run_time=2))
         self.wait(2)
 
-        optimized_code = Code(
+        optimized_code = make_code(
             code=dedent('''
                 for u in range(len(a) - 1, 0, -1):
                     for i in range(u):
@@ -715,7 +681,7 @@ class Optimization2(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, 0.1 * UP)
         self.add(a_text, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for u in range(len(a) - 1, 0, -1):
                     for i in range(u):
@@ -748,10 +714,8 @@ class Optimization2(Scene):
                 self.play(*highlight(array, i, i + 2, ORANGE, 5), run_time=time)
                 self.wait(time)
                 if array.values[i] > array.values[i + 1]:
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=time * 7)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=time * 7)
                     self.wait(time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(2 * time)
 
@@ -783,7 +747,7 @@ class Optimization2(Scene):
         self.play(*highlight(array, 2, 3, GREEN, 5), run_time=0.5)
         self.wait(1)
 
-        optimized_code = Code(
+        optimized_code = make_code(
             code=dedent('''
                 for u in range(len(a) - 1, 0, -1):
                     changed = False
@@ -851,7 +815,7 @@ class Simulation(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, 0.1 * UP)
         self.add(a_text, array_mobj, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for u in range(len(a) - 1, 0, -1):
                     changed = False
@@ -883,7 +847,7 @@ class Simulation(Scene):
 
         # show real-time values to better understand the code
         def get_debug(u, changed, i):
-            res = Code(
+            res = make_code(
                 code=dedent(f'''
                 # {u}
                 # {changed}
@@ -930,8 +894,7 @@ class Simulation(Scene):
                 if array.values[i] > array.values[i + 1]:
                     entered_if = True
                     self.play(arrow.animate.shift(0.4 * DOWN), run_time=time)
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=3 * time)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=3 * time)
                     self.play(arrow.animate.shift(0.4 * DOWN), run_time=time)
                     if not changed:
                         self.play(*[RemoveTextLetterByLetter(d.chars[1], run_time=0.01 * len(d.chars[1])) for d in debugs])
@@ -940,7 +903,6 @@ class Simulation(Scene):
                         debugs.append(debug)
                         self.play(AddTextLetterByLetter(debug.chars[1], run_time=0.1 * len(debug.chars[1])))
                     self.wait(time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(4 * time)
 
@@ -1029,7 +991,7 @@ class StableSorting(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, 0.1 * UP)
         self.add(a_text, array_mobj, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for u in range(len(a) - 1, 0, -1):
                     changed = False
@@ -1123,7 +1085,7 @@ class StableSorting(Scene):
 
         # show real-time values to better understand the code
         def get_debug(u, changed, i):
-            res = Code(
+            res = make_code(
                 code=dedent(f'''
                 # {u}
                 # {changed}
@@ -1170,8 +1132,7 @@ class StableSorting(Scene):
                 if array.values[i] > array.values[i + 1]:
                     entered_if = True
                     self.play(arrow.animate.shift(0.4 * DOWN), run_time=time)
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=3 * time)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=3 * time)
                     self.play(arrow.animate.shift(0.4 * DOWN), run_time=time)
                     if not changed:
                         self.play(*[RemoveTextLetterByLetter(d.chars[1], run_time=0.01 * len(d.chars[1])) for d in debugs])
@@ -1180,7 +1141,6 @@ class StableSorting(Scene):
                         debugs.append(debug)
                         self.play(AddTextLetterByLetter(debug.chars[1], run_time=0.1 * len(debug.chars[1])))
                     self.wait(time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(4 * time)
 
@@ -1306,7 +1266,7 @@ class TimeComplexity(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, 0.1 * UP)
         self.add(a_text, array_mobj, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for u in range(len(a) - 1, 0, -1):
                     changed = False
@@ -1337,7 +1297,7 @@ class TimeComplexity(Scene):
 
         # show real-time values to better understand the code
         def get_debug(u, changed, i):
-            res = Code(
+            res = make_code(
                 code=dedent(f'''
                 # {u}
                 # {changed}
@@ -1384,8 +1344,7 @@ class TimeComplexity(Scene):
                 if array.values[i] > array.values[i + 1]:
                     entered_if = True
                     self.play(arrow.animate.shift(0.4 * DOWN), run_time=time)
-                    new_array, new_array_mobj = swap(array, array_mobj, i, i + 1, aligned_edge=RIGHT if i == 0 else LEFT)
-                    self.play(TransformMatchingCells(array_mobj, new_array_mobj, path_arc=PI/2), run_time=3 * time)
+                    self.play(swap(array, array_mobj, i, i + 1, path_arc=PI / 2), run_time=3 * time)
                     self.play(arrow.animate.shift(0.4 * DOWN), run_time=time)
                     if not changed:
                         self.play(*[RemoveTextLetterByLetter(d.chars[1], run_time=0.01 * len(d.chars[1])) for d in debugs])
@@ -1394,7 +1353,6 @@ class TimeComplexity(Scene):
                         debugs.append(debug)
                         self.play(AddTextLetterByLetter(debug.chars[1], run_time=0.1 * len(debug.chars[1])))
                     self.wait(time)
-                    array, array_mobj = new_array, new_array_mobj
                 else:
                     self.wait(4 * time)
 
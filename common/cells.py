@@ -0,0 +1,361 @@
+from dataclasses import dataclass, field
+from itertools import chain, count
+
+import numpy as np
+from manim import *
+from manim.animation.transform_matching_parts import TransformMatchingAbstractBase
+from manim.utils.paths import path_along_arc
+
+from common.glyphs import make_label
+from common.layout import place_copies, row_centers
+
+
+# Source of the cell ids => every cell ever created has a different id
+cell_ids = count()
+
+
+def broadcast_colors(color: ManimColor | list[ManimColor] | np.ndarray, n: int) -> np.ndarray:
+    """ Turn a single color, a list of colors or an existing RGBA array into an (n, 4) RGBA array. """
+    if isinstance(color, np.ndarray) and color.ndim == 2:
+        return color[:n].astype(float)
+    if isinstance(color, (list, tuple)):
+        return np.array([ManimColor(c).to_rgba() for c in color[:n]], dtype=float).reshape(-1, 4)
+    return np.tile(ManimColor(color).to_rgba(), (n, 1))
+
+
+def broadcast_widths(width: float | list[float] | np.ndarray, n: int) -> np.ndarray:
+    """ Turn a single width or a list of widths into an array of n floats. """
+    if isinstance(width, (float, int)):
+        return np.full(n, float(width))
+    return np.array(width, dtype=float)[:n]
+
+
+@dataclass
+class CellArray:
+    """
+    A row of cells (a rectangle + a label per value) shared by all the Array implementations.
+    Every cell and label mobject is built once. Style changes are stored in NumPy arrays and are pushed onto the
+    existing mobjects (only the ones that changed) with `refresh()` or animated with `restyle()`.
+    """
+    values: list[int | None]
+    color: ManimColor | list[ManimColor] = field(default_factory=lambda: WHITE)     # Color of the labels
+    fill_color: ManimColor = field(default_factory=lambda: BLACK)
+    fill_opacity: float = 0.5
+    stroke_width: float | list[float] | np.ndarray = 2.
+    stroke_color: ManimColor | list[ManimColor] | np.ndarray = field(default_factory=lambda: WHITE)
+    height: float = 0.6
+    width: float = 0.6
+    spacing: float = 0.1
+    scale_text: float = 0.6
+
+    cells: list[VMobject] = field(default_factory=lambda: [])
+    labels: list[VMobject] = field(default_factory=lambda: [])
+    ids: list[int] = field(default_factory=lambda: [])      # Stable id of each cell (follows the cell when reordered)
+
+    def __post_init__(self):
+        if not self.ids:
+            self.ids = [next(cell_ids) for _ in self.values]
+        self.stroke_color: np.ndarray = broadcast_colors(self.stroke_color, len(self.values))
+        self.stroke_width: np.ndarray = broadcast_widths(self.stroke_width, len(self.values))
+
+        # Style that is currently applied to the cell mobjects (NaN => the cell was not styled yet)
+        self.applied_stroke_color = np.full_like(self.stroke_color, np.nan)
+        self.applied_stroke_width = np.full_like(self.stroke_width, np.nan)
+
+    @property
+    def rectangles(self) -> list[VMobject]:
+        return self.cells
+
+    @rectangles.setter
+    def rectangles(self, rectangles: list[VMobject]):
+        self.cells = rectangles
+
+    def get_centers(self) -> np.ndarray:
+        """ Centers of all the cells (one row per cell) relative to the first one. """
+        return row_centers(len(self.values), self.width, self.spacing)
+
+    def make_cell(self, i: int, rectangle: Rectangle) -> VMobject:
+        """ Turn the (already positioned) rectangle of the i-th cell into the cell mobject. """
+        return rectangle
+
+    def style_cell(self, i: int):
+        self.cells[i].set_stroke(color=ManimColor.from_rgba(self.stroke_color[i]), width=self.stroke_width[i])
+
+    def get_cells(self) -> list[VMobject]:
+        if not self.cells:
+            template = Rectangle(
+                height=self.height,
+                width=self.width,
+                fill_color=self.fill_color,
+                fill_opacity=self.fill_opacity,
+            )
+            self.cells = [self.make_cell(i, rectangle) for i, rectangle in enumerate(place_copies(template, self.get_centers()))]
+            for cell, cell_id in zip(self.cells, self.ids):
+                cell.cell_id = cell_id
+            self.refresh_style()
+        return self.cells
+
+    get_rectangles = get_cells
+
+    def get_label_text(self, i: int) -> str:
+        return str(self.values[i]) if self.values[i] is not None else ''
+
+    def make_label(self, i: int) -> VMobject:
+        label = make_label(self.get_label_text(i), color=self.color[i] if isinstance(self.color, list) else self.color)
+        label.scale(self.scale_text)
+        label.move_to(self.get_cells()[i])
+        return label
+
+    def get_labels(self) -> list[VMobject]:
+        if not self.labels:
+            self.labels = [self.make_label(i) for i in range(len(self.values))]
+            for label, cell_id in zip(self.labels, self.ids):
+                label.cell_id = cell_id
+        return self.labels
+
+    def get_mobjects(self):
+        return chain.from_iterable(zip(self.get_cells(), self.get_labels()))
+
+    def get_mobject(self) -> VGroup:
+        self.refresh()
+        return VGroup(*self.get_mobjects())
+
+    def changed_cells(self) -> np.ndarray:
+        """ Indices of the cells whose stroke differs from the one applied to their mobjects. """
+        n = min(len(self.cells), len(self.stroke_width))
+        changed = (self.stroke_color[:n] != self.applied_stroke_color[:n]).any(axis=1)
+        changed |= self.stroke_width[:n] != self.applied_stroke_width[:n]
+        return np.flatnonzero(changed)
+
+    def refresh_style(self):
+        for i in self.changed_cells():
+            self.style_cell(i)
+        self.applied_stroke_color = self.stroke_color.copy()
+        self.applied_stroke_width = self.stroke_width.copy()
+
+    def refresh_labels(self):
+        """ Rebuild (in place) only the labels whose value changed since they were created. """
+        for i, label in enumerate(self.labels[:len(self.values)]):
+            text = self.get_label_text(i)
+            if label.tex_string != text:
+                label.become(self.make_label(i))
+                label.tex_string = text
+
+    def refresh(self):
+        """ Push the pending style and value changes onto the existing mobjects. """
+        if self.cells:
+            self.refresh_style()
+        if self.labels:
+            self.refresh_labels()
+        return self
+
+    def restyle(self) -> Animation:
+        """ Animate the cells whose style changed towards their new style. """
+        changed = self.changed_cells()
+        animation = RestyleCells(
+            [self.cells[i] for i in changed],
+            color=self.stroke_color[changed],
+            width=self.stroke_width[changed],
+        )
+        self.applied_stroke_color = self.stroke_color.copy()
+        self.applied_stroke_width = self.stroke_width.copy()
+        return animation
+
+    def permute(self, order: list[int] | np.ndarray, path_arc: float = PI / 2) -> Animation:
+        """
+        Reorder the cells so that the cell currently at `order[k]` ends up at position k.
+        The existing cell and label mobjects are moved along arcs in place => no new mobject, target or copy is made.
+        The values, the mobjects, the ids and their applied style are reordered in place.
+        The desired stroke (highlights) stays with the positions.
+        """
+        order = np.asarray(order)
+        centers = np.array([cell.get_center() for cell in self.cells])
+        moved = [(k, i) for k, i in enumerate(order) if k != i]
+        animation = ArcShift(
+            [mobject for k, i in moved for mobject in (self.cells[i], self.labels[i])],
+            [centers[k] - centers[i] for k, i in moved for _ in range(2)],
+            path_arc=path_arc,
+        )
+
+        reordered = [self.values, self.cells, self.labels, self.ids] + ([self.color] if isinstance(self.color, list) else [])
+        for items in reordered:
+            items[:] = [items[i] for i in order]
+        self.applied_stroke_color = self.applied_stroke_color[order]
+        self.applied_stroke_width = self.applied_stroke_width[order]
+        return animation
+
+    def swap(self, i: int, j: int, path_arc: float = PI / 2) -> Animation:
+        """ Swap the i-th and the j-th cells (rectangle + label) by moving the existing mobjects along arcs. """
+        order = np.arange(len(self.values))
+        order[[i, j]] = j, i
+        return self.permute(order, path_arc=path_arc)
+
+    def highlight(self, start: int, end: int, color=RED, width=5.):
+        self.stroke_color[start: end + 1] = ManimColor(color).to_rgba()
+        self.stroke_width[start: end + 1] = width
+
+    def unhighlight(self):
+        self.stroke_color[:] = WHITE.to_rgba()
+        self.stroke_width[:] = 2.
+
+    def __len__(self):
+        return len(self.values)
+
+
+class InPlaceAnimation(Animation):
+    """
+    Base of the animations that change existing mobjects in place through a temporary group that wraps them.
+    Adding the group to the scene splits the scene mobjects that contain them (e.g. the mobject of the array) and
+    leaves the wrapped mobjects only in the group => at the end, the group is removed and these scene mobjects are put
+    back where they were. Mobjects that were not in the scene are only shown during the animation.
+    """
+    def __init__(self, mobjects: list[Mobject], **kwargs):
+        self.mobjects = list(mobjects)
+        super().__init__(Group(*self.mobjects), introducer=True, **kwargs)
+
+    def _setup_scene(self, scene: Scene) -> None:
+        if scene is None:
+            return
+        members = set(self.mobject.get_family())
+        self.parents = [(i, mobject) for i, mobject in enumerate(scene.mobjects) if members & set(mobject.get_family())]
+        self.shown = members.intersection(scene.get_mobject_family_members())
+        scene.add(self.mobject)
+
+    def create_starting_mobject(self) -> Mobject:
+        # The start state is kept by the subclass => no need for a copy of all the mobjects
+        return self.mobject
+
+    def clean_up_from_scene(self, scene: Scene) -> None:
+        super().clean_up_from_scene(scene)
+        # Parents removed by another animation of the same play (e.g. a FadeOut) are not brought back
+        present = set(scene.get_mobject_family_members())
+        scene.remove(self.mobject)
+        for i, parent in self.parents:
+            if present.intersection(parent.get_family()):
+                # Drop the parts of the parent that were left in the scene and put the whole parent back at its place
+                scene.remove(parent)
+                scene.mobjects.insert(min(i, len(scene.mobjects)), parent)
+        # Everything that was shown during the animation is still shown (e.g. the cells of the array after a swap)
+        shown = self.shown & present
+        assert shown <= set(scene.get_mobject_family_members()), 'Animated mobjects were dropped from the scene'
+
+
+class RestyleCells(InPlaceAnimation):
+    """
+    Interpolate the stroke (or the fill) of many cells at once from their current style to the given colors/widths.
+    Unlike `cell.animate`, no target copy is made per cell: the styles are interpolated from two RGBA arrays.
+    """
+    def __init__(
+        self,
+        cells: list[VMobject],
+        color: ManimColor | list[ManimColor] | np.ndarray,
+        width: float | list[float] | np.ndarray | None = None,
+        fill: bool = False,
+        **kwargs,
+    ):
+        self.cells = cells
+        self.fill = fill
+        self.end_color = broadcast_colors(color, len(cells))
+        self.end_width = broadcast_widths(width, len(cells)) if width is not None else None
+        super().__init__(cells, **kwargs)
+
+    def begin(self) -> None:
+        # Start from the style the cells have when the animation starts (like Transform does)
+        if self.fill:
+            self.start_color = np.array([cell.get_fill_rgbas()[0] for cell in self.cells]).reshape(-1, 4)
+        else:
+            self.start_color = np.array([cell.get_stroke_rgbas()[0] for cell in self.cells]).reshape(-1, 4)
+        self.start_width = np.array([cell.get_stroke_width() for cell in self.cells], dtype=float)
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        t = self.rate_func(alpha)
+        colors = self.start_color + t * (self.end_color - self.start_color)
+        widths = self.start_width + t * (self.end_width - self.start_width) if self.end_width is not None else None
+        for i, cell in enumerate(self.cells):
+            if self.fill:
+                cell.set_fill(color=ManimColor.from_rgba(colors[i]), opacity=colors[i, 3])
+            else:
+                cell.set_stroke(
+                    color=ManimColor.from_rgba(colors[i]),
+                    width=widths[i] if widths is not None else None,
+                    opacity=colors[i, 3],
+                )
+
+
+class ArcShift(InPlaceAnimation):
+    """
+    Move every mobject by its own offset along an arc, like `mobject.animate(path_arc=...).shift(offset)`.
+    A translation moves all the points of a mobject by the same vector => the points are shifted in place from a copy of
+    the start points, no target or starting mobject is made.
+    """
+    def __init__(self, mobjects: list[Mobject], offsets: list[np.ndarray] | np.ndarray, path_arc: float = PI / 2, **kwargs):
+        self.offsets = np.array(offsets, dtype=float).reshape(-1, 3)
+        self.path = path_along_arc(path_arc)
+        super().__init__(mobjects, **kwargs)
+
+    def begin(self) -> None:
+        self.members = [mobject.family_members_with_points() for mobject in self.mobjects]
+        self.start_points = [[member.points.copy() for member in members] for members in self.members]
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        # The displacement along an arc doesn't depend on the start point => one path evaluation per mobject
+        shifts = self.path(np.zeros_like(self.offsets), self.offsets, self.rate_func(alpha))
+        for members, start_points, shift in zip(self.members, self.start_points, shifts):
+            for member, start in zip(members, start_points):
+                np.add(start, shift, out=member.points)
+
+
+class TransformMatchingCells(TransformMatchingAbstractBase):
+    """
+    Similar to TransformMatchingShapes but transforms the matching cells (label + rectangle) of an Array.
+    Cells that carry the same id in both mobjects are matched by id. The remaining ones are matched by value where
+    the k-th occurrence of a value goes to the k-th occurrence in the target => equal values move instead of fading.
+    Only needed when the target is a different Array: reordering the cells of the same Array is `CellArray.permute`.
+    """
+    def __init__(
+        self,
+        mobject: Mobject,
+        target_mobject: Mobject,
+        transform_mismatches: bool = False,
+        fade_transform_mismatches: bool = False,
+        key_map: dict | None = None,
+        **kwargs,
+    ):
+        self.shared_ids = self.get_cell_ids(mobject) & self.get_cell_ids(target_mobject)
+        super().__init__(
+            mobject,
+            target_mobject,
+            transform_mismatches=transform_mismatches,
+            fade_transform_mismatches=fade_transform_mismatches,
+            key_map=key_map,
+            **kwargs,
+        )
+
+    @classmethod
+    def get_cell_ids(cls, mobject: Mobject) -> set[int]:
+        return {getattr(part[0], 'cell_id', None) for part in cls.get_mobject_parts(mobject)} - {None}
+
+    @staticmethod
+    def get_mobject_parts(mobject: Mobject) -> list[Mobject]:
+        # Group the list of submobjects into pairs of (rectangle, label)
+        res = [VGroup(*mobject.submobjects[i:i + 2]) for i in range(0, len(mobject.submobjects), 2)]
+        return res
+
+    @staticmethod
+    def get_mobject_key(mobject: list[tuple[Rectangle, Tex]]) -> int:
+        return hash(mobject[1].tex_string)
+
+    def get_shape_map(self, mobject: Mobject) -> dict:
+        shape_map, occurrences = {}, {}
+        for part in self.get_mobject_parts(mobject):
+            cell_id = getattr(part[0], 'cell_id', None)
+            if cell_id in self.shared_ids:
+                key = ('id', cell_id)
+            else:
+                value = self.get_mobject_key(part)
+                occurrences[value] = occurrences.get(value, 0) + 1
+                key = ('value', value, occurrences[value])
+            shape_map[key] = VGroup(part)
+        return shape_map
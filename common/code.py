@@ -0,0 +1,174 @@
+import hashlib
+import os
+import pickle
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import manim
+import numpy as np
+from manim import *
+
+# Built Code blocks keyed by the hash of the code and all the parameters that affect its geometry
+code_templates: dict[str, Code] = {}
+
+
+def get_code_key(code: str, **kwargs) -> str:
+    description = (code, sorted((name, repr(value)) for name, value in kwargs.items()), manim.__version__)
+    return hashlib.sha1(repr(description).encode()).hexdigest()
+
+
+def make_code(
+    code: str,
+    tab_width: int = 4,
+    language: str = 'Python',
+    line_spacing: float = 0.6,
+    font: str = 'Monospace',
+    style: str = 'monokai',
+    **kwargs,
+) -> Code:
+    """
+    A manim Code block built once per distinct code and style.
+    Pygments highlighting and Pango layout only run on the first use: the built block is pickled in the media directory
+    (keyed by the code, the language, the style, the font, the tab width, the line spacing and any other argument) and
+    every call returns a copy of it => repeated snippets across scenes and renders cost a file read.
+    """
+    kwargs.update(tab_width=tab_width, language=language, line_spacing=line_spacing, font=font, style=style)
+    key = get_code_key(code, **kwargs)
+    path = Path(config.media_dir) / 'code' / f'{key}.pickle'
+
+    if key not in code_templates and path.exists():
+        try:
+            with open(path, 'rb') as f:
+                code_templates[key] = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            path.unlink(missing_ok=True)
+    if key not in code_templates:
+        code_templates[key] = Code(code=code, **kwargs)
+
+        # Write to a temporary file first => a parallel worker never reads a partially written block
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(temporary, 'wb') as f:
+                pickle.dump(code_templates[key], f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            temporary.unlink(missing_ok=True)
+    return code_templates[key].copy()
+
+
+class TypeCode(Animation):
+    """
+    Type the lines of a Code block letter by letter in a single play (empty lines are skipped).
+    Every character takes the same time => each line takes a time proportional to its length, exactly like consecutive
+    `AddTextLetterByLetter(line, run_time=time_per_char * len(line))` plays but with one partial movie file.
+    The lines are animated inside a wrapping group, at the end they are left in the scene on their own (as after
+    AddTextLetterByLetter) or removed from it.
+    """
+    def __init__(self, lines: Iterable[VMobject], time_per_char: float = 0.1, reverse: bool = False, **kwargs):
+        self.lines = [line for line in lines if len(line.submobjects) > 0]
+        if not self.lines:
+            raise ValueError('There are no characters to type')
+        self.line_chars = [list(line.submobjects) for line in self.lines]
+        self.ends = np.cumsum([len(chars) for chars in self.line_chars])
+        self.reverse = reverse
+        # No frame-rate floor: a frame shows several characters when they are typed faster than the frame rate
+        kwargs.setdefault('run_time', time_per_char * self.ends[-1])
+        kwargs.setdefault('rate_func', linear)
+        super().__init__(VGroup(*self.lines), introducer=True, remover=reverse, **kwargs)
+
+    def _setup_scene(self, scene: Scene) -> None:
+        # The lines are drawn through the group for the whole animation (untyped lines may already be in the scene)
+        if scene is not None:
+            scene.remove(*self.lines)
+            scene.add(self.mobject)
+
+    def create_starting_mobject(self) -> Mobject:
+        # The state is fully described by the number of typed characters => no copy of the code is needed
+        return self.mobject
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        typed = int(np.ceil(self.rate_func(alpha) * self.ends[-1]))
+        if self.reverse:
+            typed = self.ends[-1] - typed
+        for line, chars, end in zip(self.lines, self.line_chars, self.ends):
+            line.submobjects = chars[:max(0, min(len(chars), typed - end + len(chars)))]
+
+    def clean_up_from_scene(self, scene: Scene) -> None:
+        super().clean_up_from_scene(scene)
+        for line, chars in zip(self.lines, self.line_chars):
+            line.submobjects = chars
+        scene.remove(self.mobject)
+        if not self.reverse:
+            scene.add(*self.lines)
+
+
+class UntypeCode(TypeCode):
+    """ Remove the lines of a Code block letter by letter (last character first) in a single play. """
+    def __init__(self, lines: Iterable[VMobject], time_per_char: float = 0.1, **kwargs):
+        super().__init__(lines, time_per_char=time_per_char, reverse=True, **kwargs)
+
+
+class MovePointer(Animation):
+    """ Translate a mobject so that its center ends at the target point (the points are interpolated in place). """
+    def __init__(self, mobject: Mobject, target: np.ndarray, **kwargs):
+        self.target = np.array(target, dtype=float)
+        super().__init__(mobject, **kwargs)
+
+    def begin(self) -> None:
+        self.members = self.mobject.family_members_with_points()
+        self.start_points = [member.points.copy() for member in self.members]
+        self.delta = self.target - self.mobject.get_center()
+        super().begin()
+
+    def create_starting_mobject(self) -> Mobject:
+        # The start is kept as the points of the family => no copy of the whole mobject is needed
+        return self.mobject
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        offset = self.rate_func(alpha) * self.delta
+        for member, start in zip(self.members, self.start_points):
+            np.add(start, offset, out=member.points)
+
+
+class CodeCursor:
+    """
+    A pointer (e.g. an arrow) placed at the left of the current line of a Code block.
+    The anchor of every line (where `pointer.next_to(line, LEFT)` would put the pointer) is computed once => moving the
+    cursor is a plain translation of its points, with no bounding box of the code lines or copy of the pointer per step.
+    The anchors are measured when the cursor is built, call `refresh()` after the code block moved.
+    """
+    def __init__(
+        self,
+        pointer: Mobject,
+        lines: Sequence[VMobject],
+        buff: float = DEFAULT_MOBJECT_TO_MOBJECT_BUFFER,
+        shift: np.ndarray = ORIGIN,
+    ):
+        """
+        :param pointer: Mobject that points at the lines
+        :param lines: Lines of the Code block (`Code(...).code`)
+        :param shift: Offset from the anchor used when none is given for a line
+        """
+        self.pointer = pointer
+        self.lines = lines
+        self.buff = buff
+        self.shift = np.array(shift, dtype=float)
+        self.refresh()
+
+    def refresh(self) -> 'CodeCursor':
+        """ Measure the anchors of all the lines again (empty lines have no anchor). """
+        lefts = [line.get_left() if line.family_members_with_points() else np.full(3, np.nan) for line in self.lines]
+        self.anchors = np.array(lefts) + (self.pointer.width / 2 + self.buff) * LEFT
+        return self
+
+    def get_anchor(self, line: int, shift: np.ndarray | None = None) -> np.ndarray:
+        return self.anchors[line] + (self.shift if shift is None else shift)
+
+    def place(self, line: int, shift: np.ndarray | None = None) -> Mobject:
+        """ Put the pointer next to the line right away. """
+        return self.pointer.move_to(self.get_anchor(line, shift))
+
+    def move(self, line: int, shift: np.ndarray | None = None, **kwargs) -> Animation:
+        """ Animation that moves the pointer next to the line. """
+        return MovePointer(self.pointer, self.get_anchor(line, shift), **kwargs)
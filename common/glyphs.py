@@ -0,0 +1,56 @@
+from functools import lru_cache
+
+from manim import *
+
+GLYPHS = '0123456789-+.'
+
+
+class GlyphLabel(VGroup):
+    """ A label assembled from copies of pre-rendered glyphs. Keeps `tex_string` so it can be matched like a Tex. """
+    def __init__(self, tex_string: str, *glyphs: VMobject, **kwargs):
+        super().__init__(*glyphs, **kwargs)
+        self.tex_string = tex_string
+
+
+class GlyphAtlas:
+    """
+    Typesets every character once (in a single LaTeX run) and assembles labels from copies of those glyphs.
+    Each character is typeset twice in a row so that the distance between the copies gives its advance width.
+    """
+    def __init__(self, characters: str = GLYPHS):
+        # `{}` between the copies prevents ligatures like -- => en-dash
+        glyphs = Tex(''.join(f'{c}{{}}{c}' for c in characters))[0]
+        self.glyphs: dict[str, VMobject] = {}
+        self.advances: dict[str, float] = {}
+        for i, c in enumerate(characters):
+            first, second = glyphs[2 * i], glyphs[2 * i + 1]
+            advance = second.get_left()[0] - first.get_left()[0]
+
+            # Center the glyph horizontally in its advance box which starts at x = 0 (keep the baseline as is)
+            glyph = first.copy()
+            glyph.shift(((advance - glyph.width) / 2 - glyph.get_left()[0]) * RIGHT)
+            self.glyphs[c] = glyph
+            self.advances[c] = advance
+
+    def can_render(self, text: str) -> bool:
+        return all(c in self.glyphs for c in text)
+
+    def render(self, text: str, color: ManimColor = WHITE) -> GlyphLabel:
+        glyphs, pen = [], 0.
+        for c in text:
+            glyphs.append(self.glyphs[c].copy().shift(pen * RIGHT))
+            pen += self.advances[c]
+        return GlyphLabel(text, *glyphs).set_color(color)
+
+
+@lru_cache(maxsize=None)
+def get_glyph_atlas() -> GlyphAtlas:
+    return GlyphAtlas()
+
+
+def make_label(text: str, color: ManimColor = WHITE) -> VMobject:
+    """ Numbers are assembled from the glyph atlas (no LaTeX involved), everything else is rendered with Tex. """
+    atlas = get_glyph_atlas()
+    if atlas.can_render(text):
+        return atlas.render(text, color)
+    return Tex(text, color=color)
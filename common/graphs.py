@@ -0,0 +1,91 @@
+import hashlib
+import os
+from collections.abc import Hashable
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+from manim import *
+from manim.mobject.graph import _determine_graph_layout
+
+# Layouts computed in this process keyed by the hash of the graph and the layout parameters
+graph_layouts: dict[str, np.ndarray] = {}
+
+
+def get_layout_key(
+    vertices: list[Hashable],
+    edges: list[tuple[Hashable, Hashable]],
+    layout: str,
+    layout_scale: float,
+    layout_config: dict,
+    directed: bool,
+) -> str:
+    description = (
+        [repr(v) for v in vertices], [(repr(u), repr(v)) for u, v in edges],
+        layout, repr(layout_scale), sorted((name, repr(value)) for name, value in layout_config.items()), directed,
+    )
+    return hashlib.sha1(repr(description).encode()).hexdigest()
+
+
+def graph_layout(
+    vertices: list[Hashable],
+    edges: list[tuple[Hashable, Hashable]],
+    layout: str | dict[Hashable, list[float]] = 'spring',
+    layout_scale: float = 2,
+    layout_config: dict | None = None,
+    root_vertex: Hashable | None = None,
+    directed: bool = False,
+) -> dict[Hashable, np.ndarray]:
+    """
+    Positions of the vertices for the given layout (same arguments as manim's Graph).
+    The iterative networkx solvers run once: the result is stored as a .npy file in the media directory, keyed by the
+    vertices, the edges, the algorithm and its parameters (including the seed) => repeat renders and parallel workers
+    read the coordinates back. Hand-written layouts are only converted to arrays.
+    """
+    if isinstance(layout, dict):
+        return {vertex: np.array(layout[vertex], dtype=float) for vertex in vertices}
+
+    layout_config = dict(layout_config or {})
+    if root_vertex is not None:
+        layout_config.setdefault('root_vertex', root_vertex)
+    key = get_layout_key(vertices, edges, layout, layout_scale, layout_config, directed)
+    path = Path(config.media_dir) / 'layouts' / f'{key}.npy'
+
+    if key not in graph_layouts and path.exists():
+        graph_layouts[key] = np.load(path)
+    if key not in graph_layouts:
+        nx_graph = nx.DiGraph() if directed else nx.Graph()
+        nx_graph.add_nodes_from(vertices)
+        nx_graph.add_edges_from(edges)
+        positions = _determine_graph_layout(nx_graph, layout=layout, layout_scale=layout_scale, layout_config=layout_config)
+        graph_layouts[key] = np.array([positions[vertex] for vertex in vertices], dtype=float)
+
+        # Write to a temporary file first => a parallel worker never reads a partially written layout
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temporary, 'wb') as f:
+            np.save(f, graph_layouts[key])
+        os.replace(temporary, path)
+    return dict(zip(vertices, graph_layouts[key].copy()))
+
+
+def make_graph(
+    vertices: list[Hashable],
+    edges: list[tuple[Hashable, Hashable]],
+    layout: str | dict[Hashable, list[float]] = 'spring',
+    layout_scale: float = 2,
+    layout_config: dict | None = None,
+    root_vertex: Hashable | None = None,
+    graph_class: type[Graph] | type[DiGraph] = Graph,
+    **kwargs,
+) -> Graph | DiGraph:
+    """ A manim Graph (or DiGraph) whose layout goes through the layout cache. """
+    positions = graph_layout(
+        vertices, edges,
+        layout=layout,
+        layout_scale=layout_scale,
+        layout_config=layout_config,
+        root_vertex=root_vertex,
+        directed=graph_class is DiGraph,
+    )
+    return graph_class(vertices, edges, layout=positions, **kwargs)
@@ -0,0 +1,35 @@
+from functools import lru_cache
+
+import numpy as np
+from manim import *
+
+
+@lru_cache(maxsize=None)
+def cached_grid_centers(rows: int, cols: int, height: float, width: float, spacing: float) -> np.ndarray:
+    rows, cols = np.divmod(np.arange(rows * cols), cols)
+    centers = np.outer(rows, (height + spacing) * DOWN) + np.outer(cols, (width + spacing) * RIGHT)
+    centers.setflags(write=False)
+    return centers
+
+
+def grid_centers(rows: int, cols: int, height: float, width: float, spacing: float) -> np.ndarray:
+    """ Centers of the cells of a (rows x cols) grid in row-major order relative to the first cell (cached by geometry). """
+    return cached_grid_centers(rows, cols, float(height), float(width), float(spacing))
+
+
+def row_centers(n: int, width: float, spacing: float) -> np.ndarray:
+    """ Centers of n cells placed in a row relative to the first cell. """
+    return grid_centers(1, n, 0., width, spacing)
+
+
+def move_points(mobject: Mobject, offset: np.ndarray) -> Mobject:
+    """ Shift the points of the mobject (and its family) directly without going through `apply_points_function`. """
+    for submobject in mobject.get_family():
+        if len(submobject.points):
+            submobject.points += offset
+    return mobject
+
+
+def place_copies(template: Mobject, centers: np.ndarray) -> list[Mobject]:
+    """ A copy of the template per center. The template is expected to be centered at the origin. """
+    return [move_points(template.copy(), center) for center in centers]
@@ -0,0 +1,12 @@
+import hashlib
+
+import numpy as np
+
+
+def get_rng(*key) -> np.random.Generator:
+    """
+    Random generator seeded from a stable key (e.g. scene name + vertex).
+    The same key always gives the same stream no matter what was rendered before, unlike a shared global seed.
+    """
+    digest = hashlib.sha256(repr(key).encode()).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], 'little'))
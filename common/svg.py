@@ -0,0 +1,16 @@
+import hashlib
+from pathlib import Path
+
+from manim import *
+
+# Parsed SVGs keyed by (path, hash of the file contents, constructor arguments)
+svg_templates: dict[tuple, SVGMobject] = {}
+
+
+def load_svg(path: str, **kwargs) -> SVGMobject:
+    """ Parse every SVG asset once per process and return a copy of the parsed template on every call. """
+    content_hash = hashlib.sha1(Path(path).read_bytes()).hexdigest()
+    key = (path, content_hash, tuple(sorted((name, repr(value)) for name, value in kwargs.items())))
+    if key not in svg_templates:
+        svg_templates[key] = SVGMobject(path, **kwargs)
+    return svg_templates[key].copy()
@@ -0,0 +1,157 @@
+import ast
+import os
+import re
+import shutil
+from pathlib import Path
+
+from manim import *
+from manim.utils.tex_file_writing import delete_nonsvg_files, tex_compilation_command, tex_hash
+
+# Default separator and environment of the Tex classes whose strings can be collected
+TEX_CLASSES = {
+    'Tex': ('', 'center'),
+    'Title': ('', 'center'),
+    'MathTex': (' ', 'align*'),
+}
+PAGE_ENVIRONMENT = 'manimbatchpage'
+
+
+def get_tex_expressions(
+    tex_strings: list[str],
+    arg_separator: str = ' ',
+    substrings_to_isolate: list[str] | None = None,
+    tex_to_color_map: dict | None = None,
+) -> list[str]:
+    """
+    Expressions manim compiles for a Tex/MathTex with the given arguments: the joined string and every part of it.
+    The splitting and the clean-up are delegated to MathTex itself => the expressions match the files manim looks for.
+    """
+    probe = MathTex.__new__(MathTex)
+    probe.substrings_to_isolate = list(substrings_to_isolate or [])
+    probe.tex_to_color_map = dict.fromkeys(tex_to_color_map or {})
+    parts = probe._break_up_tex_strings(tex_strings)
+    return list(dict.fromkeys(probe._get_modified_expression(s) for s in [arg_separator.join(parts), *parts]))
+
+
+def scan_tex_calls(path: str | Path) -> list[tuple[str, str]]:
+    """
+    (expression, environment) of every Tex, MathTex and Title of a module whose arguments are literals.
+    Calls with computed strings (f-strings, variables) or a custom template are left to the regular compilation.
+    """
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    expressions = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name) or node.func.id not in TEX_CLASSES:
+            continue
+        arg_separator, environment = TEX_CLASSES[node.func.id]
+        options = {}
+        try:
+            tex_strings = [ast.literal_eval(arg) for arg in node.args]
+            for keyword in node.keywords:
+                if keyword.arg in ('arg_separator', 'tex_environment', 'substrings_to_isolate'):
+                    options[keyword.arg] = ast.literal_eval(keyword.value)
+                elif keyword.arg == 'tex_to_color_map':
+                    options[keyword.arg] = [ast.literal_eval(key) for key in keyword.value.keys]
+                elif keyword.arg in ('tex_template', None):
+                    raise ValueError('custom template or **kwargs')
+        except (ValueError, TypeError, AttributeError, SyntaxError):
+            continue
+        if not tex_strings or not all(isinstance(s, str) for s in tex_strings):
+            continue
+
+        environment = options.pop('tex_environment', environment)
+        arg_separator = options.pop('arg_separator', arg_separator)
+        for expression in get_tex_expressions(tex_strings, arg_separator, **options):
+            expressions.append((expression, environment))
+    return list(dict.fromkeys(expressions))
+
+
+def get_tex_file(expression: str, environment: str, tex_template: TexTemplate | None = None) -> tuple[Path, str]:
+    """ Path of the .tex file manim writes for the expression (its SVG is stored next to it) and the content. """
+    tex_template = tex_template or config['tex_template']
+    texcode = tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return config.get_dir('tex_dir') / f'{tex_hash(texcode)}.tex', texcode
+
+
+def compile_tex_batch(expressions: list[tuple[str, str]], tex_template: TexTemplate | None = None) -> int:
+    """
+    Typeset all the (expression, environment) pairs missing from the tex cache as the pages of a single document =>
+    one LaTeX and one dvisvgm run for all of them. Every page is stored under the name manim gives to the SVG of its
+    expression. Nothing is stored if the batch fails: the expressions are then compiled one by one by manim as usual
+    (which also reports the LaTeX errors properly).
+    :return: Number of expressions added to the cache
+    """
+    tex_template = tex_template or config['tex_template']
+    tex_dir = config.get_dir('tex_dir')
+    tex_dir.mkdir(parents=True, exist_ok=True)
+
+    # Multi-page documents need the standalone class (the default), custom bodies can't be split into pages
+    documentclass = re.fullmatch(r'\\documentclass\[(.*)\]\{standalone\}', tex_template.documentclass.strip())
+    if documentclass is None or tex_template._body or shutil.which(tex_template.tex_compiler) is None:
+        return 0
+
+    missing = {}
+    for expression, environment in expressions:
+        tex_file, texcode = get_tex_file(expression, environment, tex_template)
+        if not tex_file.with_suffix('.svg').exists():
+            missing[tex_file] = texcode
+    if not missing:
+        return 0
+
+    # The preamble of the template + the body of every expression wrapped in its own page
+    preamble = tex_template.get_texcode_for_expression('').partition(r'\begin{document}')[0]
+    preamble = preamble.replace(
+        documentclass.group(0),
+        rf'\documentclass[{documentclass.group(1)},multi={PAGE_ENVIRONMENT}]{{standalone}}',
+    )
+    pages = [
+        texcode.partition(r'\begin{document}')[2].rpartition(r'\end{document}')[0]
+        for texcode in missing.values()
+    ]
+    document = '\n'.join([
+        preamble,
+        rf'\newenvironment{{{PAGE_ENVIRONMENT}}}{{}}{{}}',
+        r'\begin{document}',
+        *(rf'\begin{{{PAGE_ENVIRONMENT}}}{page}\end{{{PAGE_ENVIRONMENT}}}' for page in pages),
+        r'\end{document}',
+    ])
+    batch_file = tex_dir / f'batch_{tex_hash(document)}.tex'
+    batch_file.write_text(document, encoding='utf-8')
+
+    logger.info('Typesetting %(count)d tex expressions in a single document', {'count': len(missing)})
+    output_format = tex_template.output_format
+    if os.system(tex_compilation_command(tex_template.tex_compiler, output_format, batch_file, tex_dir)) != 0:
+        logger.warning(f'Batch compilation of {batch_file} failed, falling back to one compilation per expression')
+        return 0
+    os.system(' '.join([
+        'dvisvgm',
+        '--pdf' if output_format == '.pdf' else '',
+        '-p 1-',
+        f'"{batch_file.with_suffix(output_format).as_posix()}"',
+        '-n',
+        '-v 0',
+        f'-o "{(tex_dir / batch_file.stem).as_posix()}-%p.svg"',
+        '>',
+        os.devnull,
+    ]))
+
+    svg_pages = sorted(tex_dir.glob(f'{batch_file.stem}-*.svg'), key=lambda page: int(page.stem.rpartition('-')[2]))
+    if len(svg_pages) != len(missing):
+        logger.warning(f'Expected {len(missing)} pages from {batch_file}, got {len(svg_pages)}')
+        for page in svg_pages:
+            page.unlink()
+        return 0
+    for (tex_file, texcode), page in zip(missing.items(), svg_pages):
+        if not tex_file.exists():
+            tex_file.write_text(texcode, encoding='utf-8')
+        os.replace(page, tex_file.with_suffix('.svg'))
+
+    if not config['no_latex_cleanup']:
+        batch_file.unlink()
+        delete_nonsvg_files()
+    return len(missing)
+
+
+def precompile_tex(*paths: str | Path) -> int:
+    """ Fill the tex cache with all the literal Tex/MathTex/Title strings of the given modules in one LaTeX run. """
+    return compile_tex_batch([expression for path in paths for expression in scan_tex_calls(path)])
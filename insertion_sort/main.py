@@ -3,20 +3,20 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import TypeCode, make_code
 from insertion_sort.array import Array, TransformMatchingCells
 
 small = [10, 2, 7, 5, 3]
 medium = [2, 7, 10, 5, 3, -1]
 large = [12, 3, 5, 9, 4, 1, 7]
 ORANGE = ManimColor('#fa541c')
-random.seed(42)
 
 
 class Introduction(Scene):
     def construct(self):
         # Create vertical bars representing the array and sort them with insertion sort
         array = list(range(1, 55))
-        random.shuffle(array)
+        random.Random(42).shuffle(array)
 
         base = Rectangle(height=1, width=1, color=WHITE, fill_opacity=1).center().to_edge(DOWN).shift(UP)
         rectangles = [
@@ -64,7 +64,7 @@ class Introduction(Scene):
 
 class IntroductionImplementation(Scene):
     def construct(self):
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for i in range(1, len(a)):
                 j = i
@@ -79,8 +79,7 @@ class IntroductionImplementation(Scene):
             style='monokai',
         ).center().code
 
-        for line in code.chars:
-            self.play(AddTextLetterByLetter(line, run_time=0.1 * len(line)))
+        self.play(TypeCode(code.chars))
         self.wait(2)
 
 
@@ -157,6 +156,7 @@ class Intuition(Scene):
             array.values.insert(insert_idx, new_element.values[0])
             array.cells.insert(insert_idx, new_element.cells[0])
             array.labels.insert(insert_idx, new_element.labels[0])
+            array.ids.insert(insert_idx, new_element.ids[0])
             array.color.insert(insert_idx, new_element.color[0])
             print(f'Array became: {array.values}')
             array_mobj.add(new_element_mobj)
@@ -254,6 +254,7 @@ class IntuitionFull(Scene):
                 array.values[i - 1], array.values[i] = array.values[i], array.values[i - 1]
                 array.cells[i - 1], array.cells[i] = array.cells[i], array.cells[i - 1]
                 array.labels[i - 1], array.labels[i] = array.labels[i], array.labels[i - 1]
+                array.ids[i - 1], array.ids[i] = array.ids[i], array.ids[i - 1]
                 array.color[i - 1], array.color[i] = array.color[i], array.color[i - 1]
 
                 if highlight:
@@ -302,7 +303,7 @@ class Implementation(Scene):
         self.add(array_mobj, a_text, indices_mobj)
         self.wait(4)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for i in range(1, len(a)):
                     j = i
@@ -400,6 +401,7 @@ class Implementation(Scene):
                 array.values[i - 1], array.values[i] = array.values[i], array.values[i - 1]
                 array.cells[i - 1], array.cells[i] = array.cells[i], array.cells[i - 1]
                 array.labels[i - 1], array.labels[i] = array.labels[i], array.labels[i - 1]
+                array.ids[i - 1], array.ids[i] = array.ids[i], array.ids[i - 1]
                 array.color[i - 1], array.color[i] = array.color[i], array.color[i - 1]
 
                 if highlight:
@@ -451,7 +453,7 @@ class Simulation(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, UP, buff=0.4)
         self.add(array_mobj, a_text, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for i in range(1, len(a)):
                     j = i
@@ -488,7 +490,7 @@ class Simulation(Scene):
 
         # show real-time values to better understand the code
         def get_debug(i, j, cur, prev):
-            res = Code(
+            res = make_code(
                 code=dedent(f'''
                 # i: {i}
                 # j: {j}
@@ -558,6 +560,7 @@ class Simulation(Scene):
                 array.values[i - 1], array.values[i] = array.values[i], array.values[i - 1]
                 array.cells[i - 1], array.cells[i] = array.cells[i], array.cells[i - 1]
                 array.labels[i - 1], array.labels[i] = array.labels[i], array.labels[i - 1]
+                array.ids[i - 1], array.ids[i] = array.ids[i], array.ids[i - 1]
                 array.color[i - 1], array.color[i] = array.color[i], array.color[i - 1]
 
                 next_debug = get_debug(i=index, j=i - 1, cur=array.values[i - 1], prev=array.values[i - 2])
@@ -636,7 +639,7 @@ class TimeComplexity(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, UP, buff=0.4)
         self.add(array_mobj, a_text, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for i in range(1, len(a)):
                     j = i
@@ -777,7 +780,7 @@ class Conclusion(Scene):
         indices_mobj = indices.get_mobject().center().next_to(array_mobj, UP, buff=0.4)
         self.add(array_mobj, a_text, indices_mobj)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for i in range(1, len(a)):
                     j = i
@@ -792,8 +795,7 @@ class Conclusion(Scene):
             style='monokai',
         ).next_to(array_mobj, DOWN, buff=0.8).shift(0.5 * RIGHT).code
 
-        for line in code.chars:
-            self.play(AddTextLetterByLetter(line, run_time=0.05 * len(line)))
+        self.play(TypeCode(code.chars, time_per_char=0.05))
         self.wait(1)
 
         self.play(ApplyWave(code, run_time=2))
@@ -2,6 +2,7 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import TypeCode, make_code
 from insertion_sort.array import Array, TransformMatchingCells
 
 ORANGE = ManimColor('#fa541c')
@@ -62,7 +63,7 @@ class UseCase(Scene):
         )
         self.play(Create(arrow3), Create(arrow9), run_time=0.5)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 for i in range(1, len(a)):
                     j = i
@@ -77,8 +78,7 @@ class UseCase(Scene):
             style='monokai',
         ).scale(0.6).center().shift(1.5 * DOWN).shift(0.2 * LEFT).code
 
-        for line in code.chars:
-            self.play(AddTextLetterByLetter(line, run_time=0.03 * len(line)))
+        self.play(TypeCode(code.chars, time_per_char=0.03))
         self.wait(2.5)
 
         # Write 3*n = O(n)
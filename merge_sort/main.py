@@ -5,18 +5,19 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import CodeCursor, TypeCode, make_code
+from common.glyphs import GlyphLabel
 from merge_sort.array import Array, TransformMatchingCells
 
 arr = [12, 3, 5, 9, 4, 1, 7]
 ORANGE = ManimColor('#fa541c')
-random.seed(42)
 
 
 class IntroductionBars(Scene):
     def construct(self):
         # Create vertical bars representing the array and sort them with insertion sort
         array = list(range(1, 65))
-        random.shuffle(array)
+        random.Random(42).shuffle(array)
 
         base = Rectangle(height=1, width=1, color=WHITE, fill_opacity=1).center().to_edge(DOWN).shift(UP)
         rectangles = [
@@ -181,7 +182,7 @@ class IntroductionSortingVisualized(Scene):
 
 class IntroductionImplementation(Scene):
     def construct(self):
-        code = Code(
+        code = make_code(
             code=dedent('''
                 def merge(a, b):
                     i, j, res = 0, 0, []
@@ -579,7 +580,7 @@ class MergeStepImplementation(Scene):
         )
         self.wait(2)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 i, j, res = 0, 0, []
                 while i < len(a) or j < len(b):
@@ -760,7 +761,7 @@ class SplitMergeImplementation(Scene):
         )
         self.play(Create(sorted_array_mobj), Create(pointer_to_sorted), run_time=1)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 def merge_sort(a):
                     if len(a) <= 1:
@@ -853,7 +854,7 @@ class SplitMergeImplementation(Scene):
         self.play(AddTextLetterByLetter(code.chars[6], run_time=0.1 * len(code.chars[6])))
         self.wait(3)
 
-        merge_code = Code(
+        merge_code = make_code(
             code=dedent('''
                 def merge(a, b):
                     i, j, res = 0, 0, []
@@ -880,9 +881,7 @@ class SplitMergeImplementation(Scene):
         self.play(code.animate.scale(1 / 0.75 * 0.7).align_to(merge_code, UP).shift(3.5 * RIGHT), run_time=1)
         self.wait(1)
 
-        for line in merge_code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line, run_time=0.02 * len(line)))
+        self.play(TypeCode(merge_code.chars, time_per_char=0.02))
         self.wait(2)
 
         # Transition to the next scene
@@ -903,7 +902,7 @@ class Simulation(Scene):
         array_mobj = array.get_mobject().center().shift(2.2 * UP)
         self.add(title, array_mobj)
 
-        merge_code = Code(
+        merge_code = make_code(
             code=dedent('''
                 def merge(a, b):
                     i, j, res = 0, 0, []
@@ -927,7 +926,7 @@ class Simulation(Scene):
         ).scale(0.7).center().shift(1.7 * DOWN).shift(3 * LEFT).code
         self.add(merge_code)
 
-        sort_code = Code(
+        sort_code = make_code(
             code=dedent('''
                 def merge_sort(a):
                     if len(a) <= 1:
@@ -961,13 +960,17 @@ class Simulation(Scene):
             max_tip_length_to_length_ratio=0.5, tip_length=0.2,
         ).scale(0.3).next_to(sort_code, LEFT).align_to(sort_code, UP)
 
+        # The arrows point at the lines that are being executed
+        merge_cursor = CodeCursor(merge_arrow, merge_code, shift=0.1 * DOWN)
+        sort_cursor = CodeCursor(sort_arrow, sort_code, shift=0.1 * DOWN)
+
         def merge_sort(a: Array, a_mobj: Mobject, run_time) -> tuple[Array, Mobject]:
-            sort_arrow.next_to(sort_code[0], LEFT)
+            sort_cursor.place(0, shift=ORIGIN)
             self.play(FadeIn(sort_arrow), run_time=run_time)
-            self.play(sort_arrow.animate.next_to(sort_code[1], LEFT).shift(0.1 * DOWN), run_time=run_time)
+            self.play(sort_cursor.move(1), run_time=run_time)
             self.wait(run_time)
             if len(a) <= 1:
-                self.play(sort_arrow.animate.next_to(sort_code[2], LEFT).shift(0.1 * DOWN), run_time=run_time)
+                self.play(sort_cursor.move(2), run_time=run_time)
                 self.wait(run_time)
                 self.play(FadeOut(sort_arrow), run_time=run_time)
                 return a, a_mobj
@@ -981,7 +984,7 @@ class Simulation(Scene):
                 max_tip_length_to_length_ratio=0.5, tip_length=0.15,
             )
             self.play(
-                sort_arrow.animate.next_to(sort_code[4], LEFT).shift(0.2 * DOWN),
+                sort_cursor.move(4, shift=0.2 * DOWN),
                 *[item.animate.set_color(ORANGE).scale(1.25) for item in a.labels[:len(a) // 2]],
                 *[item.animate.set_color(DARK_GRAY) for item in a.labels[len(a) // 2:]],
                 run_time=run_time,
@@ -999,7 +1002,7 @@ class Simulation(Scene):
                 color=ORANGE, buff=0.2, stroke_width=5, max_stroke_width_to_length_ratio=10,
                 max_tip_length_to_length_ratio=0.5, tip_length=0.15,
             )
-            sort_arrow.next_to(sort_code[5], LEFT).shift(0.1 * DOWN),
+            sort_cursor.place(5)
             self.play(
                 FadeIn(sort_arrow),
                 l_arrow.animate.set_color(DARK_GRAY),
@@ -1018,7 +1021,7 @@ class Simulation(Scene):
 
             # Merge the left and right into res by moving each number along the straight path from left/right to res cell
             # Hide all the labels of the current array + Reverse the arrows (make pointers direct in the opposite direction)
-            sort_arrow.next_to(sort_code[6], LEFT).shift(0.1 * DOWN),
+            sort_cursor.place(6)
             self.play(
                 FadeIn(sort_arrow),
                 *[item.animate.set_color(BLACK) for item in a.labels],
@@ -1029,9 +1032,9 @@ class Simulation(Scene):
             self.wait(run_time)
 
             # Merge the left and right parts into res
-            merge_arrow.next_to(merge_code[0], LEFT)
+            merge_cursor.place(0, shift=ORIGIN)
             self.play(FadeIn(merge_arrow), run_time=run_time)
-            self.play(merge_arrow.animate.next_to(merge_code[1], LEFT).shift(0.1 * DOWN), run_time=run_time)
+            self.play(merge_cursor.move(1), run_time=run_time)
             self.wait(run_time)
 
             # draw 2 arrows pointing to the first elements of the left and right arrays
@@ -1056,23 +1059,23 @@ class Simulation(Scene):
             )
             self.wait(run_time)
 
-            self.play(merge_arrow.animate.next_to(merge_code[2], LEFT).shift(0.1 * DOWN), run_time=run_time)
+            self.play(merge_cursor.move(2), run_time=run_time)
             self.wait(run_time)
 
             for i, val in enumerate(sorted(a.values)):
-                self.play(merge_arrow.animate.next_to(merge_code[3], LEFT).shift(0.1 * DOWN), run_time=run_time)
+                self.play(merge_cursor.move(3), run_time=run_time)
                 self.wait(run_time)
-                self.play(merge_arrow.animate.next_to(merge_code[4], LEFT).shift(0.1 * DOWN), run_time=run_time)
+                self.play(merge_cursor.move(4), run_time=run_time)
                 self.wait(run_time)
-                self.play(merge_arrow.animate.next_to(merge_code[6], LEFT).shift(0.2 * DOWN), run_time=run_time)
+                self.play(merge_cursor.move(6, shift=0.2 * DOWN), run_time=run_time)
                 self.wait(run_time)
                 if val in left.values:
                     index = left.values.index(val)
                     label = left.labels[index].copy()
-                    self.play(merge_arrow.animate.next_to(merge_code[7], LEFT).shift(0.1 * DOWN), run_time=run_time)
+                    self.play(merge_cursor.move(7), run_time=run_time)
                     self.play(label.animate.move_to(res.labels[i].set_color(WHITE)), run_time=run_time)
                     self.wait(run_time)
-                    self.play(merge_arrow.animate.next_to(merge_code[8], LEFT).shift(0.1 * DOWN), run_time=run_time)
+                    self.play(merge_cursor.move(8), run_time=run_time)
                     self.play(
                         left.labels[index].animate.set_color(WHITE).scale(1 / 1.25),
                         left_pointer.animate.shift((left.width + left.spacing) * RIGHT),
@@ -1085,10 +1088,10 @@ class Simulation(Scene):
                 else:
                     index = right.values.index(val)
                     label = right.labels[index].copy()
-                    self.play(merge_arrow.animate.next_to(merge_code[10], LEFT).shift(0.1 * DOWN), run_time=run_time)
+                    self.play(merge_cursor.move(10), run_time=run_time)
                     self.play(label.animate.move_to(res.labels[i]), run_time=run_time)
                     self.wait(run_time)
-                    self.play(merge_arrow.animate.next_to(merge_code[11], LEFT).shift(0.1 * DOWN), run_time=run_time)
+                    self.play(merge_cursor.move(11), run_time=run_time)
                     self.play(
                         right.labels[index].animate.set_color(WHITE).scale(1 / 1.25),
                         right_pointer.animate.shift((right.width + right.spacing) * RIGHT),
@@ -1099,7 +1102,7 @@ class Simulation(Scene):
                     self.add(res.labels[i].set_z_index(1000000), res.rectangles[i])
                     self.wait(run_time)
 
-            self.play(merge_arrow.animate.next_to(merge_code[12], LEFT).shift(0.1 * DOWN), run_time=run_time)
+            self.play(merge_cursor.move(12), run_time=run_time)
             self.wait(run_time)
             self.remove(l_mobj, r_mobj)
             self.play(FadeOut(left_mobj, right_mobj, l_arrow, r_arrow, merge_arrow, left_pointer, right_pointer), run_time=run_time)
@@ -1118,7 +1121,7 @@ class ComplexityAnalysis(Scene):
         array_mobj = array.get_mobject().center().shift(2.2 * UP).shift(2.8 * RIGHT).shift(0.3 * UP)
         self.add(title, array_mobj)
 
-        merge_code = Code(
+        merge_code = make_code(
             code=dedent('''
                 def merge(a, b):
                     i, j, res = 0, 0, []
@@ -1142,7 +1145,7 @@ class ComplexityAnalysis(Scene):
         ).scale(0.7).center().shift(1.7 * DOWN).shift(3 * LEFT).code
         self.add(merge_code)
 
-        sort_code = Code(
+        sort_code = make_code(
             code=dedent('''
                 def merge_sort(a):
                     if len(a) <= 1:
@@ -1332,7 +1335,7 @@ class ComplexityAnalysis(Scene):
         for mobj in all_mobjects:
             if isinstance(mobj, VGroup):
                 for item in mobj:
-                    if isinstance(item, Tex):
+                    if isinstance(item, (Tex, GlyphLabel)):
                         letter = string.ascii_lowercase[int(item.tex_string.lower())]
                         num2letters.append(item.animate.become(Tex(letter).scale(0.6), match_center=True))
         self.play(LaggedStart(*num2letters, lag_ratio=0.6, run_time=4))
@@ -1343,7 +1346,7 @@ class ComplexityAnalysis(Scene):
         for mobj in all_mobjects:
             if isinstance(mobj, VGroup):
                 for item in mobj:
-                    if isinstance(item, Tex):
+                    if isinstance(item, (Tex, GlyphLabel)):
                         letters2num.append(item.animate.become(Tex(item.tex_string).scale(0.6), match_center=True))
         self.play(LaggedStart(*letters2num, lag_ratio=0.6, run_time=4))
         self.wait(1)
@@ -1356,13 +1359,9 @@ class ComplexityAnalysis(Scene):
 
         # Re-implement the algorithm
         self.play(FadeOut(merge_code), run_time=0.5)
-        for line in merge_code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line, run_time=0.05 * len(line)))
+        self.play(TypeCode(merge_code.chars, time_per_char=0.05))
         self.wait(1)
 
         self.play(FadeOut(sort_code), run_time=1)
-        for line in sort_code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line, run_time=0.05 * len(line)))
+        self.play(TypeCode(sort_code.chars, time_per_char=0.05))
         self.wait(1)
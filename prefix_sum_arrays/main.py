@@ -2,13 +2,15 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import TypeCode, make_code
+from common.svg import load_svg
 from prefix_sum_arrays.array import Array
 
 
 class UploadToYoutube(Scene):
     def construct(self):
         # Add the Youtube logo
-        logo = SVGMobject('prefix_sum_arrays/youtube-icon.svg')
+        logo = load_svg('prefix_sum_arrays/youtube-icon.svg')
         logo.scale(0.5)
         # Add text "Uploading..."
         text = Text('Uploading...')
@@ -45,7 +47,7 @@ class UploadToYoutube(Scene):
         self.play(progress.animate.set_value(6), run_time=2)
 
         # Move the logo to the top and turn the progress bar to a green tick
-        tick = SVGMobject('prefix_sum_arrays/tick.svg', color=GREEN, fill_color=GREEN, fill_opacity=1).scale(0.5)
+        tick = load_svg('prefix_sum_arrays/tick.svg', color=GREEN, fill_color=GREEN, fill_opacity=1).scale(0.5)
         tick.align_to(bar, DOWN)
         self.remove(bar, progress, text)
         self.play(
@@ -69,7 +71,7 @@ class UploadToYoutube(Scene):
 
 class FillInitialArray(Scene):
     def construct(self):
-        logo = SVGMobject('prefix_sum_arrays/youtube-icon.svg').scale(0.5).move_to(2.5 * UP)
+        logo = load_svg('prefix_sum_arrays/youtube-icon.svg').scale(0.5).move_to(2.5 * UP)
 
         # Add the array
         array = Array([None] * 9, width=0.8, height=0.8, spacing=0.05, scale_text=0.8)
@@ -86,7 +88,7 @@ class FillInitialArray(Scene):
         self.add(logo, text, indices, array_mobj)
 
         def get_reactions(nb_likes: int, nb_dislikes: int):
-            like_svg = SVGMobject(
+            like_svg = load_svg(
                 'prefix_sum_arrays/dislike.svg', color=WHITE, fill_color=WHITE, fill_opacity=1
             ).scale(0.5).rotate(PI).shift(LEFT).shift(2 * DOWN)
             like_text = Text(
@@ -94,7 +96,7 @@ class FillInitialArray(Scene):
             ).scale(0.7).align_to(like_svg, RIGHT).shift(0.35 * LEFT).align_to(like_svg, UP).shift(0.5 * DOWN)
             like = VGroup(like_svg, like_text)
 
-            dislike_svg = SVGMobject(
+            dislike_svg = load_svg(
                 'prefix_sum_arrays/dislike.svg', color=WHITE, fill_color=WHITE, fill_opacity=1
             ).scale(0.5).shift(RIGHT).shift(2.35 * DOWN)
             dislike_text = Text(
@@ -458,8 +460,7 @@ class PrefixSumCalculation(Scene):
                 p.values[x] = values[x]
             else:
                 p.values[x] = p.values[x - 1] + values[x]
-                p.stroke_color[x - 1] = YELLOW
-                p.stroke_width[x - 1] = 5
+                p.highlight(x - 1, x - 1, color=YELLOW, width=5)
             array_mobj.become(array.get_mobject().center().move_to(1.2 * UP))
             p_mobj.become(p.get_mobject().center().next_to(array_mobj, DOWN))
 
@@ -517,7 +518,7 @@ class PrefixSumCode(Scene):
         self.add(text, indices, array_mobj, array_name, p_mobj, p_name)
         self.wait()
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 p = [0] * n
                 p[0] = a[0]
@@ -653,23 +654,27 @@ class AnsweringRangeQueries(Scene):
         self.play(Write(zero))
         self.wait(12)
 
-        # Add 0 at the beginning of p
-        p.values.insert(0, 0)
-        p.unhighlight()
-        p.highlight(2, 2, color=YELLOW_A, width=5)
-        p.highlight(8, 8, color=YELLOW, width=5)
-        new_p_mobj = p.get_mobject().next_to(array_mobj, DOWN).align_to(array_mobj, LEFT)
+        # Add 0 at the beginning of p (the cells of an Array are built once => p with one more cell is a new Array)
+        new_p = Array(
+            [0] + p.values,
+            width=p.width, height=p.height,
+            spacing=p.spacing, scale_text=p.scale_text
+        )
+        new_p.highlight(2, 2, color=YELLOW_A, width=5)
+        new_p.highlight(8, 8, color=YELLOW, width=5)
+        new_p_mobj = new_p.get_mobject().next_to(array_mobj, DOWN).align_to(array_mobj, LEFT)
         new_indices = Array(
-            [i for i in range(len(p))],
+            [i for i in range(len(new_p))],
             width=p.width, height=p.height,
             spacing=p.spacing, scale_text=p.scale_text, stroke_color=BLACK,
         ).get_mobject().next_to(new_p_mobj, 0.0001 * DOWN)
 
         self.play(
-            p_mobj.animate.become(new_p_mobj),
-            indices.animate.become(new_indices),
+            ReplacementTransform(p_mobj, new_p_mobj),
+            ReplacementTransform(indices, new_indices),
             run_time=2
         )
+        p, p_mobj, indices = new_p, new_p_mobj, new_indices
         self.wait(10)
 
         # Update the formula
@@ -722,7 +727,7 @@ class NewCode(Scene):
         self.add(text, indices, array_mobj, array_name, p_mobj, p_name)
         self.wait()
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 p = [0] * (n + 1)
                 for i in range(1, n + 1):
@@ -734,8 +739,7 @@ class NewCode(Scene):
             font='Monospace',
             style='monokai',
         ).next_to(indices, DOWN).code
-        for line in code.chars:
-            self.play(AddTextLetterByLetter(line))
+        self.play(TypeCode(code.chars))
         self.wait(12)
 
         # The algorithm in action
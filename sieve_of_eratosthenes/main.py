@@ -1,8 +1,10 @@
+from math import isqrt
 from textwrap import dedent
 
 from manim import *
 
-from sieve_of_eratosthenes.numbers import NumberGrid
+from common.code import TypeCode, UntypeCode, make_code
+from sieve_of_eratosthenes.numbers import NumberGrid, VirtualNumberGrid
 
 primes = {
     2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97,
@@ -89,8 +91,7 @@ class NaiveApproach(Scene):
 
         # Draw the number grid
         grid = NumberGrid(100, values_per_row=20)
-        grid.highlight(0, color=DARKER_GREY)
-        grid.highlight(1, color=DARKER_GREY)
+        grid.highlight_many([0, 1], color=DARKER_GREY)
         grid_mob = grid.get_mobject().center().next_to(title, DOWN).shift(0.5 * DOWN)
         self.play(Create(grid_mob), run_time=5)
         self.wait(2)
@@ -205,8 +206,7 @@ class NaiveApproach(Scene):
 
         # Replace the grid with 200 numbers
         grid = NumberGrid(200, values_per_row=20)
-        grid.highlight(0, color=DARKER_GREY)
-        grid.highlight(1, color=DARKER_GREY)
+        grid.highlight_many([0, 1], color=DARKER_GREY)
         self.play(
             Create(grid.get_mobject().center().next_to(new_title, DOWN).shift(0.5 * DOWN)),
             run_time=3,
@@ -221,29 +221,29 @@ class SieveOfEratosthenes(Scene):
 
         # Draw the number grid
         grid = NumberGrid(200, values_per_row=20)
-        grid.highlight(0, color=DARKER_GREY)
-        grid.highlight(1, color=DARKER_GREY)
+        grid.highlight_many([0, 1], color=DARKER_GREY)
         grid_mob = grid.get_mobject().center().next_to(title, DOWN).shift(0.5 * DOWN)
         self.add(grid_mob)
         self.wait(4)
 
         # Highlight all the numbers
-        for i in range(2, 200):
-            grid.highlight(i, color=YELLOW)
+        grid.highlight_many(range(2, 200), color=YELLOW)
         self.wait(3)
 
         # Un-highlight all the numbers
-        for i in range(2, 200):
-            grid.highlight(i, color=WHITE)
+        grid.highlight_many(range(2, 200), color=WHITE)
         self.wait(2)
 
         def mark_prime(n: int, wait_ms: float):
             grid.highlight(n, color=GREEN)
             self.wait(wait_ms * 10 if n <= 6 else wait_ms)
             for mul in range(2 * n, 200, n):
+                if mul >= 100 and n < 5:
+                    # Nothing is shown in between => mark the remaining multiples at once
+                    grid.highlight_many(range(mul, 200, n), color=DARKER_GREY)
+                    break
                 grid.highlight(mul, color=YELLOW)
-                if mul < 100 or n >= 5:
-                    self.wait(2 * wait_ms if mul < 15 else wait_ms)
+                self.wait(2 * wait_ms if mul < 15 else wait_ms)
                 grid.highlight(mul, color=DARKER_GREY)
                 if mul < 15:
                     self.wait(2 * wait_ms)
@@ -264,10 +264,11 @@ class SieveOfEratosthenes(Scene):
             grid.highlight(i, color=GREEN if i in primes else DARKER_GREY)
             self.wait(0.07)
 
-        for i in range(25, 200):
+        for i in range(25, 50):
             grid.highlight(i, color=GREEN if i in primes else DARKER_GREY)
-            if i < 50:
-                self.wait(0.07)
+            self.wait(0.07)
+        grid.highlight_many([i for i in range(50, 200) if i in primes], color=GREEN)
+        grid.highlight_many([i for i in range(50, 200) if i not in primes], color=DARKER_GREY)
 
         # Highlight 7 and its multiples
         grid.highlight(7, color=RED)
@@ -347,11 +348,9 @@ class SieveOfEratosthenes(Scene):
         self.wait(4)
 
         # Highlight 14, 21, 28, 35, 42 to show all the redundant operations
-        for i in range(14, 49, 7):
-            grid.highlight(i, color=YELLOW)
+        grid.highlight_many(range(14, 49, 7), color=YELLOW)
         self.wait(3)
-        for i in range(14, 49, 7):
-            grid.highlight(i, color=DARKER_GREY)
+        grid.highlight_many(range(14, 49, 7), color=DARKER_GREY)
         self.wait(0.5)
 
         for i in range(2, 200):
@@ -387,7 +386,7 @@ class Implementation(Scene):
         self.wait(2)
 
         # Code for the Sieve of Eratosthenes
-        code = Code(
+        code = make_code(
             code=dedent('''
                 prime = [True] * n
                 prime[0] = prime[1] = False
@@ -423,8 +422,7 @@ class Implementation(Scene):
 
         # Highlight the 2nd line of the code + Make 0 and 1 transparent
         self.play(arrow.animate.shift(0.35 * DOWN))
-        grid.highlight(0, color=DARKER_GREY)
-        grid.highlight(1, color=DARKER_GREY)
+        grid.highlight_many([0, 1], color=DARKER_GREY)
         self.wait(5)
 
         # Move arrow to `for p...`
@@ -484,7 +482,7 @@ class Implementation(Scene):
         self.wait(3)
 
         # New Code for the Sieve of Eratosthenes
-        new_code = Code(
+        new_code = make_code(
             code=dedent('''
                         prime = [True] * n
                         prime[0] = prime[1] = False
@@ -511,17 +509,12 @@ class Implementation(Scene):
         self.wait(6)
 
         # Highlight the prime numbers
-        for i in range(2, 100):
-            if i in primes:
-                grid.highlight(i, color=YELLOW)
-            else:
-                grid.highlight(i, color=DARKER_GREY)
+        grid.highlight_many([i for i in range(2, 100) if i in primes], color=YELLOW)
+        grid.highlight_many([i for i in range(2, 100) if i not in primes], color=DARKER_GREY)
         self.wait(3)
 
         # Bring back the colors
-        for i in range(2, 100):
-            if i in primes:
-                grid.highlight(i, color=GREEN)
+        grid.highlight_many([i for i in range(2, 100) if i in primes], color=GREEN)
         self.wait(1)
 
 
@@ -533,15 +526,12 @@ class TimeMemoryComplexity(Scene):
         # Draw the number grid
         grid = NumberGrid(100, values_per_row=20)
         grid_mob = grid.get_mobject().center().next_to(title, DOWN).shift(0.5 * DOWN)
-        for i in range(100):
-            if i in primes:
-                grid.highlight(i, color=GREEN)
-            else:
-                grid.highlight(i, DARKER_GREY)
+        grid.highlight_many([i for i in range(100) if i in primes], color=GREEN)
+        grid.highlight_many([i for i in range(100) if i not in primes], color=DARKER_GREY)
         self.add(grid_mob)
 
         # Add the code
-        code = Code(
+        code = make_code(
             code=dedent('''
                         prime = [True] * n
                         prime[0] = prime[1] = False
@@ -579,11 +569,39 @@ class TimeMemoryComplexity(Scene):
         self.wait(15)
 
         # Practice (Remove the code and write it again)
-        for line in code.chars[::-1]:
-            if line:
-                self.play(RemoveTextLetterByLetter(line), run_time=0.02 * len(line))
-        for line in code.chars:
-            if line:
-                self.play(AddTextLetterByLetter(line), run_time=0.08 * len(line))
+        self.play(UntypeCode(code.chars, time_per_char=0.02))
+        self.play(TypeCode(code.chars, time_per_char=0.08))
 
         self.wait(7.5)
+
+
+class SieveAtScale(MovingCameraScene):
+    def construct(self):
+        n = 10_000
+        title = Title('Sieve of Eratosthenes', include_underline=False)
+        self.add(title)
+
+        # Only the rows under the camera are built => 17 rows of mobjects for 500 rows of numbers
+        frame = self.camera.frame
+        grid = VirtualNumberGrid(n, values_per_row=20, visible_rows=17)
+        grid.highlight_many([0, 1], color=DARKER_GREY)
+        grid_mob = grid.follow(frame).next_to(title, DOWN).shift(0.5 * DOWN)
+        self.add(grid_mob)
+        self.wait(2)
+
+        # Cross out the multiples of every prime up to sqrt(n) (the rows below the frame get their colors once in view)
+        is_prime = np.ones(n, dtype=bool)
+        is_prime[:2] = False
+        for p in range(2, isqrt(n) + 1):
+            if is_prime[p]:
+                is_prime[p * p::p] = False
+                grid.highlight(p, color=GREEN)
+                grid.highlight_many(np.arange(p * p, n, p), color=DARKER_GREY)
+                self.wait(0.3)
+
+        # Everything left is prime => scroll through the whole grid
+        grid.highlight_many(is_prime, color=GREEN)
+        self.wait(1)
+        grid_bottom = grid_mob.get_top()[1] - len(grid) * (grid.height + grid.spacing) + grid.spacing
+        self.play(frame.animate.shift((frame.get_bottom()[1] - grid_bottom) * DOWN), run_time=30, rate_func=smooth)
+        self.wait(2)
@@ -1,7 +1,12 @@
 from dataclasses import dataclass, field
 
+import numpy as np
 from manim import *
 
+from common.cells import RestyleCells, broadcast_colors
+from common.glyphs import make_label
+from common.layout import grid_centers, move_points, place_copies
+
 
 @dataclass
 class NumberGrid:
@@ -23,20 +28,19 @@ class NumberGrid:
         if self.n % self.values_per_row:
             self.values.append(list(range(self.values_per_row * len(self.values), self.n)))
 
+        # RGBA color of every number (the labels are recolored from it)
+        self.label_colors: np.ndarray = broadcast_colors(self.color, self.n)
+
     def get_rectangles(self) -> list[VMobject]:
-        self.rectangles = []
-        for i, row in enumerate(self.values):
-            for j, value in enumerate(row):
-                rectangle = Rectangle(
-                    height=self.height,
-                    width=self.width,
-                    fill_color=self.fill_color,
-                    fill_opacity=self.fill_opacity,
-                    stroke_width=0,
-                )
-                rectangle.shift(i * (self.height + self.spacing) * DOWN)
-                rectangle.shift(j * (self.width + self.spacing) * RIGHT)
-                self.rectangles.append(rectangle)
+        template = Rectangle(
+            height=self.height,
+            width=self.width,
+            fill_color=self.fill_color,
+            fill_opacity=self.fill_opacity,
+            stroke_width=0,
+        )
+        centers = grid_centers(len(self.values), self.values_per_row, self.height, self.width, self.spacing)
+        self.rectangles = place_copies(template, centers[:self.n])
         return self.rectangles
 
     def get_labels(self) -> list[VMobject]:
@@ -44,12 +48,12 @@ class NumberGrid:
         self.labels = []
         for i, row in enumerate(self.values):
             for j, value in enumerate(row):
-                label = Tex(
+                label = make_label(
                     str(value) if value is not None else '',
-                    color=self.color[i * len(row) + j] if isinstance(self.color, list) else self.color,
+                    color=ManimColor.from_rgba(self.label_colors[value]),
                 )
                 label.scale(self.scale_text)
-                label.move_to(rectangles[i * len(row) + j])
+                label.move_to(rectangles[value])
                 self.labels.append(label)
         return self.labels
 
@@ -63,19 +67,168 @@ class NumberGrid:
     def get_mobject(self) -> VMobject:
         return VGroup(*self.get_mobjects())
 
+    def get_labels_of(self, indices: np.ndarray) -> list[VMobject]:
+        """ Label mobjects that display the given numbers. """
+        return [self.labels[i] for i in indices]
+
     def highlight(self, index: int, color: ManimColor):
+        self.highlight_many(index, color)
+
+    def highlight_many(
+        self,
+        indices: int | list[int] | range | np.ndarray,
+        color: ManimColor,
+        animate: bool = False,
+    ) -> Animation | None:
+        """
+        Recolor several numbers in one pass.
+        :param indices: Indices of the numbers or a boolean mask of length n
+        :param color: New color of the numbers
+        :param animate: Return a single animation of the recoloring instead of applying it right away
+        """
         if not self.rectangles:
             self.get_rectangles()
         if not self.labels:
             self.get_labels()
 
-        # Make sure we work with a list of colors
-        if not isinstance(self.color, list):
-            self.color = [self.color] * self.n
+        indices = np.atleast_1d(np.asarray(indices))
+        indices = np.flatnonzero(indices) if indices.dtype == bool else indices.astype(int)
 
-        # Modify the label mobject by changing the color
-        self.labels[index].set_color(color)
-        self.color[index] = color
+        # Only the numbers whose color actually changes are touched
+        rgba = ManimColor(color).to_rgba()
+        indices = indices[(self.label_colors[indices] != rgba).any(axis=1)]
+        self.label_colors[indices] = rgba
+
+        labels = self.get_labels_of(indices)
+        if animate:
+            return RestyleCells(labels, color=color, fill=True)
+        VGroup(*labels).set_color(color)
+        return None
 
     def __len__(self):
         return len(self.values)
+
+
+@dataclass
+class VirtualNumberGrid(NumberGrid):
+    """
+    A NumberGrid for large n. Mobjects exist only for the `visible_rows` rows shown on screen, everything else is
+    kept in `label_colors`. When the view scrolls, the rows that leave the view are moved to the other side and
+    re-labeled with the numbers that come into view.
+    """
+    visible_rows: int | None = None     # Defaults to the number of rows that fit into the frame
+    first_row: int = 0                  # First row of numbers that is currently shown
+
+    def __post_init__(self):
+        self.nb_rows = -(-self.n // self.values_per_row)
+        if self.visible_rows is None:
+            self.visible_rows = int(config.frame_height // (self.height + self.spacing))
+        self.visible_rows = min(self.visible_rows, self.nb_rows)
+        self.label_colors: np.ndarray = broadcast_colors(self.color, self.n)
+
+    def get_row_numbers(self, row: int) -> range:
+        return range(row * self.values_per_row, (row + 1) * self.values_per_row)
+
+    def make_number_label(self, value: int, rectangle: VMobject) -> VMobject:
+        # The last row might not be full => cells after n stay empty
+        label = make_label(
+            str(value) if value < self.n else '',
+            color=ManimColor.from_rgba(self.label_colors[min(value, self.n - 1)]),
+        )
+        label.scale(self.scale_text)
+        label.move_to(rectangle)
+        return label
+
+    def get_rectangles(self) -> list[VMobject]:
+        template = Rectangle(
+            height=self.height,
+            width=self.width,
+            fill_color=self.fill_color,
+            fill_opacity=self.fill_opacity,
+            stroke_width=0,
+        )
+        centers = grid_centers(self.visible_rows, self.values_per_row, self.height, self.width, self.spacing)
+        self.rectangles = place_copies(template, centers)
+        return self.rectangles
+
+    def get_labels(self) -> list[VMobject]:
+        rectangles = self.get_rectangles() if not self.rectangles else self.rectangles
+        self.labels = [
+            self.make_number_label(value, rectangles[slot])
+            for slot, value in enumerate(range(
+                self.first_row * self.values_per_row,
+                (self.first_row + self.visible_rows) * self.values_per_row,
+            ))
+        ]
+        return self.labels
+
+    def get_labels_of(self, indices: np.ndarray) -> list[VMobject]:
+        slots = indices - self.first_row * self.values_per_row
+        return [self.labels[slot] for slot in slots[(slots >= 0) & (slots < len(self.labels))]]
+
+    def scroll_to(self, first_row: int, move_window: bool = False):
+        """
+        Show the rows starting from `first_row`.
+        The rows that stay visible are moved up/down, only the ones that come into view are re-labeled.
+        With `move_window`, the rows that stay visible keep their place and the recycled ones go to the other end
+        instead => the rows are where they would be in the full grid and the window moves over it.
+        """
+        first_row = max(0, min(first_row, self.nb_rows - self.visible_rows))
+        shift = first_row - self.first_row
+        if shift == 0:
+            return self
+        if not self.labels:
+            self.first_row = first_row
+            return self
+
+        rows = [
+            (self.rectangles[r * self.values_per_row: (r + 1) * self.values_per_row],
+             self.labels[r * self.values_per_row: (r + 1) * self.values_per_row])
+            for r in range(self.visible_rows)
+        ]
+        new_rows = [None] * self.visible_rows
+        for r, (rectangles, labels) in enumerate(rows):
+            slot = (r - shift) % self.visible_rows
+            for mobject in rectangles + labels:
+                move_points(mobject, (slot - r + (shift if move_window else 0)) * (self.height + self.spacing) * DOWN)
+            new_rows[slot] = rectangles, labels
+
+            # The row wrapped around => recycle it for the numbers that come into view
+            if slot != r - shift:
+                for label, rectangle, value in zip(labels, rectangles, self.get_row_numbers(first_row + slot)):
+                    label.become(self.make_number_label(value, rectangle))
+
+        self.rectangles = [rectangle for rectangles, _ in new_rows for rectangle in rectangles]
+        self.labels = [label for _, labels in new_rows for label in labels]
+        self.first_row = first_row
+        return self
+
+    def scroll_to_number(self, index: int):
+        """ Scroll the minimal amount of rows so that the number at `index` is visible. """
+        row = index // self.values_per_row
+        if row < self.first_row:
+            return self.scroll_to(row)
+        if row >= self.first_row + self.visible_rows:
+            return self.scroll_to(row - self.visible_rows + 1)
+        return self
+
+    def scroll_with(self, frame: Mobject):
+        """ Show the rows under the frame (the rows are laid out as in the full grid, see `follow`). """
+        pitch = self.height + self.spacing
+        top = self.rectangles[0].get_top()[1] + self.first_row * pitch  # Top of the first row of the full grid
+        return self.scroll_to(int((top - frame.get_top()[1]) // pitch), move_window=True)
+
+    def follow(self, frame: Mobject) -> VMobject:
+        """
+        The grid mobject with an updater that keeps the rows under the frame built while it moves (e.g. the
+        `camera.frame` of a MovingCameraScene). The window needs one row more than the frame covers.
+        """
+        needed = min(int(np.ceil(frame.height / (self.height + self.spacing))) + 1, self.nb_rows)
+        if self.visible_rows < needed:
+            raise ValueError(f'The frame needs {needed} visible rows, the grid only has {self.visible_rows}')
+        grid = self.get_mobject()
+        grid.add_updater(lambda _: self.scroll_with(frame))
+        return grid
+
+    def __len__(self):
+        return self.nb_rows
@@ -2,6 +2,7 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import make_code
 from sieve_of_eratosthenes.numbers import NumberGrid
 
 
@@ -108,7 +109,7 @@ class SieveOfEratosthenesImplementation(Scene):
         self.wait(2)
 
         # Code for the Sieve of Eratosthenes
-        code = Code(
+        code = make_code(
             code=dedent('''
                 prime = [True] * n
                 prime[0] = prime[1] = False
@@ -2,6 +2,7 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import TypeCode, make_code
 from sliding_window.array import Array
 
 a = [8, 3, -2, 4, 5, -1, 0, 5, 3, 9, -6]
@@ -26,7 +27,7 @@ class OpeningScene(Scene):
         sum_text = Tex(sum(a[0: k]), color=RED).scale(0.8).next_to(brace, DOWN, buff=0.2)
         array.highlight(0, k - 1, color=RED)
         self.play(
-            array_mobj.animate.become(array.get_mobject(), match_center=True),
+            array.restyle(),
             GrowFromCenter(brace),
             Write(sum_text),
             run_time=0.5,
@@ -42,7 +43,7 @@ class OpeningScene(Scene):
                 additional_mobj = VGroup()
 
             self.play(
-                array_mobj.animate.become(array.get_mobject(), match_center=True),
+                array.restyle(),
                 brace.animate.become(
                     Brace(array_mobj, DOWN, stroke_width=len(array) / max(end - start + 1, 2), color=RED)
                     .scale((end - start + 1) / len(array))
@@ -102,13 +103,13 @@ class OpeningScene(Scene):
                 array.highlight(i, i, color=YELLOW, width=8.)
                 if i - 1 >= end - k:
                     array.highlight(i - 1, i - 1, color=RED)
-                array_mobj.become(array.get_mobject(), match_center=True)
+                array.refresh()
                 if formula is not None:
                     self.play(formula[2 + 2 * (i - end + k)].animate.set_color(YELLOW), run_time=0.1)
                     self.play(formula[3 + 2 * (i - end + k)].animate.set_color(YELLOW), run_time=0.1)
                 self.wait(0.2)
             array.highlight(end - 1, end - 1, color=RED)
-            array_mobj.become(array.get_mobject(), match_center=True)
+            array.refresh()
             if formula is not None:
                 self.play(formula[11].animate.set_color(YELLOW), run_time=0.1)
                 self.play(formula[12].animate.set_color(YELLOW), run_time=0.1)
@@ -124,7 +125,7 @@ class OpeningScene(Scene):
         array.unhighlight()
         self.play(
             FadeOut(complexity, arrow, brace, sum_text),
-            array_mobj.animate.become(array.get_mobject(), match_center=True),
+            array.restyle(),
         )
         self.wait(3)
 
@@ -166,7 +167,7 @@ class SlidingWindowDiscovery(Scene):
                 additional_mobj = VGroup()
 
             self.play(
-                array_mobj.animate.become(array.get_mobject(), match_center=True),
+                array.restyle(),
                 brace.animate.become(
                     Brace(array_mobj, DOWN, stroke_width=len(array) / max(end - start + 1, 2), color=RED)
                     .scale((end - start + 1) / len(array))
@@ -188,9 +189,9 @@ class SlidingWindowDiscovery(Scene):
                 array.highlight(i, i, color=YELLOW, width=8.)
                 if i - 1 >= end - k:
                     array.highlight(i - 1, i - 1, color=RED)
-                self.play(array_mobj.animate.become(array.get_mobject(), match_center=True), run_time=0.3)
+                self.play(array.restyle(), run_time=0.3)
             array.highlight(end - 1, end - 1, color=RED)
-            self.play(array_mobj.animate.become(array.get_mobject(), match_center=True), run_time=0.3)
+            self.play(array.restyle(), run_time=0.3)
             self.wait(1.5)
             highlight(start=end - k + 1, additional_mobj=arrow, shift=(array.width + array.spacing) * RIGHT)
 
@@ -199,18 +200,18 @@ class SlidingWindowDiscovery(Scene):
         for i in range(5):
             array.highlight(k + 2, k + 2, color=RED, width=8.)
             array.highlight(2, 2, color=REMOVED_COLOR, width=2.)
-            self.play(array_mobj.animate.become(array.get_mobject(), match_center=True), run_time=0.4)
+            self.play(array.restyle(), run_time=0.4)
             array.highlight(k + 2, k + 2, color=WHITE, width=2.)
             array.highlight(2, 2, color=RED, width=8.)
-            self.play(array_mobj.animate.become(array.get_mobject(), match_center=True), run_time=0.4)
+            self.play(array.restyle(), run_time=0.4)
 
         highlight(start=3)
         self.wait(4)
         array.highlight(2, 2, color=YELLOW, width=8.)
-        self.play(array_mobj.animate.become(array.get_mobject(), match_center=True), run_time=0.3)
+        self.play(array.restyle(), run_time=0.3)
         self.wait(2)
         array.highlight(k + 2, k + 2, color=GREEN, width=8.)
-        self.play(array_mobj.animate.become(array.get_mobject(), match_center=True), run_time=0.3)
+        self.play(array.restyle(), run_time=0.3)
         self.wait(4)
 
         # Move back to start
@@ -239,7 +240,7 @@ class SlidingWindowDiscovery(Scene):
         self.wait(6)
 
         # Code for the sliding window
-        code = Code(
+        code = make_code(
             code=dedent('''
                 cur = best = sum(a[:k])
                 for r in range(k, len(a)):
@@ -388,7 +389,7 @@ class DynamicSizeSlidingWindow(Scene):
         self.wait(1)
 
         # Code for the sliding window
-        code = Code(
+        code = make_code(
             code=dedent('''
                 l, cur, best = -1, 0, 0
                 for r in range(len(a)):
@@ -410,9 +411,7 @@ class DynamicSizeSlidingWindow(Scene):
         self.wait(2.5)
         self.play(AddTextLetterByLetter(code.chars[2]))
         self.wait(0.5)
-        self.play(AddTextLetterByLetter(code.chars[3]))
-        self.play(AddTextLetterByLetter(code.chars[4]))
-        self.play(AddTextLetterByLetter(code.chars[5]))
+        self.play(TypeCode(code.chars[3:6]))
         self.wait(2)
         self.play(AddTextLetterByLetter(code.chars[6]))
         self.wait(1)
@@ -2,6 +2,7 @@ from textwrap import dedent
 
 from manim import *
 
+from common.code import TypeCode, make_code
 from two_d_prefix_sum.matrix import Matrix
 
 a = [
@@ -36,29 +37,29 @@ class OpeningScene(Scene):
 
         # Highlight (1, 1) -> (5, 3)
         m.highlight(1, 1, 5, 3, color=RED, width=5)
-        m_mobj.become(m.get_mobject().center())
+        m.refresh()
         self.wait(0.8)
 
         # Highlight (3, 4) -> (5, 5)
         m.unhighlight()
         m.highlight(3, 4, 5, 5, color=YELLOW, width=5)
-        m_mobj.become(m.get_mobject().center())
+        m.refresh()
         self.wait(0.8)
 
         # Highlight (2, 2) -> (4, 6)
         m.unhighlight()
         m.highlight(2, 2, 4, 6, color=GREEN, width=5)
-        m_mobj.become(m.get_mobject().center())
+        m.refresh()
         self.wait(3)
 
         # Iterate over rows and columns and highlight each element
         for r in range(2, 5):
             for c in range(2, 7):
                 m.highlight(r, c, r, c, color=GREEN, width=10)
-                m_mobj.become(m.get_mobject().center())
+                m.refresh()
                 self.wait(0.3)
                 m.highlight(r, c, r, c, color=GREEN, width=5)
-                m_mobj.become(m.get_mobject().center())
+                m.refresh()
         self.wait(6)
 
         # Move m to the left and add an empty p matrix on the right
@@ -74,24 +75,24 @@ class OpeningScene(Scene):
         for i in range(len(a)):
             for j in range(len(a[0])):
                 pref.values[i][j] = p[i + 1][j + 1]
-                p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+                pref.refresh()
                 self.wait(0.1)
         self.wait()
 
         # Highlight (0, 0) -> (3, 4) in a => (3, 4) in p
         m.highlight(0, 0, 3, 4, color=RED, width=5)
-        m_mobj.become(m.get_mobject().center().shift(3 * LEFT))
+        m.refresh()
         pref.highlight(3, 4, 3, 4, color=RED, width=5)
-        p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+        pref.refresh()
         self.wait(7)
 
         # Transition to the next scene
         # Highlight only (2, 2) -> (4, 6) and nothing in p
         m.unhighlight()
         m.highlight(2, 2, 4, 6, color=GREEN, width=5)
-        m_mobj.become(m.get_mobject().center().shift(3 * LEFT))
+        m.refresh()
         pref.unhighlight()
-        p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+        pref.refresh()
         self.wait(5)
 
 
@@ -126,25 +127,25 @@ class PrefixSumFormula(Scene):
 
         # Highlight (0, 0) -> (4, 6) in a => (4, 6) in p
         m.highlight(0, 0, 4, 6, color=ORANGE, width=5)
-        m_mobj.become(m.get_mobject().center().shift(3 * LEFT))
+        m.refresh()
         pref.highlight(4, 6, 4, 6, color=ORANGE, width=5)
-        p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+        pref.refresh()
         self.play(example_equation[2].animate.set_color(ORANGE))
         self.wait(10)
 
         # Highlight (0, 0) -> (4, 1) in a => (4, 1) in p
         m.highlight(0, 0, 4, 1, color=YELLOW, width=5)
-        m_mobj.become(m.get_mobject().center().shift(3 * LEFT))
+        m.refresh()
         pref.highlight(4, 1, 4, 1, color=YELLOW, width=5)
-        p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+        pref.refresh()
         self.play(example_equation[3].animate.set_color(YELLOW), run_time=0.2)
         self.play(example_equation[4].animate.set_color(YELLOW))
 
         # Highlight (0, 0) -> (1, 6) in a => (1, 6) in p
         m.highlight(0, 0, 1, 6, color=YELLOW, width=5)
-        m_mobj.become(m.get_mobject().center().shift(3 * LEFT))
+        m.refresh()
         pref.highlight(1, 6, 1, 6, color=YELLOW, width=5)
-        p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+        pref.refresh()
         self.play(example_equation[5].animate.set_color(YELLOW), run_time=0.2)
         self.play(example_equation[6].animate.set_color(YELLOW))
         self.wait(6)
@@ -152,15 +153,15 @@ class PrefixSumFormula(Scene):
         # Flicker (0, 0) -> (1, 1) in a => (1, 1) in p
         for i in range(5):
             m.highlight(0, 0, 1, 1, color=YELLOW, width=5)
-            m_mobj.become(m.get_mobject().center().shift(3 * LEFT))
+            m.refresh()
             pref.highlight(1, 1, 1, 1, color=YELLOW, width=5)
-            p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+            pref.refresh()
             self.wait(0.5)
 
             m.highlight(0, 0, 1, 1, color=RED, width=5)
-            m_mobj.become(m.get_mobject().center().shift(3 * LEFT))
+            m.refresh()
             pref.highlight(1, 1, 1, 1, color=RED, width=5)
-            p_mobj.become(pref.get_mobject().center().shift(3 * RIGHT))
+            pref.refresh()
             self.wait(0.5)
 
         self.wait(1)
@@ -278,25 +279,25 @@ class PrefixSumCalculation(Scene):
             for j in range(1, len(pref_values[0])):
                 pref.unhighlight()
                 pref.highlight(i, j, i, j, color=YELLOW, width=5)
-                p_mobj.become(pref.get_mobject(), match_center=True)
+                pref.refresh()
                 self.wait(0.4 if i * len(pref_values[0]) + j < 10 else 0.2)
 
         pref.unhighlight()
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        pref.refresh()
         self.wait(1)
 
         # Highlight upper row and leftmost column
         pref.highlight(0, 0, 0, len(pref_values[0]) - 1, color=YELLOW, width=5)
         pref.highlight(0, 0, len(pref_values) - 1, 0, color=YELLOW, width=5)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        pref.refresh()
         self.wait(5)
 
         pref.unhighlight()
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        pref.refresh()
         self.wait(1)
 
         # Code for the prefix sum
-        code = Code(
+        code = make_code(
             code=dedent('''
                 p = [[0] * (cols + 1) for _ in range(rows + 1)]
                 for r in range(1, rows + 1):
@@ -310,42 +311,40 @@ class PrefixSumCalculation(Scene):
             font='Monospace',
             style='monokai',
         ).scale(0.8).next_to(p_mobj, DOWN).align_to(matrix_name, LEFT).code
-        for line in code.chars[:-2]:
-            self.play(AddTextLetterByLetter(line), run_time=0.08 * len(line))
+        self.play(TypeCode(code.chars[:-2], time_per_char=0.08))
         self.wait(4)
 
         # Highlight (3, 4) in prefix sum
         pref.highlight(3, 4, 3, 4, color=ORANGE, width=5)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        pref.refresh()
         self.wait(8)
 
         # Highlight (0, 0) -> (1, 3) in matrix => (2, 4) in prefix sum with YELLOW
         m.highlight(0, 0, 1, 3, color=YELLOW, width=5)
         pref.highlight(2, 4, 2, 4, color=YELLOW, width=5)
-        m_mobj.become(m.get_mobject(), match_center=True)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        m.refresh()
+        pref.refresh()
         self.wait(2)
 
         # Highlight (0, 0) -> (2, 2) in matrix => (3, 3) in prefix sum with YELLOW
         m.highlight(0, 0, 2, 2, color=YELLOW, width=5)
         pref.highlight(3, 3, 3, 3, color=YELLOW, width=5)
-        m_mobj.become(m.get_mobject(), match_center=True)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        m.refresh()
+        pref.refresh()
         self.wait(3)
 
         # Highlight (0, 0) -> (1, 2) in matrix => (2, 3) in prefix sum with RED
         m.highlight(0, 0, 1, 2, color=RED, width=5)
         pref.highlight(2, 3, 2, 3, color=RED, width=5)
-        m_mobj.become(m.get_mobject(), match_center=True)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        m.refresh()
+        pref.refresh()
         self.wait(2)
 
         # Highlight (2, 3) in matrix with ORANGE
         m.highlight(2, 3, 2, 3, color=ORANGE, width=5)
-        m_mobj.become(m.get_mobject(), match_center=True)
+        m.refresh()
 
-        for line in code.chars[-2:]:
-            self.play(AddTextLetterByLetter(line), run_time=0.08 * len(line))
+        self.play(TypeCode(code.chars[-2:], time_per_char=0.08))
         self.wait(6)
 
 
@@ -367,7 +366,7 @@ class Examples(Scene):
         p_name = Text('p').scale(0.6).move_to(p_mobj, LEFT).shift(0.3 * LEFT)
         self.add(matrix_name, p_name)
 
-        code = Code(
+        code = make_code(
             code=dedent('''
                 p = [[0] * (cols + 1) for _ in range(rows + 1)]
                 for r in range(1, rows + 1):
@@ -384,38 +383,38 @@ class Examples(Scene):
         self.wait(4)
 
         pref = Matrix([[0] * len(p[0]) for _ in range(len(p))])
+        new_p_mobj = pref.get_mobject().move_to(p_mobj)
         self.play(
-            p_mobj.animate.become(pref.get_mobject(), match_center=True),
+            ReplacementTransform(p_mobj, new_p_mobj),
             AddTextLetterByLetter(code.chars[0], run_time=0.05 * len(code.chars[0])),
         )
+        p_mobj = new_p_mobj
         self.wait(2)
 
-        self.play(AddTextLetterByLetter(code.chars[1]), run_time=0.05 * len(code.chars[1]))
-        self.play(AddTextLetterByLetter(code.chars[2]), run_time=0.05 * len(code.chars[2]))
+        self.play(TypeCode(code.chars[1:3], time_per_char=0.05))
         self.wait(3)
 
         # Highlight (1, 1) in prefix sum
         pref.highlight(1, 1, 1, 1, color=ORANGE, width=5)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        pref.refresh()
         self.wait(2)
 
         # Highlight (0, 1), (1, 0), and (0, 0) in prefix sum
         pref.highlight(0, 1, 0, 1, color=YELLOW, width=5)
         pref.highlight(1, 0, 1, 0, color=YELLOW, width=5)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        pref.refresh()
         self.wait(2)
 
         pref.highlight(0, 0, 0, 0, color=RED, width=5)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        pref.refresh()
         self.wait(2)
 
         # Highlight (0, 0) in matrix with ORANGE
         m.highlight(0, 0, 0, 0, color=ORANGE, width=5)
-        m_mobj.become(m.get_mobject(), match_center=True)
+        m.refresh()
         self.wait()
 
-        self.play(AddTextLetterByLetter(code.chars[3]), run_time=0.03 * len(code.chars[3]))
-        self.play(AddTextLetterByLetter(code.chars[4]), run_time=0.03 * len(code.chars[4]))
+        self.play(TypeCode(code.chars[3:5], time_per_char=0.03))
         self.wait()
 
         # Fill the rows of the prefix sum array
@@ -429,8 +428,8 @@ class Examples(Scene):
                 pref.highlight(r - 1, c - 1, r - 1, c - 1, color=RED, width=5)
                 m.unhighlight()
                 m.highlight(r - 1, c - 1, r - 1, c - 1, color=ORANGE, width=5)
-                p_mobj.become(pref.get_mobject(), match_center=True)
-                m_mobj.become(m.get_mobject(), match_center=True)
+                pref.refresh()
+                m.refresh()
                 if r == 1:
                     self.wait(0.6)
                 elif r == 2:
@@ -440,8 +439,8 @@ class Examples(Scene):
 
         pref.unhighlight()
         m.unhighlight()
-        p_mobj.become(pref.get_mobject(), match_center=True)
-        m_mobj.become(m.get_mobject(), match_center=True)
+        pref.refresh()
+        m.refresh()
         self.wait(2)
         self.play(
             FadeOut(code),
@@ -465,8 +464,8 @@ class Examples(Scene):
         pref.highlight(1, 4, 1, 4, color=YELLOW, width=5)
         pref.highlight(6, 1, 6, 1, color=YELLOW, width=5)
         pref.highlight(1, 1, 1, 1, color=RED, width=5)
-        m_mobj.become(m.get_mobject(), match_center=True)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        m.refresh()
+        pref.refresh()
         self.wait(1)
         self.play(Write(f1153))
         self.wait(2)
@@ -474,8 +473,8 @@ class Examples(Scene):
         # Reset
         m.unhighlight()
         pref.unhighlight()
-        m_mobj.become(m.get_mobject(), match_center=True)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        m.refresh()
+        pref.refresh()
         self.wait(1)
 
         # Formula for (0, 1) -> (5, 5) => highlight the parts
@@ -489,8 +488,8 @@ class Examples(Scene):
         pref.highlight(0, 6, 0, 6, color=YELLOW, width=5)
         pref.highlight(6, 1, 6, 1, color=YELLOW, width=5)
         pref.highlight(0, 1, 0, 1, color=RED, width=5)
-        m_mobj.become(m.get_mobject(), match_center=True)
-        p_mobj.become(pref.get_mobject(), match_center=True)
+        m.refresh()
+        pref.refresh()
         self.wait(1)
         self.play(Write(f0155))
         self.wait(8)
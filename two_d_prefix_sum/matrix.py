@@ -1,7 +1,12 @@
 from dataclasses import dataclass, field
 
+import numpy as np
 from manim import *
 
+from common.cells import broadcast_colors, broadcast_widths
+from common.glyphs import make_label
+from common.layout import grid_centers, place_copies
+
 
 @dataclass
 class Matrix:
@@ -16,66 +21,107 @@ class Matrix:
     spacing: float = 0.1
     scale_text: float = 0.5
 
+    rectangles: list[VMobject] = field(default_factory=lambda: [])
+    labels: list[VMobject] = field(default_factory=lambda: [])
+
     def __post_init__(self):
-        self.stroke_color: list[list[str]] = [[self.stroke_color] * len(self.values[0])
-                                              for _ in range(len(self.values))] \
-            if isinstance(self.stroke_color, str) \
-            else self.stroke_color
-        self.stroke_width: list[list[float]] = [[self.stroke_width] * len(self.values[0])
-                                                for _ in range(len(self.values))] \
-            if isinstance(self.stroke_width, (float, int)) \
-            else self.stroke_width
+        shape = (len(self.values), len(self.values[0]))
+        if isinstance(self.stroke_color, list):
+            self.stroke_color = [color for row in self.stroke_color for color in row]
+        if isinstance(self.stroke_width, list):
+            self.stroke_width = [width for row in self.stroke_width for width in row]
+        self.stroke_color: np.ndarray = broadcast_colors(self.stroke_color, shape[0] * shape[1]).reshape(*shape, 4)
+        self.stroke_width: np.ndarray = broadcast_widths(self.stroke_width, shape[0] * shape[1]).reshape(shape)
+
+        # State that is currently displayed by the mobjects => only the cells that differ from it are rebuilt
+        self.applied_stroke_color = np.full_like(self.stroke_color, np.nan)
+        self.applied_stroke_width = np.full_like(self.stroke_width, np.nan)
+        self.applied_values = np.full(shape, None, dtype=object)
+        self.value_labels = np.full(shape, None, dtype=object)
 
     def get_rectangles(self) -> list[VMobject]:
-        rectangles = []
-        for i, row in enumerate(self.values):
-            for j, value in enumerate(row):
-                rectangle = Rectangle(
-                    height=self.height,
-                    width=self.width,
-                    fill_color=self.fill_color,
-                    fill_opacity=self.fill_opacity,
-                    stroke_width=self.stroke_width[i][j],
-                    stroke_color=self.stroke_color[i][j],
-                )
-                rectangle.shift(i * (self.height + self.spacing) * DOWN)
-                rectangle.shift(j * (self.width + self.spacing) * RIGHT)
-                rectangles.append(rectangle)
-        return rectangles
+        if not self.rectangles:
+            template = Rectangle(
+                height=self.height,
+                width=self.width,
+                fill_color=self.fill_color,
+                fill_opacity=self.fill_opacity,
+            )
+            centers = grid_centers(*self.stroke_width.shape, self.height, self.width, self.spacing)
+            self.rectangles = place_copies(template, centers)
+            self.refresh_rectangles()
+        return self.rectangles
+
+    def make_label(self, value: int | None) -> VMobject:
+        label = make_label(str(value) if value is not None else '', color=self.color)
+        label.scale(self.scale_text)
+        return label
 
     def get_labels(self) -> list[VMobject]:
+        if self.labels:
+            return self.labels
+
         rectangles = self.get_rectangles()
-        labels = []
         for i, row in enumerate(self.values):
             # Add index for the row
-            label = Tex(str(i), color=self.color)
-            label.scale(self.scale_text)
+            label = self.make_label(i)
             label.move_to(rectangles[i * len(row)])
             label.shift(0.9 * self.width * LEFT)
-            labels.append(label)
+            self.labels.append(label)
 
             # Add all the values in the row
             for j, value in enumerate(row):
-                label = Tex(str(value) if value is not None else '', color=self.color)
-                label.scale(self.scale_text)
+                label = self.make_label(value)
                 label.move_to(rectangles[i * len(row) + j])
-                labels.append(label)
+                self.labels.append(label)
+                self.value_labels[i, j] = label
+                self.applied_values[i, j] = value
 
         # Add index for the column
         for j in range(len(self.values[0])):
-            label = Tex(str(j), color=self.color)
-            label.scale(self.scale_text)
+            label = self.make_label(j)
             label.move_to(rectangles[j])
             label.shift(0.9 * self.height * UP)
-            labels.append(label)
-        return labels
+            self.labels.append(label)
+        return self.labels
 
     def get_mobjects(self) -> list[VMobject]:
         return self.get_rectangles() + self.get_labels()
 
     def get_mobject(self) -> VMobject:
+        self.refresh()
         return VGroup(*self.get_mobjects())
 
+    def refresh_rectangles(self):
+        cols = self.stroke_width.shape[1]
+        dirty = (self.stroke_color != self.applied_stroke_color).any(axis=-1) \
+            | (self.stroke_width != self.applied_stroke_width)
+        for i, j in np.argwhere(dirty):
+            self.rectangles[i * cols + j].set_stroke(
+                color=ManimColor.from_rgba(self.stroke_color[i, j]),
+                width=self.stroke_width[i, j],
+            )
+        self.applied_stroke_color = self.stroke_color.copy()
+        self.applied_stroke_width = self.stroke_width.copy()
+
+    def refresh_labels(self):
+        values = np.array(self.values, dtype=object)
+        for i, j in np.argwhere(values != self.applied_values):
+            label = self.make_label(values[i, j]).move_to(self.rectangles[i * values.shape[1] + j])
+            self.value_labels[i, j].become(label)
+            self.applied_values[i, j] = values[i, j]
+
+    def refresh(self):
+        """
+        Update the existing mobjects in place.
+        Only the rectangles whose style changed and the labels whose value changed are touched.
+        """
+        if self.rectangles:
+            self.refresh_rectangles()
+        if self.labels:
+            self.refresh_labels()
+        return self
+
     def highlight(self, ur: int, uc: int, br: int, bc: int, color=RED, width=5.):
         """
         Highlight a rectangle of the matrix.
@@ -86,17 +132,15 @@ class Matrix:
         :param color: Highlight color
         :param width: Highlight stroke width
         """
-        for i in range(ur, br + 1):
-            for j in range(uc, bc + 1):
-                self.stroke_color[i][j] = color
-                self.stroke_width[i][j] = width
+        self.stroke_color[ur: br + 1, uc: bc + 1] = ManimColor(color).to_rgba()
+        self.stroke_width[ur: br + 1, uc: bc + 1] = width
 
     def unhighlight(self):
         """
         Remove all highlights.
         """
-        self.stroke_color = [[WHITE] * len(self.values[0]) for _ in range(len(self.values))]
-        self.stroke_width = [[2.] * len(self.values[0]) for _ in range(len(self.values))]
+        self.stroke_color[:] = WHITE.to_rgba()
+        self.stroke_width[:] = 2.
 
     def __len__(self):
         return len(self.values)
@@ -0,0 +1,129 @@
+import argparse
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from manim import *
+from manim.utils.tex_file_writing import delete_nonsvg_files, tex_to_svg_file
+
+from common.tex_batch import compile_tex_batch, get_tex_file, scan_tex_calls
+
+MODULES = [
+    'bfs', 'binary_search', 'bubble_sort', 'insertion_sort', 'merge_sort', 'prefix_sum_arrays',
+    'sieve_of_eratosthenes', 'sliding_window', 'two_d_prefix_sum', 'primality_check_in_sqrt_n',
+]
+TEXT_CLASSES = {'Text', 'Code', 'make_code'}
+
+# Whether the SVG of every Text laid out by this worker was already in the cache
+text_cache_lookups: list[bool] = []
+
+
+@lru_cache(maxsize=None)
+def module_namespace(path: str) -> dict:
+    """ Names the calls of a module can use: manim, dedent, make_code and the module-level constants (e.g. colors). """
+    namespace = {}
+    exec('from manim import *\nfrom textwrap import dedent\nfrom common.code import make_code', namespace)
+    for node in ast.parse(Path(path).read_text(encoding='utf-8')).body:
+        if isinstance(node, ast.Assign) and get_free_names(node.value) <= namespace.keys():
+            try:
+                exec(compile(ast.Module(body=[node], type_ignores=[]), path, 'exec'), namespace)
+            except Exception:
+                pass
+    return namespace
+
+
+def get_free_names(node: ast.AST) -> set[str]:
+    loaded = {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+    bound = {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)}
+    bound |= {n.arg for n in ast.walk(node) if isinstance(n, ast.arg)}
+    return loaded - bound
+
+
+def scan_text_calls(path: Path) -> list[str]:
+    """ Source of every Text and Code call of a module that can be evaluated without running the scenes. """
+    namespace = module_namespace(str(path))
+    calls = []
+    for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in TEXT_CLASSES:
+            if get_free_names(node) <= namespace.keys():
+                calls.append(ast.unparse(node))
+    return list(dict.fromkeys(calls))
+
+
+def init_worker(media_dir: str) -> None:
+    config.media_dir = media_dir
+    # Other workers compile in the same directory => their intermediate files are removed once at the end
+    config.no_latex_cleanup = True
+
+    text2svg = Text._text2svg
+
+    def record_text2svg(self, color):
+        text_cache_lookups.append((config.get_dir('text_dir') / f'{self._text2hash(color)}.svg').exists())
+        return text2svg(self, color)
+    Text._text2svg = record_text2svg
+
+
+def warm_tex_batch(expressions: list[tuple[str, str]]) -> int:
+    return compile_tex_batch(expressions)
+
+
+def warm_tex(expression: str, environment: str) -> bool:
+    try:
+        tex_to_svg_file(expression, environment)
+        return True
+    except ValueError:
+        return False
+
+
+def warm_text(path: str, call: str) -> tuple[int, int, bool]:
+    """ Build the Text/Code (Pango lays out the text and writes the SVG on a miss). :return: hits, misses, success """
+    text_cache_lookups.clear()
+    try:
+        eval(call, module_namespace(path))
+        success = True
+    except Exception as e:
+        logger.warning(f'{path}: could not build {call[:60]}... ({e})')
+        success = False
+    return sum(text_cache_lookups), len(text_cache_lookups) - sum(text_cache_lookups), success
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill the tex and text caches for all the scenes before rendering')
+    parser.add_argument('modules', nargs='*', default=MODULES, help='Modules to scan (all the explainers by default)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Number of worker processes')
+    parser.add_argument('--media_dir', default=config.media_dir, help='Media directory of the renders')
+    args = parser.parse_args()
+    config.media_dir = args.media_dir
+
+    root = Path(__file__).parent
+    paths = [path for module in args.modules for path in sorted((root / module).glob('*.py'))]
+    tex = list(dict.fromkeys(expression for path in paths for expression in scan_tex_calls(path)))
+    texts = list(dict.fromkeys((str(path), call) for path in paths for call in scan_text_calls(path)))
+
+    is_missing = lambda expression: not get_tex_file(*expression)[0].with_suffix('.svg').exists()
+    tex_misses = [expression for expression in tex if is_missing(expression)]
+    print(f'{len(paths)} files: {len(tex)} tex expressions, {len(texts)} Text/Code blocks')
+
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(args.media_dir,)) as pool:
+        # Every worker typesets its share of the missing expressions in a single LaTeX run
+        batched = sum(pool.map(warm_tex_batch, [tex_misses[i::args.jobs] for i in range(args.jobs)]))
+        # Whatever failed in a batch is compiled on its own (so that a broken expression doesn't block the others)
+        remaining = [expression for expression in tex_misses if is_missing(expression)]
+        failed_tex = list(pool.map(warm_tex, *zip(*remaining))).count(False) if remaining else 0
+        text_results = list(pool.map(warm_text, *zip(*texts))) if texts else []
+
+    if not config.no_latex_cleanup:
+        for batch_file in config.get_dir('tex_dir').glob('batch_*.tex'):
+            batch_file.unlink()
+        delete_nonsvg_files()
+
+    print(f'Tex: {len(tex) - len(tex_misses)} hits, {len(tex_misses)} misses '
+          f'({batched} batched, {len(remaining) - failed_tex} compiled one by one, {failed_tex} failed)')
+    print(f'Text: {sum(hits for hits, _, _ in text_results)} hits, {sum(misses for _, misses, _ in text_results)} misses '
+          f'({[success for _, _, success in text_results].count(False)} blocks failed)')
+
+
+if __name__ == '__main__':
+    main()